@@ -0,0 +1,64 @@
+"""
+Micro-benchmark: session/save payload size and (de)serialization time of a 13x13 board.
+Compares the previous per-cell dict format (v1) with the compact v2 board encoding.
+Run from the repository root: python -m benchmarks.bench_board_codec
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+
+from kakuro.models.domain import Board, Cell
+from kakuro.services.board_generator import generate_board
+
+
+def _v1_dict(board: Board) -> dict:
+    return {
+        "boardId": board.boardId,
+        "difficulty": str(board.difficulty),
+        "size": [board.size[0], board.size[1]],
+        "cells": [cell.to_dict() for cell in board.cells],
+        "runs": [run.to_dict() for run in board.runs],
+    }
+
+
+def _v1_load(data: dict) -> Board:
+    # Same shape the legacy branch of Board.from_dict accepts.
+    return Board.from_dict(data)
+
+
+def main() -> None:
+    board = generate_board("hard")
+    for cell in board.cells[::3]:
+        if cell.isPlayable and cell.value is None:
+            cell.value = 5
+
+    v1 = _v1_dict(board)
+    v2 = board.to_dict()
+    v1_json = json.dumps(v1, separators=(",", ":"))
+    v2_json = json.dumps(v2, separators=(",", ":"))
+    assert Board.from_dict(v2).to_dict() == Board.from_dict(v1).to_dict()
+    assert [Cell.to_dict(c) for c in Board.from_dict(v2).cells] == [Cell.to_dict(c) for c in board.cells]
+
+    number = 500
+    timings = {
+        "encode": (
+            timeit.timeit(lambda: json.dumps(_v1_dict(board), separators=(",", ":")), number=number),
+            timeit.timeit(lambda: json.dumps(board.to_dict(), separators=(",", ":")), number=number),
+        ),
+        "decode": (
+            timeit.timeit(lambda: _v1_load(json.loads(v1_json)), number=number),
+            timeit.timeit(lambda: Board.from_dict(json.loads(v2_json)), number=number),
+        ),
+    }
+
+    print(f"payload bytes  v1 {len(v1_json):>7}  v2 {len(v2_json):>7}  ({len(v1_json) / len(v2_json):.1f}x smaller)")
+    for name, (old, new) in timings.items():
+        print(
+            f"{name:<14} v1 {old * 1e6 / number:>7.1f}us  v2 {new * 1e6 / number:>7.1f}us  ({old / new:.1f}x faster)"
+        )
+
+
+if __name__ == "__main__":
+    main()
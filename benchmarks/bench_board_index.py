@@ -0,0 +1,91 @@
+"""
+Micro-benchmark: cell lookup and run traversal on a 13x13 board.
+Compares the previous linear scan / rebuilt matrix / grid walk with the persistent
+grid index and precomputed run table on Board.
+Run from the repository root: python -m benchmarks.bench_board_index
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from kakuro.services.board_generator import generate_board
+from kakuro.services.validation_service import validate_move
+
+
+def _linear_get_cell(board, row, col):
+    for cell in board.cells:
+        if cell.row == row and cell.col == col:
+            return cell
+    return None
+
+
+def _rebuilt_matrix(board):
+    rows, cols = board.size
+    grid = [[None for _ in range(cols)] for _ in range(rows)]
+    for cell in board.cells:
+        grid[cell.row][cell.col] = cell
+    return grid
+
+
+def _walk_across(matrix, row, col):
+    cols = len(matrix[0])
+    left = col
+    while left - 1 >= 0 and matrix[row][left - 1].isPlayable:
+        left -= 1
+    right = col
+    while right + 1 < cols and matrix[row][right + 1].isPlayable:
+        right += 1
+    return [matrix[row][cc] for cc in range(left, right + 1)]
+
+
+def _walk_down(matrix, row, col):
+    rows = len(matrix)
+    top = row
+    while top - 1 >= 0 and matrix[top - 1][col].isPlayable:
+        top -= 1
+    bottom = row
+    while bottom + 1 < rows and matrix[bottom + 1][col].isPlayable:
+        bottom += 1
+    return [matrix[rr][col] for rr in range(top, bottom + 1)]
+
+
+def main() -> None:
+    board = generate_board("hard")
+    playable = [(cell.row, cell.col) for cell in board.cells if cell.isPlayable]
+    number = 200
+
+    def old_lookup():
+        for row, col in playable:
+            _linear_get_cell(board, row, col)
+
+    def new_lookup():
+        for row, col in playable:
+            board.get_cell(row, col)
+
+    def old_runs():
+        for row, col in playable:
+            matrix = _rebuilt_matrix(board)
+            _walk_across(matrix, row, col)
+            _walk_down(matrix, row, col)
+
+    def new_runs():
+        for row, col in playable:
+            for run in board.runs_for(row, col):
+                board.run_cells(run)
+
+    def moves():
+        for row, col in playable:
+            validate_move(board, row, col, "")
+
+    per_call = number * len(playable)
+    print(f"13x13 board, {len(board.cells)} cells, {len(playable)} playable")
+    for label, old, new in (("get_cell", old_lookup, new_lookup), ("run traversal", old_runs, new_runs)):
+        old_us = timeit.timeit(old, number=number) / per_call * 1e6
+        new_us = timeit.timeit(new, number=number) / per_call * 1e6
+        print(f"{label:<14} old {old_us:8.3f} us   new {new_us:8.3f} us   x{old_us / new_us:.1f}")
+    print(f"{'validate_move':<14} new {timeit.timeit(moves, number=number) / per_call * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: how generation time grows with board size, stage by stage.
+Layout (including the short-run cleanup), solution fill and the uniqueness pass are timed
+separately on square boards from 10x10 to 40x40, using the hard tier's layout parameters
+and digits.
+Run from the repository root: python -m benchmarks.bench_board_sizes [--boards N] [--sizes 10,20,30,40]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from kakuro.services.board_generator import (
+    DIFFICULTY_CONFIGS,
+    _build_layout,
+    _build_solution,
+    _DifficultyConfig,
+    _make_unique,
+    _remove_short_runs,
+)
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--boards", type=int, default=10)
+    parser.add_argument("--sizes", default="10,15,20,25,30,35,40")
+    args = parser.parse_args()
+
+    hard = DIFFICULTY_CONFIGS["hard"]
+    print(
+        f"{'size':>7} {'cells':>6} {'cleanup ms':>10} {'layout ms':>9} {'fill ms':>8} "
+        f"{'unique ms':>10} {'total ms':>9} {'ms/cell':>8} {'failed':>7}"
+    )
+    for size in (int(value) for value in args.sizes.split(",")):
+        config = _DifficultyConfig(size, size, hard.play_probability, hard.min_ratio, hard.seeds)
+        cleanup, layouts, fills, uniques, totals, cells = [], [], [], [], [], []
+        failed = 0
+        for seed in range(1, args.boards + 1):
+            layout, layout_ms = _timed(_build_layout, config, seed)
+            # The cleanup on its own, on a fresh random layout with the same density.
+            rng = random.Random(seed)
+            raw = [[r > 0 and c > 0 and rng.random() < config.play_probability for c in range(size)] for r in range(size)]
+            _, cleanup_ms = _timed(_remove_short_runs, raw)
+            try:
+                solution, fill_ms = _timed(_build_solution, layout, seed, "hard")
+            except RuntimeError:
+                failed += 1
+                continue
+            unique, unique_ms = _timed(_make_unique, layout, solution, seed, "hard")
+            if unique is None:
+                failed += 1
+                continue
+            cleanup.append(cleanup_ms)
+            layouts.append(layout_ms)
+            fills.append(fill_ms)
+            uniques.append(unique_ms)
+            totals.append(layout_ms + fill_ms + unique_ms)
+            cells.append(sum(row.count(True) for row in layout))
+
+        if not totals:
+            print(f"{size:>3}x{size:<3} {'-':>6} {'':>10} {'':>9} {'':>8} {'':>10} {'':>9} {'':>8} {failed:>7}")
+            continue
+        mean_cells = statistics.mean(cells)
+        print(
+            f"{size:>3}x{size:<3} {mean_cells:>6.0f} {statistics.mean(cleanup):>10.3f} "
+            f"{statistics.mean(layouts):>9.2f} {statistics.mean(fills):>8.2f} {statistics.mean(uniques):>10.1f} "
+            f"{statistics.mean(totals):>9.1f} {statistics.mean(totals) / mean_cells:>8.3f} {failed:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: model-layer requests/second with per-call connections vs the shared pool.
+Each simulated request runs the repository calls of one route (signup, login, menu,
+save, finish); a thread pool drives them concurrently against a fresh database.
+Run from the repository root: python -m benchmarks.bench_db_connections [--requests N] [--threads N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from pathlib import Path
+
+from kakuro.models import db, leaderboard, saved_game, user
+from kakuro.models.domain import Board, ClueCell, GameSession, PlayCell
+from kakuro.models.user import DEFAULT_SCHEMA_PATH, init_db
+
+REPOSITORIES = (user, leaderboard, saved_game)
+
+
+def _per_call_connect(db_path: Path) -> sqlite3.Connection:
+    # Previous behaviour: a new rollback-journal connection for every repository call.
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _game(session_id: str, user_id: int) -> GameSession:
+    cells = [
+        ClueCell(0, 0),
+        ClueCell(0, 1, clueDown=4),
+        ClueCell(1, 0, clueRight=4),
+        PlayCell(1, 1, value=4),
+    ]
+    board = Board(boardId=session_id, difficulty="easy", size=(2, 2), cells=cells)
+    return GameSession(sessionId=session_id, difficulty="easy", status="InProgress", board=board, userId=user_id)
+
+
+def _workload(db_path: Path, requests: int, threads: int) -> float:
+    ids = count()
+
+    def one_request(_: int) -> None:
+        n = next(ids)
+        name = f"player{n}"
+        email = f"{name}@example.com"
+        # signup
+        user.get_user_by_username(name, db_path)
+        user.get_user_by_email(email, db_path)
+        created = user.create_user(name, email, "hash", db_path)
+        # login + menu
+        user.get_user_by_email(email, db_path)
+        leaderboard.get_top_leaderboard_entries(db_path, limit=10)
+        # save + finish
+        saved_game.upsert_saved_game(_game(f"gs-{n}", created.userId), db_path)
+        leaderboard.add_leaderboard_entry(created.userId, "easy", 60 + n % 300, 100 + n % 50, db_path)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(one_request, range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before_path = Path(tmp) / "before.sqlite"
+        after_path = Path(tmp) / "after.sqlite"
+
+        originals = {module: module.connect for module in REPOSITORIES}
+        for module in REPOSITORIES:
+            module.connect = _per_call_connect
+        try:
+            init_db(before_path, DEFAULT_SCHEMA_PATH)
+            before = _workload(before_path, args.requests, args.threads)
+        finally:
+            for module, original in originals.items():
+                module.connect = original
+
+        init_db(after_path, DEFAULT_SCHEMA_PATH)
+        after = _workload(after_path, args.requests, args.threads)
+        db.close_all()
+
+    print(f"{args.requests} requests on {args.threads} threads")
+    print(f"per-call connections  {before:>8.1f} req/s")
+    print(f"pooled WAL            {after:>8.1f} req/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: time to find a usable layout, pure-Python loop vs the NumPy batch engine.
+The NumPy column is skipped when NumPy is not installed. With LAYOUT_ENGINE = "numpy" the
+generator uses it from NUMPY_LAYOUT_MIN_AREA grid squares up; both engines are timed on every size here.
+Run from the repository root: python -m benchmarks.bench_layout [--layouts N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from kakuro.services import layout_engine
+from kakuro.services.board_generator import (
+    DIFFICULTY_CONFIGS,
+    EDGE_BOOST,
+    LAYOUT_ATTEMPTS,
+    MAX_PLAY_PROBABILITY,
+    _draw_layout,
+)
+
+
+def _per_layout_ms(build, count: int) -> float:
+    started = time.perf_counter()
+    for seed in range(1, count + 1):
+        build(seed)
+    return (time.perf_counter() - started) * 1000 / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--layouts", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'difficulty':<10} {'size':>7} {'python ms':>10} {'numpy ms':>9} {'speedup':>8}")
+    for difficulty, config in DIFFICULTY_CONFIGS.items():
+        python_ms = _per_layout_ms(lambda seed: _draw_layout(config, seed), args.layouts)
+        if layout_engine.available():
+            numpy_ms = _per_layout_ms(
+                lambda seed: layout_engine.build_layout(
+                    config.rows,
+                    config.cols,
+                    config.play_probability,
+                    config.min_ratio,
+                    seed,
+                    LAYOUT_ATTEMPTS,
+                    EDGE_BOOST,
+                    MAX_PLAY_PROBABILITY,
+                ),
+                args.layouts,
+            )
+            numpy_cols = f"{numpy_ms:>9.3f} {python_ms / numpy_ms:>7.1f}x"
+        else:
+            numpy_cols = f"{'-':>9} {'-':>8}"
+        print(f"{difficulty:<10} {config.rows:>3}x{config.cols:<3} {python_ms:>10.3f} {numpy_cols}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: menu leaderboard query time as leaderboard_entries grows.
+Compares the previous join + full sort with the indexed scan and the leaderboard_top summary.
+Run from the repository root: python -m benchmarks.bench_leaderboard [--entries N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import timeit
+from pathlib import Path
+
+from kakuro.models import db
+from kakuro.models.leaderboard import get_top_leaderboard_entries, rebuild_leaderboard_top
+from kakuro.models.user import DEFAULT_SCHEMA_PATH, create_user, init_db
+
+_PREVIOUS_QUERY = """
+    SELECT u.username, e.difficulty, e.elapsed_time, e.score, e.created_at
+    FROM leaderboard_entries e NOT INDEXED
+    JOIN users u ON u.id = e.user_id
+    ORDER BY e.score DESC, e.elapsed_time ASC, e.created_at ASC
+    LIMIT 10
+"""
+
+_INDEXED_QUERY = """
+    SELECT u.username, e.difficulty, e.elapsed_time, e.score, e.created_at
+    FROM leaderboard_entries e
+    JOIN users u ON u.id = e.user_id
+    ORDER BY e.score DESC, e.elapsed_time ASC, e.created_at ASC
+    LIMIT 10
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "leaderboard.sqlite"
+        init_db(db_path, DEFAULT_SCHEMA_PATH)
+        users = [create_user(f"p{i}", f"p{i}@example.com", "hash", db_path).userId for i in range(200)]
+        rows = [
+            (
+                rng.choice(users),
+                rng.choice(("easy", "medium", "hard")),
+                rng.randint(30, 3600),
+                rng.randint(800, 4000),
+                f"2026-01-01T00:{i % 60:02d}:{i % 59:02d}.{i:06d}",
+            )
+            for i in range(args.entries)
+        ]
+        with db.connect(db_path) as conn:
+            conn.executemany(
+                "INSERT INTO leaderboard_entries (user_id, difficulty, elapsed_time, score, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        rebuild_leaderboard_top(db_path)
+
+        def run(sql: str) -> None:
+            with db.connect(db_path) as conn:
+                conn.execute(sql).fetchall()
+
+        number = 20
+        timings = [
+            ("full sort (previous)", timeit.timeit(lambda: run(_PREVIOUS_QUERY), number=number)),
+            ("covering index scan", timeit.timeit(lambda: run(_INDEXED_QUERY), number=number)),
+            ("leaderboard_top", timeit.timeit(lambda: get_top_leaderboard_entries(db_path, limit=10), number=number)),
+        ]
+        db.close_all()
+
+    print(f"top 10 of {args.entries} entries")
+    for name, seconds in timings:
+        print(f"{name:<22} {seconds * 1000 / number:>9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
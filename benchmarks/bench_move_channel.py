@@ -0,0 +1,105 @@
+"""
+Load test: moves/second through POST /game/enter vs the SSE move channel.
+Each simulated player owns a hard board and toggles one cell between a digit and empty;
+/game/enter pays the session cookie + session file read/write on every move, channel
+posts skip the session and the results are read back from the event stream.
+Run from the repository root: python -m benchmarks.bench_move_channel [--moves N] [--players N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from kakuro.app import create_app
+from kakuro.models import db
+from kakuro.models.domain import GameSession
+from kakuro.services.board_generator import board_from_template, generate_template
+from kakuro.services.journal_service import get_journal
+from kakuro.services.validation_service import validate_move
+
+XHR = {"X-Requested-With": "XMLHttpRequest"}
+
+
+def _toggle_cell(board) -> tuple[int, int, str]:
+    # First editable empty cell and a digit it accepts on the empty board.
+    for cell in board.cells:
+        if cell.isPlayable and getattr(cell, "editable", True) and cell.value is None:
+            for digit in "123456789":
+                if validate_move(board, cell.row, cell.col, digit)["ok"]:
+                    validate_move(board, cell.row, cell.col, "")
+                    return cell.row, cell.col, digit
+    raise RuntimeError("board has no editable cell")
+
+
+def _player(app, template: dict, player: int, moves: int, use_channel: bool) -> None:
+    client = app.test_client()
+    board = board_from_template(template)
+    row, col, digit = _toggle_cell(board)
+    with client.session_transaction() as sess:
+        sess["is_guest"] = True
+        sess["active_game"] = GameSession(
+            sessionId=f"gs-bench-{use_channel}-{player}", difficulty="hard", status="InProgress", board=board
+        ).to_dict()
+
+    values = [digit if n % 2 == 0 else "" for n in range(moves)]
+    if not use_channel:
+        for value in values:
+            client.post("/game/enter", data={"row": row, "col": col, "value": value}, headers=XHR)
+        return
+
+    stream = client.get("/game/channel", buffered=False)
+    events = iter(stream.response)
+    token = json.loads(next(events).decode("utf-8").split("data: ", 1)[1])["token"]
+    url = f"/game/channel/{token}/moves"
+    for value in values:
+        client.post(url, json={"moves": [{"row": row, "col": col, "value": value}]})
+    received = 0
+    while received < moves:
+        if next(events).startswith(b"event: moves"):
+            received += 1
+    stream.close()
+
+
+def _run(app, template: dict, moves: int, players: int, use_channel: bool) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=players) as executor:
+        futures = [executor.submit(_player, app, template, n, moves, use_channel) for n in range(players)]
+        for future in futures:
+            future.result()
+    return moves * players / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--moves", type=int, default=300, help="moves per player")
+    parser.add_argument("--players", type=int, default=4)
+    args = parser.parse_args()
+
+    template = generate_template("hard")
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {
+                "DB_PATH": Path(tmp) / "bench.sqlite",
+                "SESSION_FILE_DIR": str(Path(tmp) / "sessions"),
+                "PUZZLE_POOL_ENABLED": False,
+                "MOVE_CHANNEL_ENABLED": True,
+                "MOVE_CHANNEL_HEARTBEAT_SECONDS": 60.0,
+            }
+        )
+        enter = _run(app, template, args.moves, args.players, use_channel=False)
+        channel = _run(app, template, args.moves, args.players, use_channel=True)
+        get_journal().stop()
+        db.close_all()
+
+    print(f"{args.players} players x {args.moves} moves on a hard board")
+    print(f"POST /game/enter   {enter:>9.1f} moves/s")
+    print(f"SSE move channel   {channel:>9.1f} moves/s  ({channel / enter:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: rating throughput per board size, plus how the ratings spread within each size.
+Boards are generated up front; only the rating stage (logic solver + branching) is timed.
+The quartiles are what PUZZLE_RATING_BANDS in config.py is set from; "in band" is the share
+of boards the pool refill keeps for each difficulty ("-" without a band).
+Run from the repository root: python -m benchmarks.bench_rating [--boards N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from kakuro.config import Config
+from kakuro.services.board_generator import DIFFICULTY_CONFIGS, generate_board
+from kakuro.services.hint_service import board_grid
+from kakuro.services.rating import in_band, rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--boards", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{'difficulty':<10} {'size':>7} {'cells':>6} {'boards/s':>9} {'mean ms':>8} "
+        f"{'rating min':>10} {'p25':>6} {'median':>7} {'p75':>6} {'max':>6} {'guessed':>8} {'in band':>8}"
+    )
+    for difficulty, config in DIFFICULTY_CONFIGS.items():
+        problems = [board_grid(generate_board(difficulty)) for _ in range(args.boards)]
+        cells = statistics.mean(grid.size for grid, _, _ in problems)
+
+        started = time.perf_counter()
+        ratings = [rate(grid, targets, fixed) for grid, targets, fixed in problems]
+        elapsed = time.perf_counter() - started
+
+        scores = [rating.score for rating in ratings]
+        guessed = sum(1 for rating in ratings if rating.guesses)
+        p25, median, p75 = statistics.quantiles(scores, n=4)
+        band = Config.PUZZLE_RATING_BANDS.get(difficulty)
+        kept = f"{sum(1 for score in scores if in_band(score, band)) / len(scores):>8.0%}" if band else f"{'-':>8}"
+        print(
+            f"{difficulty:<10} {config.rows:>3}x{config.cols:<3} {cells:>6.0f} {args.boards / elapsed:>9.0f} "
+            f"{elapsed * 1000 / args.boards:>8.2f} {min(scores):>10.1f} {p25:>6.1f} {median:>7.1f} {p75:>6.1f} "
+            f"{max(scores):>6.1f} {guessed:>8} {kept}"
+        )
+
+
+if __name__ == "__main__":
+    main()
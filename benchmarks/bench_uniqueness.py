@@ -0,0 +1,60 @@
+"""
+Benchmark: cost of uniquely-solvable board generation per difficulty.
+Run from the repository root: python -m benchmarks.bench_uniqueness [--boards N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from kakuro.services import board_generator
+from kakuro.services.board_generator import DIFFICULTY_CONFIGS, generate_board
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--boards", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'difficulty':<10} {'mean ms':>9} {'median':>9} {'p90':>9} {'max':>9} {'givens':>7} {'checks':>7}")
+    for difficulty in DIFFICULTY_CONFIGS:
+        timings = []
+        givens = 0
+        checks = 0
+        originals = (board_generator.find_solutions, board_generator.find_solutions_with_logic)
+
+        def counting(search):
+            def counted(*args, **kwargs):
+                nonlocal checks
+                checks += 1
+                return search(*args, **kwargs)
+
+            return counted
+
+        board_generator.find_solutions = counting(originals[0])
+        board_generator.find_solutions_with_logic = counting(originals[1])
+        try:
+            for _ in range(args.boards):
+                started = time.perf_counter()
+                board = generate_board(difficulty)
+                timings.append((time.perf_counter() - started) * 1000)
+                givens += sum(1 for cell in board.cells if cell.isPlayable and not cell.editable)
+        finally:
+            board_generator.find_solutions, board_generator.find_solutions_with_logic = originals
+
+        print(
+            f"{difficulty:<10} {statistics.mean(timings):>9.2f} {statistics.median(timings):>9.2f} "
+            f"{_percentile(timings, 0.9):>9.2f} {max(timings):>9.2f} "
+            f"{givens / args.boards:>7.1f} {checks / args.boards:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
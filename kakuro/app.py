@@ -8,26 +8,54 @@ from __future__ import annotations
 from pathlib import Path
 
 from flask_session import Session
-from flask import Flask, flash, jsonify, redirect, render_template, request, session, url_for
+from flask import Flask, Response, flash, jsonify, redirect, render_template, request, session, url_for
 
 from .config import Config
 from .models.user import init_db
 from .services.auth_service import submit_login, submit_signup
+from .services.board_generator import DIFFICULTY_CONFIGS
 from .services.game_service import (
+    autosave_current_game,
+    board_topology,
+    check_cells,
     clear_feedback,
     create_new_game,
+    delete_save,
+    discard_current_game,
+    enter_moves,
     enter_number,
+    game_state,
     get_feedback,
     get_game,
+    hint_cell,
     is_paused,
+    list_saves,
     load_latest_saved_game,
+    load_saved_game,
+    redo_move,
+    retire_current_game,
+    reveal_cell,
     save_current_game,
     save_game,
     set_paused,
     set_move_error,
     submit_solution,
+    undo_move,
 )
-from .services.leaderboard_service import get_leaderboard, record_completed_game
+from .services.journal_service import get_journal, init_journal
+from .services.leaderboard_service import (
+    DIFFICULTY_BASE_POINTS,
+    get_leaderboard,
+    get_leaderboard_cache,
+    record_completed_game,
+)
+from .services.move_channel import DEFAULT_HEARTBEAT_SECONDS, get_channels, init_move_channel
+from .services.puzzle_pool import get_pool, init_pool
+from .services.session_store import get_cache, init_session_store
+
+LEADERBOARD_DIFFICULTIES = tuple(DIFFICULTY_BASE_POINTS)
+LEADERBOARD_PERIODS = {"all": "All time", "weekly": "This week", "daily": "Today"}
+GUEST_SAVE_MESSAGE = "Only registered users can save games."
 
 
 def create_app(test_config: dict | None = None) -> Flask:
@@ -40,10 +68,14 @@ def create_app(test_config: dict | None = None) -> Flask:
     session_dir = Path(app.config["SESSION_FILE_DIR"])
     session_dir.mkdir(parents=True, exist_ok=True)
     Session(app)
+    init_session_store(app)
+    init_move_channel(app)
 
     db_path = Path(app.config["DB_PATH"])
     schema_path = Path(app.config["SCHEMA_PATH"])
     init_db(db_path=db_path, schema_path=schema_path)
+    init_pool(app.config)
+    init_journal(app.config)
 
     def has_player_context() -> bool:
         return bool(session.get("is_guest") or session.get("user_id"))
@@ -86,15 +118,26 @@ def create_app(test_config: dict | None = None) -> Flask:
         guard = require_player_context()
         if guard:
             return guard
-        leaderboard_entries = get_leaderboard(db_path, limit=10)
+        board = (request.args.get("difficulty", "") or "").lower()
+        if board not in LEADERBOARD_DIFFICULTIES:
+            board = ""
+        period = (request.args.get("period", "all") or "all").lower()
+        if period not in LEADERBOARD_PERIODS:
+            period = "all"
+        leaderboard_entries = get_leaderboard(db_path, limit=10, difficulty=board or None, period=period)
         return render_template(
             "main_menu.html",
             leaderboard_entries=leaderboard_entries,
+            leaderboard_board=board,
+            leaderboard_period=period,
+            leaderboard_difficulties=LEADERBOARD_DIFFICULTIES,
+            leaderboard_periods=LEADERBOARD_PERIODS,
         )
 
     @app.post("/logout")
     def logout():
-        # Session cleanup for both guest and logged-in users.
+        # Session cleanup for both guest and logged-in users; an unsaved game's journal goes too.
+        discard_current_game(db_path)
         session.clear()
         flash("Logged out.", "info")
         return redirect(url_for("welcome"))
@@ -171,11 +214,14 @@ def create_app(test_config: dict | None = None) -> Flask:
             return guard
 
         difficulty = (request.form.get("difficulty", "easy") or "easy").lower()
-        if difficulty not in {"easy", "medium", "hard"}:
+        if difficulty not in DIFFICULTY_CONFIGS:
             # ALT path: invalid difficulty input.
             flash("Please select a valid difficulty.", "danger")
             return redirect(url_for("open_new_game_page"))
 
+        # An unfinished game being replaced goes to the autosave ring first.
+        retire_current_game(db_path, session.get("user_id"))
+
         # Postcondition: create and store a new GameSession with generated board.
         game_session = create_new_game(difficulty, session.get("user_id"))
         save_game(game_session)
@@ -204,11 +250,13 @@ def create_app(test_config: dict | None = None) -> Flask:
             "game.html",
             game_session=game_session,
             board_matrix=game_session.board.matrix(),
+            board_topology=board_topology(game_session.board),
             wrong_keys=wrong_keys,
             wrong_cells=feedback["wrongCells"],
             game_message=feedback["message"],
             move_error=feedback["moveError"],
             game_paused=is_paused(),
+            move_channel_enabled=get_channels() is not None,
         )
 
     @app.post("/game/pause")
@@ -219,6 +267,7 @@ def create_app(test_config: dict | None = None) -> Flask:
             return _move_response(False, "No active game session.", "", request)
 
         set_paused(True)
+        autosave_current_game(db_path, session.get("user_id"))
         return _move_response(True, "Game paused.", "", request)
 
     @app.post("/game/resume")
@@ -239,20 +288,60 @@ def create_app(test_config: dict | None = None) -> Flask:
             flash("No active game session.", "danger")
             return redirect(url_for("game_screen"))
 
-        user_id = session.get("user_id")
-        if not user_id:
-            flash("Only registered users can save games.", "warning")
+        if not session.get("user_id"):
+            flash(GUEST_SAVE_MESSAGE, "warning")
             return redirect(url_for("game_screen"))
 
-        try:
-            elapsed_time = int(request.form.get("elapsed_time", game_session.elapsedTime))
-        except ValueError:
-            elapsed_time = game_session.elapsedTime
-
-        ok, message = save_current_game(db_path, user_id, elapsed_time)
+        ok, message = save_active_game(request.form.get("elapsed_time"), request.form.get("label"))
         flash(message, "success" if ok else "danger")
         return redirect(url_for("menu" if ok else "game_screen"))
 
+    def save_active_game(raw_elapsed, label) -> tuple[bool, str]:
+        user_id = session.get("user_id")
+        if not user_id:
+            return False, GUEST_SAVE_MESSAGE
+        elapsed_time = _parse_elapsed(raw_elapsed, get_game().elapsedTime)
+        return save_current_game(db_path, user_id, elapsed_time, label)
+
+    @app.get("/game/saves")
+    def saved_games_page():
+        # Flow 4G: list save slots (metadata only) for the registered user.
+        guard = require_player_context()
+        if guard:
+            return guard
+
+        user_id = session.get("user_id")
+        if not user_id:
+            flash("Only registered users can load saved games.", "warning")
+            return redirect(url_for("menu"))
+
+        return render_template("saves.html", saves=list_saves(db_path, user_id))
+
+    @app.post("/game/saves/<int:save_id>/load")
+    def load_save_slot_route(save_id: int):
+        # Flow 4G: loadGame from a chosen slot.
+        user_id = session.get("user_id")
+        if not user_id:
+            flash("Only registered users can load saved games.", "warning")
+            return redirect(url_for("menu"))
+
+        ok, message = load_saved_game(db_path, user_id, save_id)
+        flash(message, "success" if ok else "warning")
+        return redirect(url_for("game_screen" if ok else "saved_games_page"))
+
+    @app.post("/game/saves/<int:save_id>/delete")
+    def delete_save_slot_route(save_id: int):
+        user_id = session.get("user_id")
+        if not user_id:
+            flash("Only registered users can manage saved games.", "warning")
+            return redirect(url_for("menu"))
+
+        if delete_save(db_path, user_id, save_id):
+            flash("Save deleted.", "info")
+        else:
+            flash("Save not found.", "warning")
+        return redirect(url_for("saved_games_page"))
+
     @app.get("/game/load")
     def load_game_route():
         # Flow 4G: loadGame (Operation Contract).
@@ -294,20 +383,99 @@ def create_app(test_config: dict | None = None) -> Flask:
 
         return _move_response(result["ok"], result["message"], value, request)
 
+    @app.post("/game/moves")
+    def enter_moves_route():
+        # Flow 4A/4C in bulk: JSON {"moves": [{"row", "col", "value"}, ...]} applied in order.
+        payload = request.get_json(silent=True)
+        moves = payload.get("moves") if isinstance(payload, dict) else None
+        if not isinstance(moves, list):
+            return jsonify({"ok": False, "message": "Expected a JSON object with a list of moves.", "results": []}), 400
+
+        result = enter_moves(moves)
+        set_move_error("" if result["ok"] else result["message"])
+        return jsonify(result)
+
+    @app.get("/game/channel")
+    def open_move_channel():
+        # Optional real-time mode: one SSE stream per open game screen carries move results
+        # and timer sync; moves are posted to the channel URL announced in the "ready" event.
+        channels = get_channels()
+        game_session = get_game()
+        if channels is None or game_session is None:
+            return jsonify({"ok": False, "message": "Move channel is not available."}), 404
+
+        # Pin the live object in the session cache so channel moves are seen by later requests.
+        save_game(game_session)
+        channel = channels.open(game_session)
+        heartbeat = app.config.get("MOVE_CHANNEL_HEARTBEAT_SECONDS", DEFAULT_HEARTBEAT_SECONDS)
+
+        def events():
+            try:
+                yield from channel.stream(heartbeat)
+            finally:
+                channels.close(channel.token)
+
+        return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    @app.post("/game/channel/<token>/moves")
+    def move_channel_post(token: str):
+        # Runs without a Flask session (see ChannelSessionInterface); results go to the stream.
+        channels = get_channels()
+        channel = channels.get(token) if channels is not None else None
+        if channel is None:
+            return jsonify({"ok": False, "message": "Unknown or closed move channel."}), 404
+
+        payload = request.get_json(silent=True)
+        moves = payload.get("moves") if isinstance(payload, dict) else None
+        if not isinstance(moves, list):
+            return jsonify({"ok": False, "message": "Expected a JSON object with a list of moves."}), 400
+
+        result = channel.apply(moves)
+        if any(move["ok"] for move in result["results"]):
+            get_cache().mark_dirty(channel.game_session.sessionId)
+        channels.count_post(len(moves))
+        return "", 204
+
+    @app.post("/game/undo")
+    def undo_move_route():
+        # Undo the latest journaled move of the active game.
+        return _history_response(undo_move())
+
+    @app.post("/game/redo")
+    def redo_move_route():
+        return _history_response(redo_move())
+
+    def _history_response(result: dict):
+        set_move_error("" if result["ok"] else result["message"])
+        if not result["ok"]:
+            return _move_response(False, result["message"], "", request)
+        value = "" if result["value"] is None else str(result["value"])
+        return _move_response(True, result["message"], value, request, row=result["row"], col=result["col"])
+
+    @app.post("/game/hint")
+    def hint_cell_route():
+        # Flow 4B checkHint: JSON {"row", "col"} names the focused cell; both are optional.
+        row, col = _cell_from_json(request)
+        return jsonify(hint_cell(row, col))
+
+    @app.post("/game/reveal")
+    def reveal_cell_route():
+        row, col = _cell_from_json(request)
+        if row is None:
+            return jsonify({"ok": False, "message": "Invalid cell coordinates."}), 400
+        result = reveal_cell(row, col)
+        set_move_error("" if result["ok"] else result["message"])
+        return jsonify(result)
+
+    @app.post("/game/check")
+    def check_cells_route():
+        # Per-cell correctness against the stored solution, without submitting.
+        return jsonify(check_cells())
+
     @app.post("/game/submit")
     def submit_solution_route():
         # Flow 4D: submitBoard (Operation Contract), implemented as submitSolution().
-        pre_submit_game = get_game()
-        was_finished_before_submit = bool(pre_submit_game and pre_submit_game.status == "Finished")
-        if pre_submit_game is not None:
-            try:
-                elapsed_time = int(request.form.get("elapsed_time", pre_submit_game.elapsedTime))
-            except ValueError:
-                elapsed_time = pre_submit_game.elapsedTime
-            pre_submit_game.elapsedTime = max(0, elapsed_time)
-            save_game(pre_submit_game)
-
-        result = submit_solution()
+        result = submit_active_game(request.form.get("elapsed_time"))
         if not result.get("ok"):
             # ALT path: submit attempted without active session.
             flash(result["message"], "danger")
@@ -315,10 +483,8 @@ def create_app(test_config: dict | None = None) -> Flask:
 
         if result["isSolved"]:
             # Success path: solved board.
-            if not was_finished_before_submit:
-                score = record_completed_game(db_path, session.get("user_id"), get_game())
-                if score is not None:
-                    flash(f"Score recorded: {score} points.", "info")
+            if result["score"] is not None:
+                flash(f"Score recorded: {result['score']} points.", "info")
             flash("Win! Puzzle solved correctly.", "success")
             return redirect(url_for("menu"))
         else:
@@ -327,15 +493,130 @@ def create_app(test_config: dict | None = None) -> Flask:
 
         return redirect(url_for("game_screen"))
 
+    def submit_active_game(raw_elapsed) -> dict:
+        pre_submit_game = get_game()
+        was_finished_before_submit = bool(pre_submit_game and pre_submit_game.status == "Finished")
+        if pre_submit_game is not None:
+            pre_submit_game.elapsedTime = _parse_elapsed(raw_elapsed, pre_submit_game.elapsedTime)
+            save_game(pre_submit_game)
+
+        result = submit_solution()
+        result["score"] = None
+        if result.get("ok") and result["isSolved"] and not was_finished_before_submit:
+            result["score"] = record_completed_game(db_path, session.get("user_id"), get_game())
+        return result
+
+    @app.get("/api/game")
+    def game_state_api():
+        # JSON counterpart of GET /game: compact board plus feedback, no page render.
+        game_session = get_game()
+        if game_session is None:
+            return jsonify({"ok": False, "message": "No active game session."}), 404
+        return jsonify({"ok": True, "game": game_state(game_session)})
+
+    @app.post("/api/game/submit")
+    def submit_solution_api():
+        # Flow 4D over JSON: wrong cells come back in the response instead of a redirect.
+        payload = request.get_json(silent=True) or {}
+        result = submit_active_game(payload.get("elapsedTime"))
+        if not result.get("ok"):
+            return jsonify(result), 404
+
+        response = {**result, "game": game_state(get_game())}
+        if result["isSolved"]:
+            # The menu shows the win and the leaderboard, as after the form submit.
+            if result["score"] is not None:
+                flash(f"Score recorded: {result['score']} points.", "info")
+            flash("Win! Puzzle solved correctly.", "success")
+            response["redirect"] = url_for("menu")
+        return jsonify(response)
+
+    @app.post("/api/game/pause")
+    def pause_game_api():
+        return _game_api_action(paused=True)
+
+    @app.post("/api/game/resume")
+    def resume_game_api():
+        return _game_api_action(paused=False)
+
+    def _game_api_action(paused: bool):
+        # Flow 4E over JSON; returns the updated game state.
+        if get_game() is None:
+            return jsonify({"ok": False, "message": "No active game session."}), 404
+        set_paused(paused)
+        if paused:
+            autosave_current_game(db_path, session.get("user_id"))
+        return jsonify({"ok": True, "game": game_state(get_game())})
+
+    @app.post("/api/game/save")
+    def save_game_api():
+        # Flow 4F over JSON: the player stays on the (paused) game screen.
+        if get_game() is None:
+            return jsonify({"ok": False, "message": "No active game session."}), 404
+        payload = request.get_json(silent=True) or {}
+        ok, message = save_active_game(payload.get("elapsedTime"), payload.get("label"))
+        return jsonify({"ok": ok, "message": message})
+
+    @app.get("/metrics/puzzle-pool")
+    def puzzle_pool_metrics():
+        # Operational view: pool depth, hit rate and refill latency per difficulty.
+        pool = get_pool()
+        if pool is None:
+            return jsonify({"enabled": False})
+        return jsonify({"enabled": True, **pool.metrics()})
+
+    @app.get("/metrics/leaderboard")
+    def leaderboard_metrics():
+        # Operational view: leaderboard cache hit/miss counters for this process.
+        return jsonify(get_leaderboard_cache().metrics())
+
+    @app.get("/metrics/move-journal")
+    def move_journal_metrics():
+        # Operational view: buffered vs flushed journal entries and batch sizes.
+        journal = get_journal()
+        if journal is None:
+            return jsonify({"enabled": False})
+        return jsonify({"enabled": True, **journal.metrics()})
+
+    @app.get("/metrics/move-channel")
+    def move_channel_metrics():
+        # Operational view: open SSE channels and moves received over them.
+        channels = get_channels()
+        if channels is None:
+            return jsonify({"enabled": False})
+        return jsonify({"enabled": True, **channels.metrics()})
+
+    @app.get("/metrics/game-sessions")
+    def game_session_metrics():
+        # Operational view: live GameSession cache size and hit rate for this process.
+        return jsonify(get_cache().metrics())
+
     return app
 
 
-def _move_response(ok: bool, message: str, value: str, req):
+def _parse_elapsed(raw_value, default: int) -> int:
+    try:
+        return max(0, int(raw_value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _cell_from_json(req) -> tuple[int | None, int | None]:
+    payload = req.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return None, None
+    try:
+        return int(payload["row"]), int(payload["col"])
+    except (KeyError, TypeError, ValueError):
+        return None, None
+
+
+def _move_response(ok: bool, message: str, value: str, req, **extra):
     if req.headers.get("X-Requested-With") == "XMLHttpRequest":
-        return jsonify({"ok": ok, "message": message, "value": value})
+        return jsonify({"ok": ok, "message": message, "value": value, **extra})
 
     if ok:
         flash(message, "info")
     else:
         flash(message, "danger")
-    return redirect(url_for("game_screen"))
+    return redirect(url_for("game_screen"))
@@ -13,6 +13,31 @@ class Config:
     SESSION_TYPE = "filesystem"
     SESSION_FILE_DIR = str(BASE_DIR / ".flask_session")
     SESSION_USE_SIGNER = True
+    GAME_CACHE_SIZE = 256
 
     DB_PATH = DB_PATH
     SCHEMA_PATH = SCHEMA_PATH
+
+    PUZZLE_POOL_ENABLED = True
+    PUZZLE_POOL_LOW_WATER = 2
+    PUZZLE_POOL_TARGET = 6
+    PUZZLE_POOL_PATH = None
+    # Rating band [low, high) each difficulty's boards are drawn from (services/rating.py);
+    # None leaves a side open. An empty dict turns band selection off. The bands do not
+    # overlap; bounds follow the rating quartiles from benchmarks/bench_rating.py, where the
+    # refill keeps about 40% of medium, half of hard and two thirds of easy boards.
+    PUZZLE_RATING_BANDS = {"easy": (None, 27.0), "medium": (27.0, 34.0), "hard": (34.0, None)}
+    # Difficulties the pool keeps stocked. Marathon boards take about a second each, so
+    # they are generated on demand instead of being held in the queue.
+    PUZZLE_POOL_DIFFICULTIES = ("easy", "medium", "hard", "expert")
+    # Board layout engine: "python", or "numpy" for the optional NumPy batch engine
+    # (services/layout_engine.py). A seed gives a different board under each engine.
+    LAYOUT_ENGINE = "python"
+
+    JOURNAL_ENABLED = True
+    JOURNAL_FLUSH_SECONDS = 2.0
+    JOURNAL_BATCH_SIZE = 50
+
+    # Optional SSE move channel (single-process deployments: channels live in memory).
+    MOVE_CHANNEL_ENABLED = False
+    MOVE_CHANNEL_HEARTBEAT_SECONDS = 5.0
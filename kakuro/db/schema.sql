@@ -6,18 +6,43 @@ CREATE TABLE IF NOT EXISTS users (
     created_at TEXT NOT NULL
 );
 
+-- Immutable puzzle definitions (layout, clues, solution), stored once per distinct puzzle.
+CREATE TABLE IF NOT EXISTS puzzle_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_hash TEXT UNIQUE NOT NULL,
+    difficulty TEXT NOT NULL,
+    puzzle TEXT NOT NULL
+);
+
+-- One manual slot per game session plus a per-user ring of autosaves.
+-- A slot stores only progress (cell values, hints) against a shared puzzle record;
+-- board_state holds a full snapshot only for rows saved before the split.
 CREATE TABLE IF NOT EXISTS saved_games (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    session_id TEXT UNIQUE NOT NULL,
+    session_id TEXT NOT NULL,
     user_id INTEGER NOT NULL,
-    board_state TEXT NOT NULL,
+    label TEXT,
+    is_autosave INTEGER NOT NULL DEFAULT 0,
     difficulty TEXT NOT NULL,
     elapsed_time INTEGER NOT NULL DEFAULT 0,
     status TEXT NOT NULL,
     saved_at TEXT NOT NULL,
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    puzzle_id INTEGER,
+    progress TEXT,
+    board_state TEXT,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (puzzle_id) REFERENCES puzzle_records(id)
 );
 
+CREATE UNIQUE INDEX IF NOT EXISTS idx_saved_games_manual_session
+    ON saved_games (session_id) WHERE is_autosave = 0;
+
+CREATE INDEX IF NOT EXISTS idx_saved_games_user_saved
+    ON saved_games (user_id, saved_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_saved_games_user_autosave
+    ON saved_games (user_id, is_autosave, saved_at);
+
 CREATE TABLE IF NOT EXISTS leaderboard_entries (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     user_id INTEGER NOT NULL,
@@ -27,3 +52,49 @@ CREATE TABLE IF NOT EXISTS leaderboard_entries (
     created_at TEXT NOT NULL,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
+
+-- Covering index for the leaderboard ordering, overall and per difficulty.
+CREATE INDEX IF NOT EXISTS idx_leaderboard_rank
+    ON leaderboard_entries (score DESC, elapsed_time ASC, created_at ASC, user_id);
+
+CREATE INDEX IF NOT EXISTS idx_leaderboard_difficulty_rank
+    ON leaderboard_entries (difficulty, score DESC, elapsed_time ASC, created_at ASC, user_id);
+
+-- Period (daily/weekly) boards scan only the entries created since the period start.
+CREATE INDEX IF NOT EXISTS idx_leaderboard_created
+    ON leaderboard_entries (created_at);
+
+CREATE INDEX IF NOT EXISTS idx_leaderboard_difficulty_created
+    ON leaderboard_entries (difficulty, created_at);
+
+-- Materialized top-N per board ('all' plus one board per difficulty), maintained by
+-- add_leaderboard_entry in the same transaction as the entry insert.
+CREATE TABLE IF NOT EXISTS leaderboard_top (
+    board TEXT NOT NULL,
+    entry_id INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    elapsed_time INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (board, entry_id),
+    FOREIGN KEY (entry_id) REFERENCES leaderboard_entries(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_leaderboard_top_rank
+    ON leaderboard_top (board, score DESC, elapsed_time ASC, created_at ASC, entry_id ASC);
+
+-- Append-only per-game move log, written in batches by the journal service. Undo/redo
+-- are journaled as moves of their own, so replaying new_value in seq order rebuilds a board.
+CREATE TABLE IF NOT EXISTS move_journal (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    cell_row INTEGER NOT NULL,
+    cell_col INTEGER NOT NULL,
+    old_value INTEGER,
+    new_value INTEGER,
+    kind TEXT NOT NULL DEFAULT 'move',
+    created_at REAL NOT NULL,
+    UNIQUE (session_id, seq)
+);
@@ -0,0 +1,180 @@
+"""
+Batch puzzle generation CLI.
+Fans deterministic seed ranges out across worker processes and streams finished templates
+to a JSONL file or an SQLite puzzle store (the format read by PUZZLE_POOL_PATH).
+
+Usage: python -m kakuro.generate --difficulty hard --count 1000 --workers 4 --output hard.sqlite
+A seed reproduces the same board only under the same --layout-engine (pure Python by default).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from .services.board_generator import (
+    DIFFICULTY_CONFIGS,
+    LAYOUT_ENGINES,
+    PYTHON_LAYOUT_ENGINE,
+    _build_template_from_seed,
+    check_layout_engine,
+)
+from .services.puzzle_pool import PuzzleStore
+
+
+def _generate_seed(difficulty: str, seed: int, engine: str) -> tuple[int, dict | None, float, int]:
+    started = time.perf_counter()
+    template = _build_template_from_seed(difficulty, DIFFICULTY_CONFIGS[difficulty], seed, engine)
+    return seed, template, time.perf_counter() - started, os.getpid()
+
+
+class _JsonlWriter:
+    def __init__(self, path: Path) -> None:
+        self._handle = path.open("a", encoding="utf-8")
+
+    def write(self, difficulty: str, template: dict) -> None:
+        self._handle.write(json.dumps(template, separators=(",", ":")) + "\n")
+        self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class _SqliteWriter:
+    def __init__(self, path: Path) -> None:
+        self._store = PuzzleStore(path)
+
+    def write(self, difficulty: str, template: dict) -> None:
+        self._store.push_many(difficulty, [template])
+
+    def close(self) -> None:
+        pass
+
+
+def _open_writer(path: Path):
+    if path.suffix.lower() in {".sqlite", ".sqlite3", ".db"}:
+        return _SqliteWriter(path)
+    return _JsonlWriter(path)
+
+
+def run_batch(
+    difficulty: str,
+    count: int,
+    workers: int,
+    seed_start: int,
+    output: Path,
+    seed_end: int | None = None,
+    layout_engine: str = PYTHON_LAYOUT_ENGINE,
+) -> dict:
+    check_layout_engine(layout_engine)
+    writer = _open_writer(output)
+    per_worker: dict[int, dict] = {}
+    produced = 0
+    failed = 0
+    next_seed = seed_start
+    started = time.perf_counter()
+
+    def seeds_left() -> bool:
+        return seed_end is None or next_seed <= seed_end
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+
+            def top_up() -> None:
+                # Keep a bounded number of seeds in flight; rejected seeds are replaced.
+                nonlocal next_seed
+                while produced + len(pending) < count and seeds_left() and len(pending) < workers * 4:
+                    pending.add(executor.submit(_generate_seed, difficulty, next_seed, layout_engine))
+                    next_seed += 1
+
+            top_up()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _, template, elapsed, pid = future.result()
+                    stats = per_worker.setdefault(pid, {"boards": 0, "busySeconds": 0.0})
+                    stats["busySeconds"] += elapsed
+                    if template is None:
+                        failed += 1
+                    elif produced < count:
+                        writer.write(difficulty, template)
+                        stats["boards"] += 1
+                        produced += 1
+                top_up()
+    finally:
+        writer.close()
+
+    wall_seconds = time.perf_counter() - started
+    return {
+        "difficulty": difficulty,
+        "layoutEngine": layout_engine,
+        "produced": produced,
+        "failedSeeds": failed,
+        "seedRange": [seed_start, next_seed - 1],
+        "wallSeconds": wall_seconds,
+        "boardsPerSecond": produced / wall_seconds if wall_seconds else 0.0,
+        "workers": {
+            pid: {
+                **stats,
+                "boardsPerSecond": stats["boards"] / stats["busySeconds"] if stats["busySeconds"] else 0.0,
+            }
+            for pid, stats in per_worker.items()
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m kakuro.generate", description="Generate Kakuro puzzles in bulk.")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTY_CONFIGS), default="easy")
+    parser.add_argument("--count", type=int, default=100, help="number of boards to write")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed-start", type=int, default=1, help="first seed of the deterministic range")
+    parser.add_argument("--seed-end", type=int, default=None, help="last seed to try (inclusive)")
+    parser.add_argument("--output", type=Path, required=True, help=".jsonl file or .sqlite puzzle store")
+    parser.add_argument(
+        "--layout-engine",
+        choices=LAYOUT_ENGINES,
+        default=PYTHON_LAYOUT_ENGINE,
+        help="numpy needs NumPy installed; seeds map to different boards per engine",
+    )
+    args = parser.parse_args(argv)
+
+    if args.count < 1 or args.workers < 1:
+        parser.error("--count and --workers must be positive.")
+    try:
+        check_layout_engine(args.layout_engine)
+    except RuntimeError as exc:
+        parser.error(str(exc))
+
+    report = run_batch(
+        difficulty=args.difficulty,
+        count=args.count,
+        workers=args.workers,
+        seed_start=args.seed_start,
+        output=args.output,
+        seed_end=args.seed_end,
+        layout_engine=args.layout_engine,
+    )
+
+    print(
+        f"{report['produced']} {report['difficulty']} boards ({report['layoutEngine']} layouts) from seeds "
+        f"{report['seedRange'][0]}-{report['seedRange'][1]} in {report['wallSeconds']:.2f}s "
+        f"({report['boardsPerSecond']:.1f} boards/s, {report['failedSeeds']} seeds rejected)",
+        file=sys.stderr,
+    )
+    for pid, stats in sorted(report["workers"].items()):
+        print(
+            f"  worker {pid}: {stats['boards']} boards, {stats['boardsPerSecond']:.1f} boards/s",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
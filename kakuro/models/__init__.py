@@ -8,6 +8,7 @@ from .domain import (
     PlayCell,
     RegisteredUser,
     Result,
+    Run,
     SavedGame,
     User,
 )
@@ -21,6 +22,7 @@ __all__ = [
     "Cell",
     "PlayCell",
     "ClueCell",
+    "Run",
     "Result",
     "SavedGame",
     "DifficultyLevel",
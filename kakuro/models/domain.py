@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 
 
 class DifficultyLevel(str, Enum):
     EASY = "easy"
     MEDIUM = "medium"
     HARD = "hard"
+    EXPERT = "expert"
+    MARATHON = "marathon"
 
     def __str__(self) -> str:
         return self.value
@@ -19,13 +23,24 @@ class DifficultyLevel(str, Enum):
             return value
 
         normalized = str(value or "").strip().lower()
-        if normalized == cls.MEDIUM.value:
-            return cls.MEDIUM
-        if normalized == cls.HARD.value:
-            return cls.HARD
+        for level in cls:
+            if normalized == level.value:
+                return level
         return cls.EASY
 
 
+BOARD_FORMAT_VERSION = 2
+
+_NO_CELL = " "
+_CLUE_CODE = "#"
+# Play cell codes keyed by (editable, hinted).
+_PLAY_CODES = {(True, False): ".", (True, True): "h", (False, False): "g", (False, True): "G"}
+_PLAY_FLAGS = {code: flags for flags, code in _PLAY_CODES.items()}
+# Hints are player progress, not part of the puzzle: strip and re-apply them on split/join.
+_WITHOUT_HINT = {"h": ".", "G": "g"}
+_WITH_HINT = {plain: hinted for hinted, plain in _WITHOUT_HINT.items()}
+
+
 @dataclass
 class User:
     userId: Optional[int]
@@ -167,12 +182,136 @@ class ClueCell(Cell):
         return payload
 
 
+@dataclass(frozen=True)
+class Run:
+    runId: int
+    direction: str
+    clueCell: Optional[tuple[int, int]]
+    cells: tuple[tuple[int, int], ...]
+    target: Optional[int] = None
+
+    @property
+    def length(self) -> int:
+        return len(self.cells)
+
+    def to_dict(self) -> dict:
+        return {
+            "runId": self.runId,
+            "direction": self.direction,
+            "clueCell": list(self.clueCell) if self.clueCell else None,
+            "cells": [[r, c] for r, c in self.cells],
+            "target": self.target,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "Run":
+        clue_cell = data.get("clueCell")
+        return Run(
+            runId=int(data["runId"]),
+            direction=data["direction"],
+            clueCell=(clue_cell[0], clue_cell[1]) if clue_cell else None,
+            cells=tuple((r, c) for r, c in data["cells"]),
+            target=data.get("target"),
+        )
+
+
+def _scan_runs(play: list[list[bool]], clue_sums: dict[tuple[int, int], tuple[Optional[int], Optional[int]]]) -> list[Run]:
+    # Across runs first, then down runs, each in row-major order of their first cell.
+    rows, cols = len(play), len(play[0]) if play else 0
+    runs: list[Run] = []
+    for direction, dr, dc in (("across", 0, 1), ("down", 1, 0)):
+        for r in range(rows):
+            for c in range(cols):
+                if not play[r][c]:
+                    continue
+                pr, pc = r - dr, c - dc
+                if pr >= 0 and pc >= 0 and play[pr][pc]:
+                    continue
+
+                members = []
+                rr, cc = r, c
+                while rr < rows and cc < cols and play[rr][cc]:
+                    members.append((rr, cc))
+                    rr += dr
+                    cc += dc
+
+                clue_cell = (pr, pc) if pr >= 0 and pc >= 0 else None
+                target = None
+                if clue_cell in clue_sums:
+                    clue_down, clue_right = clue_sums[clue_cell]
+                    target = clue_right if direction == "across" else clue_down
+                runs.append(
+                    Run(
+                        runId=len(runs),
+                        direction=direction,
+                        clueCell=clue_cell,
+                        cells=tuple(members),
+                        target=target,
+                    )
+                )
+    return runs
+
+
+@lru_cache(maxsize=256)
+def _compact_runs(cols: int, layout: str, clues: tuple[int, ...]) -> tuple[Run, ...]:
+    # Runs are frozen, so boards decoded from the same layout share one run table.
+    play = [[code not in (_NO_CELL, _CLUE_CODE) for code in layout[i : i + cols]] for i in range(0, len(layout), cols)]
+    clue_sums = {}
+    for index, code in enumerate(layout):
+        if code == _CLUE_CODE:
+            pos = len(clue_sums) * 2
+            clue_sums[divmod(index, cols)] = (clues[pos] or None, clues[pos + 1] or None)
+    return tuple(_scan_runs(play, clue_sums))
+
+
 @dataclass
 class Board:
     boardId: str
     difficulty: str
     size: tuple[int, int]
     cells: list[Cell] = field(default_factory=list)
+    runs: list[Run] = field(default_factory=list)
+    # Difficulty rating from solver effort (services/rating.py); None for unrated boards.
+    rating: Optional[float] = None
+    # Set once a solve for a board without a stored solution failed or found several, so
+    # hints stay off without searching again (services/hint_service.py).
+    solutionUnknown: bool = False
+    _grid: list[list[Optional[Cell]]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _run_ids: dict[tuple[int, int], tuple[int, int]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _run_members: list[list[Cell]] = field(default_factory=list, init=False, repr=False, compare=False)
+    # Incremental per-run validation state, created and maintained by validation_service.
+    progress: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._build_index()
+
+    def _build_index(self) -> None:
+        # Layouts never change after construction, so the coordinate grid and the
+        # run table are built once and every later lookup is direct.
+        rows, cols = self.size
+        grid: list[list[Optional[Cell]]] = [[None for _ in range(cols)] for _ in range(rows)]
+        for cell in self.cells:
+            grid[cell.row][cell.col] = cell
+        self._grid = grid
+
+        if not self.runs:
+            self.runs = self._derive_runs()
+
+        across_ids: dict[tuple[int, int], int] = {}
+        down_ids: dict[tuple[int, int], int] = {}
+        self._run_members = []
+        for run in self.runs:
+            target = across_ids if run.direction == "across" else down_ids
+            for rc in run.cells:
+                target[rc] = run.runId
+            self._run_members.append([grid[r][c] for r, c in run.cells])
+        self._run_ids = {rc: (across_ids[rc], down_ids[rc]) for rc in across_ids if rc in down_ids}
+
+    def _derive_runs(self) -> list[Run]:
+        # Single pass over the grid for boards that were not built with a run table.
+        play = [[cell is not None and cell.isPlayable for cell in grid_row] for grid_row in self._grid]
+        clue_sums = {(cell.row, cell.col): (cell.clueDown, cell.clueRight) for cell in self.cells if not cell.isPlayable}
+        return _scan_runs(play, clue_sums)
 
     @property
     def rows(self) -> int:
@@ -183,20 +322,23 @@ class Board:
         return self.size[1]
 
     def get_cell(self, row: int, col: int) -> Optional[Cell]:
-        for cell in self.cells:
-            if cell.row == row and cell.col == col:
-                return cell
+        if 0 <= row < self.size[0] and 0 <= col < self.size[1]:
+            return self._grid[row][col]
         return None
 
     def getCell(self, row: int, col: int) -> Optional[Cell]:
         return self.get_cell(row, col)
 
     def matrix(self) -> list[list[Cell]]:
-        rows, cols = self.size
-        grid = [[None for _ in range(cols)] for _ in range(rows)]
-        for cell in self.cells:
-            grid[cell.row][cell.col] = cell
-        return grid
+        # Shared index, not a copy: callers may update cell values but must not reshape it.
+        return self._grid
+
+    def runs_for(self, row: int, col: int) -> tuple[Run, Run]:
+        across_id, down_id = self._run_ids[(row, col)]
+        return self.runs[across_id], self.runs[down_id]
+
+    def run_cells(self, run: Run) -> list[Cell]:
+        return self._run_members[run.runId]
 
     def validateEntry(self, row: int, col: int, value: Optional[int]) -> tuple[bool, str]:
         cell = self.get_cell(row, col)
@@ -204,16 +346,17 @@ class Board:
             return False, "Invalid cell coordinates."
         if not cell.isPlayable:
             return False, "Selected cell is not playable."
+        if isinstance(cell, PlayCell) and not cell.editable:
+            return False, "Selected cell is a fixed given."
         if value is not None and (value < 1 or value > 9):
             return False, "Value must be empty or a digit 1-9."
 
-        matrix = self.matrix()
         old_value = cell.value
         cell.value = value
 
-        for run in (self._across_run(matrix, row, col), self._down_run(matrix, row, col)):
+        for run in self.runs_for(row, col):
             seen: set[int] = set()
-            for run_cell in run:
+            for run_cell in self.run_cells(run):
                 if run_cell.value is None:
                     continue
                 if run_cell.value in seen:
@@ -221,43 +364,155 @@ class Board:
                     return False, "Duplicate value in run is not allowed."
                 seen.add(run_cell.value)
 
+        if value != old_value:
+            # Written around validation_service's running totals; rebuild them on next use.
+            self.progress = None
         return True, "Move accepted."
 
-    def _across_run(self, matrix: list[list[Cell]], row: int, col: int) -> list[Cell]:
-        cols = len(matrix[0])
-        left = col
-        while left - 1 >= 0 and matrix[row][left - 1].isPlayable:
-            left -= 1
-        right = col
-        while right + 1 < cols and matrix[row][right + 1].isPlayable:
-            right += 1
-        return [matrix[row][c] for c in range(left, right + 1)]
-
-    def _down_run(self, matrix: list[list[Cell]], row: int, col: int) -> list[Cell]:
-        rows = len(matrix)
-        top = row
-        while top - 1 >= 0 and matrix[top - 1][col].isPlayable:
-            top -= 1
-        bottom = row
-        while bottom + 1 < rows and matrix[bottom + 1][col].isPlayable:
-            bottom += 1
-        return [matrix[r][col] for r in range(top, bottom + 1)]
-
     def to_dict(self) -> dict:
-        return {
+        # Compact v2 encoding, one character per coordinate in row-major order:
+        # "layout" holds the cell kind, "clues" a (down, right) pair per clue cell and
+        # "values"/"solution" one digit per play cell (0 = empty). Runs are not stored;
+        # they are re-derived from the layout and clues on load.
+        layout: list[str] = []
+        clues: list[int] = []
+        values: list[str] = []
+        solution: list[str] = []
+        for grid_row in self._grid:
+            for cell in grid_row:
+                if cell is None:
+                    layout.append(_NO_CELL)
+                elif cell.isPlayable:
+                    editable = getattr(cell, "editable", True)
+                    hinted = getattr(cell, "hinted", False)
+                    layout.append(_PLAY_CODES[(editable, hinted)])
+                    values.append(str(cell.value or 0))
+                    solution.append(str(getattr(cell, "correctValue", None) or 0))
+                else:
+                    layout.append(_CLUE_CODE)
+                    clues.append(cell.clueDown or 0)
+                    clues.append(cell.clueRight or 0)
+
+        payload = {
+            "v": BOARD_FORMAT_VERSION,
             "boardId": self.boardId,
             "difficulty": str(self.difficulty),
             "size": [self.size[0], self.size[1]],
-            "cells": [cell.to_dict() for cell in self.cells],
+            "layout": "".join(layout),
+            "clues": clues,
+            "values": "".join(values),
         }
+        if any(digit != "0" for digit in solution):
+            payload["solution"] = "".join(solution)
+        if self.rating is not None:
+            payload["rating"] = self.rating
+        if self.solutionUnknown:
+            payload["solutionUnknown"] = True
+        return payload
 
     @staticmethod
     def from_dict(data: dict) -> "Board":
+        if data.get("v") == BOARD_FORMAT_VERSION:
+            return Board._from_compact(data)
+
+        # Version 1: one verbose dict per cell plus the run table.
         return Board(
             boardId=data["boardId"],
             difficulty=str(data["difficulty"]),
             size=(data["size"][0], data["size"][1]),
             cells=[Cell.from_dict(cell) for cell in data["cells"]],
+            runs=[Run.from_dict(run) for run in data.get("runs", [])],
+        )
+
+    def split_state(self) -> tuple[dict, dict]:
+        # Immutable puzzle (layout, clues, solution) and mutable progress (values, hints).
+        payload = self.to_dict()
+        layout = payload["layout"]
+        puzzle = {
+            "size": payload["size"],
+            "layout": "".join(_WITHOUT_HINT.get(code, code) for code in layout),
+            "clues": payload["clues"],
+        }
+        for key in ("solution", "rating", "solutionUnknown"):
+            if key in payload:
+                puzzle[key] = payload[key]
+
+        progress: dict = {"boardId": self.boardId, "values": payload["values"]}
+        hinted = [index for index, code in enumerate(layout) if code in _WITHOUT_HINT]
+        if hinted:
+            progress["hinted"] = hinted
+        return puzzle, progress
+
+    @staticmethod
+    def join_state(puzzle: dict, progress: dict, difficulty: str) -> dict:
+        # Inverse of split_state; returns the compact v2 dict accepted by from_dict.
+        layout = list(puzzle["layout"])
+        for index in progress.get("hinted", ()):
+            layout[index] = _WITH_HINT[layout[index]]
+        payload = {
+            "v": BOARD_FORMAT_VERSION,
+            "boardId": progress["boardId"],
+            "difficulty": str(difficulty),
+            "size": puzzle["size"],
+            "layout": "".join(layout),
+            "clues": puzzle["clues"],
+            "values": progress["values"],
+        }
+        for key in ("solution", "rating", "solutionUnknown"):
+            if key in puzzle:
+                payload[key] = puzzle[key]
+        return payload
+
+    @staticmethod
+    def _from_compact(data: dict) -> "Board":
+        rows, cols = data["size"][0], data["size"][1]
+        layout = data["layout"]
+        if len(layout) != rows * cols:
+            raise ValueError("Board layout does not match board size.")
+
+        clues = data.get("clues", [])
+        values = data.get("values", "")
+        solution = data.get("solution")
+        cells: list[Cell] = []
+        clue_pos = 0
+        play_pos = 0
+        for index, code in enumerate(layout):
+            row, col = divmod(index, cols)
+            if code == _NO_CELL:
+                continue
+            if code == _CLUE_CODE:
+                cells.append(
+                    ClueCell(
+                        row=row,
+                        col=col,
+                        clueDown=clues[clue_pos] or None,
+                        clueRight=clues[clue_pos + 1] or None,
+                    )
+                )
+                clue_pos += 2
+                continue
+
+            editable, hinted = _PLAY_FLAGS[code]
+            cells.append(
+                PlayCell(
+                    row=row,
+                    col=col,
+                    value=int(values[play_pos]) or None,
+                    correctValue=(int(solution[play_pos]) or None) if solution else None,
+                    editable=editable,
+                    hinted=hinted,
+                )
+            )
+            play_pos += 1
+
+        return Board(
+            boardId=data["boardId"],
+            difficulty=str(data["difficulty"]),
+            size=(rows, cols),
+            cells=cells,
+            runs=list(_compact_runs(cols, layout, tuple(clues))),
+            rating=data.get("rating"),
+            solutionUnknown=bool(data.get("solutionUnknown")),
         )
 
 
@@ -309,9 +564,20 @@ class GameSession:
     isCompleted: bool = False
     isSubmitted: bool = False
     result: Optional[Result] = None
+    # Sequence number of the last journaled move (see services/journal_service.py).
+    journalSeq: int = 0
+    # Journal timeline the moves are recorded under: the session id, or a branch of it once
+    # an older save slot has been loaded. Empty means the session id.
+    journalKey: str = ""
+    # (undo, redo) stacks built from the journal once per loaded session and kept in step
+    # by game_service; never serialized.
+    history: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
+    # Held while a request or a move-channel post changes this (cached, shared) object.
+    lock: Any = field(default_factory=threading.RLock, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         self.difficulty = str(DifficultyLevel.from_value(self.difficulty))
+        self.journalKey = self.journalKey or self.sessionId
         self._sync_state_flags()
 
     def _sync_state_flags(self) -> None:
@@ -357,9 +623,11 @@ class GameSession:
         self.isSubmitted = True
 
     def checkHint(self) -> Optional[tuple[int, int]]:
-        # Flow 4B checkHint: domain operation (currently not wired through route/service/UI).
+        # Flow 4B checkHint: marks the first empty (or, with a stored solution, wrong) cell.
+        # The /game/hint route goes through services/hint_service.py instead.
         for cell in self.board.cells:
-            if cell.isPlayable and cell.value is None:
+            correct_value = getattr(cell, "correctValue", None)
+            if cell.isPlayable and (cell.value is None or (correct_value and cell.value != correct_value)):
                 if isinstance(cell, PlayCell):
                     cell.hinted = True
                 return (cell.row, cell.col)
@@ -377,6 +645,8 @@ class GameSession:
             "isCompleted": self.isCompleted,
             "isSubmitted": self.isSubmitted,
             "result": self.result.to_dict() if self.result else None,
+            "journalSeq": self.journalSeq,
+            "journalKey": self.journalKey,
         }
 
     @staticmethod
@@ -394,6 +664,8 @@ class GameSession:
             isCompleted=bool(data.get("isCompleted", data.get("status") == "Finished")),
             isSubmitted=bool(data.get("isSubmitted", data.get("status") == "Finished")),
             result=Result.from_dict(data.get("result")),
+            journalSeq=int(data.get("journalSeq", 0) or 0),
+            journalKey=data.get("journalKey") or "",
         )
 
 
@@ -407,6 +679,8 @@ class SavedGame:
     elapsedTime: int
     status: str
     savedAt: str
+    journalSeq: int = 0
+    journalKey: str = ""
 
     def save(self) -> dict:
         return {
@@ -418,6 +692,8 @@ class SavedGame:
             "elapsedTime": self.elapsedTime,
             "status": self.status,
             "savedAt": self.savedAt,
+            "journalSeq": self.journalSeq,
+            "journalKey": self.journalKey,
         }
 
     def restore(self) -> GameSession:
@@ -430,4 +706,6 @@ class SavedGame:
             status=self.status,
             isPaused=False,
             result=None,
+            journalSeq=self.journalSeq,
+            journalKey=self.journalKey,
         )
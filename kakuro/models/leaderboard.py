@@ -3,14 +3,32 @@ from __future__ import annotations
 import sqlite3
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Optional
 
+from .db import connect
 from .user import DEFAULT_DB_PATH
 
+# Rows kept per board in leaderboard_top; larger requests fall back to the indexed scan.
+TOP_SIZE = 100
+ALL_BOARD = "all"
 
-def _connect(db_path: Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+_RANK_ORDER = "score DESC, elapsed_time ASC, created_at ASC, entry_id ASC"
+
+
+def _trim_board(conn: sqlite3.Connection, board: str) -> None:
+    conn.execute(
+        f"""
+        DELETE FROM leaderboard_top
+        WHERE board = ?
+          AND entry_id NOT IN (
+              SELECT entry_id FROM leaderboard_top
+              WHERE board = ?
+              ORDER BY {_RANK_ORDER}
+              LIMIT ?
+          )
+        """,
+        (board, board, TOP_SIZE),
+    )
 
 
 def add_leaderboard_entry(
@@ -19,9 +37,14 @@ def add_leaderboard_entry(
     elapsed_time: int,
     score: int,
     db_path: Path = DEFAULT_DB_PATH,
-) -> None:
-    with _connect(db_path) as conn:
-        conn.execute(
+) -> Optional[dict]:
+    difficulty = str(difficulty).lower()
+    elapsed_time = max(0, int(elapsed_time))
+    score = int(score)
+    created_at = datetime.now(UTC).isoformat()
+
+    with connect(db_path) as conn:
+        cursor = conn.execute(
             """
             INSERT INTO leaderboard_entries (
                 user_id,
@@ -32,33 +55,124 @@ def add_leaderboard_entry(
             )
             VALUES (?, ?, ?, ?, ?)
             """,
-            (
-                int(user_id),
-                str(difficulty).lower(),
-                max(0, int(elapsed_time)),
-                int(score),
-                datetime.now(UTC).isoformat(),
-            ),
+            (int(user_id), difficulty, elapsed_time, score, created_at),
         )
+        entry_id = cursor.lastrowid
+        row = conn.execute("SELECT username FROM users WHERE id = ?", (int(user_id),)).fetchone()
+        if row is None:
+            return None
 
+        # Same transaction: the summary can never disagree with the entries table.
+        for board in (ALL_BOARD, difficulty):
+            conn.execute(
+                """
+                INSERT INTO leaderboard_top (
+                    board, entry_id, username, difficulty, elapsed_time, score, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (board, entry_id, row["username"], difficulty, elapsed_time, score, created_at),
+            )
+            _trim_board(conn, board)
+
+    return {
+        "username": row["username"],
+        "difficulty": difficulty,
+        "elapsedTime": elapsed_time,
+        "score": score,
+        "createdAt": created_at,
+    }
 
-def get_top_leaderboard_entries(db_path: Path = DEFAULT_DB_PATH, limit: int = 10) -> list[dict]:
-    with _connect(db_path) as conn:
-        rows = conn.execute(
+
+def rebuild_leaderboard_top(db_path: Path = DEFAULT_DB_PATH) -> None:
+    # Backfill for databases created before leaderboard_top existed.
+    with connect(db_path) as conn:
+        conn.execute("DELETE FROM leaderboard_top")
+        conn.execute(
             """
-            SELECT
-                u.username AS username,
-                e.difficulty AS difficulty,
-                e.elapsed_time AS elapsed_time,
-                e.score AS score,
-                e.created_at AS created_at
-            FROM leaderboard_entries e
-            JOIN users u ON u.id = e.user_id
-            ORDER BY e.score DESC, e.elapsed_time ASC, e.created_at ASC
-            LIMIT ?
+            INSERT INTO leaderboard_top (board, entry_id, username, difficulty, elapsed_time, score, created_at)
+            SELECT board, entry_id, username, difficulty, elapsed_time, score, created_at
+            FROM (
+                SELECT
+                    boards.board AS board,
+                    e.id AS entry_id,
+                    u.username AS username,
+                    e.difficulty AS difficulty,
+                    e.elapsed_time AS elapsed_time,
+                    e.score AS score,
+                    e.created_at AS created_at,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY boards.board
+                        ORDER BY e.score DESC, e.elapsed_time ASC, e.created_at ASC, e.id ASC
+                    ) AS position
+                FROM leaderboard_entries e
+                JOIN users u ON u.id = e.user_id
+                JOIN (SELECT ? AS board UNION ALL SELECT DISTINCT difficulty FROM leaderboard_entries) boards
+                    ON boards.board IN (?, e.difficulty)
+            )
+            WHERE position <= ?
             """,
-            (max(1, int(limit)),),
-        ).fetchall()
+            (ALL_BOARD, ALL_BOARD, TOP_SIZE),
+        )
+
+
+def ensure_leaderboard_top(db_path: Path = DEFAULT_DB_PATH) -> None:
+    with connect(db_path) as conn:
+        has_entries = conn.execute("SELECT 1 FROM leaderboard_entries LIMIT 1").fetchone() is not None
+        has_top = conn.execute("SELECT 1 FROM leaderboard_top LIMIT 1").fetchone() is not None
+    if has_entries and not has_top:
+        rebuild_leaderboard_top(db_path)
+
+
+def get_top_leaderboard_entries(
+    db_path: Path = DEFAULT_DB_PATH,
+    limit: int = 10,
+    difficulty: Optional[str] = None,
+    since: Optional[str] = None,
+) -> list[dict]:
+    # `since` (ISO timestamp) restricts the board to entries created in a period.
+    limit = max(1, int(limit))
+    board = str(difficulty).lower() if difficulty else ALL_BOARD
+
+    with connect(db_path) as conn:
+        if limit <= TOP_SIZE and since is None:
+            # Reads at most `limit` rows of the summary table, independent of total entries.
+            rows = conn.execute(
+                f"""
+                SELECT username, difficulty, elapsed_time, score, created_at
+                FROM leaderboard_top
+                WHERE board = ?
+                ORDER BY {_RANK_ORDER}
+                LIMIT ?
+                """,
+                (board, limit),
+            ).fetchall()
+        else:
+            filters, params = [], []
+            if difficulty:
+                filters.append("e.difficulty = ?")
+                params.append(board)
+            if since is not None:
+                filters.append("e.created_at >= ?")
+                params.append(since)
+            where = f"WHERE {' AND '.join(filters)}" if filters else ""
+            params.append(limit)
+            rows = conn.execute(
+                f"""
+                SELECT
+                    u.username AS username,
+                    e.difficulty AS difficulty,
+                    e.elapsed_time AS elapsed_time,
+                    e.score AS score,
+                    e.created_at AS created_at
+                FROM leaderboard_entries e
+                JOIN users u ON u.id = e.user_id
+                {where}
+                ORDER BY e.score DESC, e.elapsed_time ASC, e.created_at ASC, e.id ASC
+                LIMIT ?
+                """,
+                params,
+            ).fetchall()
 
     return [
         {
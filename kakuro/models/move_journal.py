@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+from .db import connect
+from .user import DEFAULT_DB_PATH
+
+
+def insert_moves(rows: Iterable[tuple], db_path: Path = DEFAULT_DB_PATH) -> int:
+    # Rows are (session_id, seq, row, col, old_value, new_value, kind, created_at).
+    # One transaction per batch; a re-recorded seq (same session) replaces the older row.
+    rows = list(rows)
+    if not rows:
+        return 0
+    with connect(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO move_journal (
+                session_id, seq, cell_row, cell_col, old_value, new_value, kind, created_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+    return len(rows)
+
+
+def get_moves(session_id: str, after_seq: int = 0, db_path: Path = DEFAULT_DB_PATH) -> list[dict]:
+    with connect(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT seq, cell_row, cell_col, old_value, new_value, kind, created_at
+            FROM move_journal
+            WHERE session_id = ? AND seq > ?
+            ORDER BY seq
+            """,
+            (session_id, int(after_seq)),
+        ).fetchall()
+
+    return [
+        {
+            "seq": row["seq"],
+            "row": row["cell_row"],
+            "col": row["cell_col"],
+            "oldValue": row["old_value"],
+            "newValue": row["new_value"],
+            "kind": row["kind"],
+            "createdAt": row["created_at"],
+        }
+        for row in rows
+    ]
+
+
+def copy_moves(source_key: str, target_key: str, through_seq: int, db_path: Path = DEFAULT_DB_PATH) -> int:
+    # Seeds a new timeline with the history it shares with `source_key`.
+    with connect(db_path) as conn:
+        cursor = conn.execute(
+            """
+            INSERT OR REPLACE INTO move_journal (
+                session_id, seq, cell_row, cell_col, old_value, new_value, kind, created_at
+            )
+            SELECT ?, seq, cell_row, cell_col, old_value, new_value, kind, created_at
+            FROM move_journal
+            WHERE session_id = ? AND seq <= ?
+            """,
+            (target_key, source_key, int(through_seq)),
+        )
+    return cursor.rowcount
+
+
+def delete_timelines(session_id: str, db_path: Path = DEFAULT_DB_PATH) -> int:
+    # Every timeline of a game: the session id itself and its "<session id>:<branch>" keys.
+    with connect(db_path) as conn:
+        cursor = conn.execute(
+            "DELETE FROM move_journal WHERE session_id = ? OR substr(session_id, 1, ?) = ?",
+            (session_id, len(session_id) + 1, f"{session_id}:"),
+        )
+    return cursor.rowcount
+
+
+def delete_moves(session_id: str, after_seq: int = 0, db_path: Path = DEFAULT_DB_PATH) -> int:
+    with connect(db_path) as conn:
+        cursor = conn.execute(
+            "DELETE FROM move_journal WHERE session_id = ? AND seq > ?",
+            (session_id, int(after_seq)),
+        )
+    return cursor.rowcount
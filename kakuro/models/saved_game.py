@@ -1,85 +1,270 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import sqlite3
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Optional
 
-from .domain import GameSession, SavedGame
+from .db import connect
+from .domain import Board, GameSession, SavedGame
 from .user import DEFAULT_DB_PATH
 
+# Autosaves kept per user; older ones are dropped as new ones arrive.
+AUTOSAVE_SLOTS = 3
 
-def _connect(db_path: Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+_LEGACY_TABLE = "saved_games_v1"
+_METADATA_COLUMNS = "id, session_id, label, is_autosave, difficulty, elapsed_time, status, saved_at"
+_STATE_QUERY = """
+    SELECT s.id, s.session_id, s.user_id, s.difficulty, s.elapsed_time, s.status, s.saved_at,
+           s.progress, s.board_state, p.puzzle
+    FROM saved_games s
+    LEFT JOIN puzzle_records p ON p.id = s.puzzle_id
+"""
 
 
-def upsert_saved_game(game_session: GameSession, db_path: Path = DEFAULT_DB_PATH) -> None:
+def _table_columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def retire_legacy_saved_games(conn: sqlite3.Connection) -> None:
+    # Before the schema script runs: move an older table (single-slot, or full board
+    # snapshots only) aside so the schema can create the current one under the same name.
+    columns = _table_columns(conn, "saved_games")
+    if columns and "puzzle_id" not in columns:
+        conn.execute(f"ALTER TABLE saved_games RENAME TO {_LEGACY_TABLE}")
+        # Renamed indexes keep their idx_saved_games_* names; left in place, the schema's
+        # CREATE INDEX IF NOT EXISTS would skip the new table's and the DROP TABLE in
+        # migrate_legacy_saved_games would then leave it without them.
+        legacy_indexes = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (_LEGACY_TABLE,),
+        ).fetchall()
+        for row in legacy_indexes:
+            conn.execute(f'DROP INDEX "{row["name"]}"')
+
+
+def migrate_legacy_saved_games(conn: sqlite3.Connection) -> None:
+    # After the schema script runs: copy legacy rows in; they keep their full snapshot
+    # in board_state and are split into puzzle + progress the next time they are saved.
+    columns = _table_columns(conn, _LEGACY_TABLE)
+    if not columns:
+        return
+    label = "label" if "label" in columns else "NULL"
+    is_autosave = "is_autosave" if "is_autosave" in columns else "0"
+    conn.execute(
+        f"""
+        INSERT INTO saved_games (
+            session_id, user_id, label, is_autosave, difficulty, elapsed_time, status, saved_at, board_state
+        )
+        SELECT session_id, user_id, {label}, {is_autosave}, difficulty, elapsed_time, status, saved_at, board_state
+        FROM {_LEGACY_TABLE}
+        """
+    )
+    conn.execute(f"DROP TABLE {_LEGACY_TABLE}")
+
+
+def _dumps(data: dict) -> str:
+    return json.dumps(data, separators=(",", ":"), sort_keys=True)
+
+
+def _store_puzzle(conn: sqlite3.Connection, difficulty: str, puzzle: dict) -> int:
+    # Content-addressed: every player of the same puzzle points at one row.
+    text = _dumps(puzzle)
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    conn.execute(
+        "INSERT OR IGNORE INTO puzzle_records (content_hash, difficulty, puzzle) VALUES (?, ?, ?)",
+        (content_hash, difficulty, text),
+    )
+    return conn.execute("SELECT id FROM puzzle_records WHERE content_hash = ?", (content_hash,)).fetchone()["id"]
+
+
+def _slot_row(conn: sqlite3.Connection, game_session: GameSession) -> tuple:
     if game_session.userId is None:
         raise ValueError("Cannot save game without a user id.")
+    difficulty = str(game_session.difficulty)
+    puzzle, progress = game_session.board.split_state()
+    if game_session.journalSeq:
+        # Moves journaled after this point are replayed on top of the slot when it is resumed.
+        progress["journalSeq"] = game_session.journalSeq
+    if game_session.journalKey != game_session.sessionId:
+        progress["journalKey"] = game_session.journalKey
+    return (
+        game_session.sessionId,
+        game_session.userId,
+        difficulty,
+        int(game_session.elapsedTime),
+        game_session.status,
+        datetime.now(UTC).isoformat(),
+        _store_puzzle(conn, difficulty, puzzle),
+        _dumps(progress),
+    )
 
-    saved_at = datetime.now(UTC).isoformat()
-    board_state = json.dumps(game_session.board.to_dict(), separators=(",", ":"))
 
-    with _connect(db_path) as conn:
-        conn.execute(
+def upsert_saved_game(
+    game_session: GameSession,
+    db_path: Path = DEFAULT_DB_PATH,
+    label: Optional[str] = None,
+) -> int:
+    # Manual slot: one per game session, overwritten by later saves of the same game.
+    with connect(db_path) as conn:
+        session_id, user_id, difficulty, elapsed_time, status, saved_at, puzzle_id, progress = _slot_row(
+            conn, game_session
+        )
+        row = conn.execute(
             """
             INSERT INTO saved_games (
                 session_id,
                 user_id,
-                board_state,
+                label,
+                is_autosave,
                 difficulty,
                 elapsed_time,
                 status,
-                saved_at
+                saved_at,
+                puzzle_id,
+                progress
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(session_id) DO UPDATE SET
+            VALUES (?, ?, ?, 0, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(session_id) WHERE is_autosave = 0 DO UPDATE SET
                 user_id = excluded.user_id,
-                board_state = excluded.board_state,
+                label = COALESCE(excluded.label, saved_games.label),
                 difficulty = excluded.difficulty,
                 elapsed_time = excluded.elapsed_time,
                 status = excluded.status,
-                saved_at = excluded.saved_at
+                saved_at = excluded.saved_at,
+                puzzle_id = excluded.puzzle_id,
+                progress = excluded.progress,
+                board_state = NULL
+            RETURNING id
             """,
-            (
-                game_session.sessionId,
-                game_session.userId,
-                board_state,
-                str(game_session.difficulty),
-                int(game_session.elapsedTime),
-                game_session.status,
-                saved_at,
-            ),
-        )
+            (session_id, user_id, label, difficulty, elapsed_time, status, saved_at, puzzle_id, progress),
+        ).fetchone()
+    return int(row["id"])
 
 
-def get_latest_saved_game_for_user(user_id: int, db_path: Path = DEFAULT_DB_PATH) -> Optional[GameSession]:
-    with _connect(db_path) as conn:
-        row = conn.execute(
+def add_autosave(
+    game_session: GameSession,
+    db_path: Path = DEFAULT_DB_PATH,
+    slots: int = AUTOSAVE_SLOTS,
+) -> int:
+    # Ring buffer: append, then drop everything older than the newest `slots` autosaves.
+    with connect(db_path) as conn:
+        row = _slot_row(conn, game_session)
+        user_id = row[1]
+        cursor = conn.execute(
             """
-            SELECT session_id, user_id, board_state, difficulty, elapsed_time, status
+            INSERT INTO saved_games (
+                session_id, user_id, label, is_autosave, difficulty, elapsed_time, status, saved_at, puzzle_id, progress
+            )
+            VALUES (?, ?, NULL, 1, ?, ?, ?, ?, ?, ?)
+            """,
+            row,
+        )
+        conn.execute(
+            """
+            DELETE FROM saved_games
+            WHERE user_id = ? AND is_autosave = 1
+              AND id NOT IN (
+                  SELECT id FROM saved_games
+                  WHERE user_id = ? AND is_autosave = 1
+                  ORDER BY saved_at DESC, id DESC
+                  LIMIT ?
+              )
+            """,
+            (user_id, user_id, max(1, int(slots))),
+        )
+    return int(cursor.lastrowid)
+
+
+def list_saved_games(user_id: int, db_path: Path = DEFAULT_DB_PATH) -> list[dict]:
+    # Slot metadata only; progress and board_state are neither selected nor decoded.
+    with connect(db_path) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT {_METADATA_COLUMNS}
             FROM saved_games
             WHERE user_id = ?
-            ORDER BY saved_at DESC
-            LIMIT 1
+            ORDER BY saved_at DESC, id DESC
             """,
             (user_id,),
-        ).fetchone()
+        ).fetchall()
 
+    return [
+        {
+            "saveId": row["id"],
+            "sessionId": row["session_id"],
+            "label": row["label"],
+            "isAutosave": bool(row["is_autosave"]),
+            "difficulty": row["difficulty"],
+            "elapsedTime": int(row["elapsed_time"] or 0),
+            "status": row["status"],
+            "savedAt": row["saved_at"],
+        }
+        for row in rows
+    ]
+
+
+def _restore(row: Optional[sqlite3.Row]) -> Optional[GameSession]:
     if row is None:
         return None
 
+    journal_seq = 0
+    journal_key = ""
+    if row["puzzle"] is not None:
+        progress = json.loads(row["progress"])
+        journal_seq = int(progress.pop("journalSeq", 0))
+        journal_key = progress.pop("journalKey", "")
+        board_state = Board.join_state(json.loads(row["puzzle"]), progress, row["difficulty"])
+    else:
+        board_state = json.loads(row["board_state"])
+
     saved_game = SavedGame(
-        saveId=None,
+        saveId=row["id"],
         sessionId=row["session_id"],
         userId=row["user_id"],
-        boardState=json.loads(row["board_state"]),
+        boardState=board_state,
         difficulty=row["difficulty"],
         elapsedTime=int(row["elapsed_time"] or 0),
         status=row["status"],
-        savedAt="",
+        savedAt=row["saved_at"],
+        journalSeq=journal_seq,
+        journalKey=journal_key,
     )
     return saved_game.restore()
+
+
+def get_saved_game(save_id: int, user_id: int, db_path: Path = DEFAULT_DB_PATH) -> Optional[GameSession]:
+    with connect(db_path) as conn:
+        row = conn.execute(f"{_STATE_QUERY} WHERE s.id = ? AND s.user_id = ?", (save_id, user_id)).fetchone()
+    return _restore(row)
+
+
+def get_latest_saved_game_for_user(user_id: int, db_path: Path = DEFAULT_DB_PATH) -> Optional[GameSession]:
+    with connect(db_path) as conn:
+        row = conn.execute(
+            f"{_STATE_QUERY} WHERE s.user_id = ? ORDER BY s.saved_at DESC LIMIT 1",
+            (user_id,),
+        ).fetchone()
+    return _restore(row)
+
+
+def delete_saved_game(save_id: int, user_id: int, db_path: Path = DEFAULT_DB_PATH) -> bool:
+    with connect(db_path) as conn:
+        cursor = conn.execute("DELETE FROM saved_games WHERE id = ? AND user_id = ?", (save_id, user_id))
+    return cursor.rowcount > 0
+
+
+def saved_session_id(save_id: int, user_id: int, db_path: Path = DEFAULT_DB_PATH) -> Optional[str]:
+    with connect(db_path) as conn:
+        row = conn.execute(
+            "SELECT session_id FROM saved_games WHERE id = ? AND user_id = ?", (save_id, user_id)
+        ).fetchone()
+    return row["session_id"] if row else None
+
+
+def has_saved_games(session_id: str, db_path: Path = DEFAULT_DB_PATH) -> bool:
+    with connect(db_path) as conn:
+        row = conn.execute("SELECT 1 FROM saved_games WHERE session_id = ? LIMIT 1", (session_id,)).fetchone()
+    return row is not None
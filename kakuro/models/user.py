@@ -5,6 +5,7 @@ from datetime import datetime, UTC
 from pathlib import Path
 from typing import Optional
 
+from .db import connect
 from .domain import User
 
 
@@ -12,17 +13,19 @@ DEFAULT_DB_PATH = Path(__file__).resolve().parents[1] / "db" / "kakuro.sqlite"
 DEFAULT_SCHEMA_PATH = Path(__file__).resolve().parents[1] / "db" / "schema.sql"
 
 
-def _connect(db_path: Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-
 def init_db(db_path: Path = DEFAULT_DB_PATH, schema_path: Path = DEFAULT_SCHEMA_PATH) -> None:
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    with _connect(db_path) as conn:
+    # Imported here: these repositories depend on this module for DEFAULT_DB_PATH.
+    from .leaderboard import ensure_leaderboard_top
+    from .saved_game import migrate_legacy_saved_games, retire_legacy_saved_games
+
+    with connect(db_path) as conn:
         schema_sql = schema_path.read_text(encoding="utf-8")
+        retire_legacy_saved_games(conn)
         conn.executescript(schema_sql)
+        migrate_legacy_saved_games(conn)
+
+    ensure_leaderboard_top(db_path)
 
 
 def _row_to_user(row: Optional[sqlite3.Row]) -> Optional[User]:
@@ -37,7 +40,7 @@ def _row_to_user(row: Optional[sqlite3.Row]) -> Optional[User]:
 
 
 def get_user_by_id(user_id: int, db_path: Path = DEFAULT_DB_PATH) -> Optional[User]:
-    with _connect(db_path) as conn:
+    with connect(db_path) as conn:
         row = conn.execute(
             "SELECT id, username, email, password_hash FROM users WHERE id = ?",
             (user_id,),
@@ -46,7 +49,7 @@ def get_user_by_id(user_id: int, db_path: Path = DEFAULT_DB_PATH) -> Optional[Us
 
 
 def get_user_by_username(username: str, db_path: Path = DEFAULT_DB_PATH) -> Optional[User]:
-    with _connect(db_path) as conn:
+    with connect(db_path) as conn:
         row = conn.execute(
             "SELECT id, username, email, password_hash FROM users WHERE username = ?",
             (username,),
@@ -55,7 +58,7 @@ def get_user_by_username(username: str, db_path: Path = DEFAULT_DB_PATH) -> Opti
 
 
 def get_user_by_email(email: str, db_path: Path = DEFAULT_DB_PATH) -> Optional[User]:
-    with _connect(db_path) as conn:
+    with connect(db_path) as conn:
         row = conn.execute(
             "SELECT id, username, email, password_hash FROM users WHERE email = ?",
             (email,),
@@ -65,7 +68,7 @@ def get_user_by_email(email: str, db_path: Path = DEFAULT_DB_PATH) -> Optional[U
 
 def create_user(username: str, email: str, password_hash: str, db_path: Path = DEFAULT_DB_PATH) -> User:
     created_at = datetime.now(UTC).isoformat()
-    with _connect(db_path) as conn:
+    with connect(db_path) as conn:
         cursor = conn.execute(
             """
             INSERT INTO users (username, email, password_hash, created_at)
@@ -74,4 +77,4 @@ def create_user(username: str, email: str, password_hash: str, db_path: Path = D
             (username, email, password_hash, created_at),
         )
         user_id = cursor.lastrowid
-    return User(userId=user_id, username=username, email=email, passwordHash=password_hash)
+    return User(userId=user_id, username=username, email=email, passwordHash=password_hash)
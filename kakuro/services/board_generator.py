@@ -4,13 +4,19 @@ import random
 import uuid
 from dataclasses import dataclass
 
-from ..models.domain import Board, ClueCell, PlayCell
+from ..models.domain import Board, ClueCell, PlayCell, Run
+from . import layout_engine
+from .logic_solver import find_solutions_with_logic, residual_components
+from .rating import rate
+from .solver import SearchBudgetExceeded, build_grid, fill_grid, find_solutions, run_targets
 
 
 DIFFICULTY_SIZES = {
     "easy": (5, 5),
     "medium": (8, 9),
     "hard": (13, 13),
+    "expert": (20, 20),
+    "marathon": (40, 40),
 }
 
 
@@ -27,23 +33,62 @@ DIFFICULTY_CONFIGS = {
     "easy": _DifficultyConfig(5, 5, 0.78, 0.32, (101, 133)),
     "medium": _DifficultyConfig(8, 9, 0.68, 0.30, (211, 257)),
     "hard": _DifficultyConfig(13, 13, 0.60, 0.28, (307, 353)),
+    "expert": _DifficultyConfig(20, 20, 0.60, 0.28, (401, 433)),
+    "marathon": _DifficultyConfig(40, 40, 0.60, 0.28, (503, 541)),
 }
 
+LAYOUT_ATTEMPTS = 120
+# Row 1 and column 1 start most runs, so they are more likely to be play cells.
+EDGE_BOOST = 0.12
+MAX_PLAY_PROBABILITY = 0.92
+# Layout engines. The NumPy batch engine (layout_engine.py) is opt-in: a seed maps to a
+# different layout there, so it must be chosen explicitly for seeds to reproduce.
+PYTHON_LAYOUT_ENGINE = "python"
+NUMPY_LAYOUT_ENGINE = "numpy"
+LAYOUT_ENGINES = (PYTHON_LAYOUT_ENGINE, NUMPY_LAYOUT_ENGINE)
+# Below this many grid squares the pure-Python loop beats the array setup cost, so the
+# NumPy engine hands small boards to it.
+NUMPY_LAYOUT_MIN_AREA = 150
+
+UNIQUENESS_NODE_BUDGET = 5_000
+# Boards with more play cells than this run logic propagation before each uniqueness
+# search; below it the plain search is cheaper than the propagation pass.
+LOGIC_FIRST_MIN_CELLS = 120
+MAX_REGION_REFILLS = 8
+# Share of play cells that may be pinned as givens before a seed is abandoned.
+MAX_GIVEN_RATIO = 0.25
+
 DIGIT_POOLS = {
     "easy": (1, 2, 3, 4, 5, 6),
     "medium": (1, 2, 3, 4, 5, 6, 7, 8, 9),
     "hard": (1, 2, 3, 4, 5, 6, 7, 8, 9),
+    "expert": (1, 2, 3, 4, 5, 6, 7, 8, 9),
+    "marathon": (1, 2, 3, 4, 5, 6, 7, 8, 9),
 }
 
 
-def generate_board(difficulty: str) -> Board:
+def generate_board(difficulty: str, engine: str = PYTHON_LAYOUT_ENGINE) -> Board:
+    return board_from_template(generate_template(difficulty, engine))
+
+
+def generate_template(difficulty: str, engine: str = PYTHON_LAYOUT_ENGINE) -> dict:
     difficulty = difficulty.lower()
     if difficulty not in DIFFICULTY_CONFIGS:
         raise ValueError("Unsupported difficulty.")
+    check_layout_engine(engine)
 
     config = DIFFICULTY_CONFIGS[difficulty]
-    template = _build_random_template(difficulty, config)
+    return _build_random_template(difficulty, config, engine)
+
 
+def check_layout_engine(engine: str) -> None:
+    if engine not in LAYOUT_ENGINES:
+        raise ValueError(f"Unknown layout engine '{engine}'.")
+    if engine == NUMPY_LAYOUT_ENGINE and not layout_engine.available():
+        raise RuntimeError("The numpy layout engine needs NumPy installed.")
+
+
+def board_from_template(template: dict) -> Board:
     cells = []
     for cell in template["cells"]:
         if cell["isPlayable"]:
@@ -51,7 +96,9 @@ def generate_board(difficulty: str) -> Board:
                 PlayCell(
                     row=cell["row"],
                     col=cell["col"],
-                    value=None,
+                    value=cell.get("value"),
+                    correctValue=cell.get("correctValue"),
+                    editable=cell.get("editable", True),
                 )
             )
         else:
@@ -67,47 +114,96 @@ def generate_board(difficulty: str) -> Board:
 
     return Board(
         boardId=f"board-{uuid.uuid4().hex[:12]}",
-        difficulty=difficulty,
+        difficulty=template["difficulty"],
         size=(template["rows"], template["cols"]),
         cells=cells,
+        runs=[Run.from_dict(run) for run in template.get("runs", [])],
+        rating=template.get("rating"),
     )
 
 
-def _build_random_template(difficulty: str, config: _DifficultyConfig) -> dict:
+def _build_random_template(difficulty: str, config: _DifficultyConfig, engine: str) -> dict:
     for _ in range(20):
         seed = random.randint(1, 2_147_483_647)
-        template = _build_template_from_seed(difficulty, config, seed)
+        template = _build_template_from_seed(difficulty, config, seed, engine)
         if template is not None:
             return template
 
     for seed in config.seeds:
-        template = _build_template_from_seed(difficulty, config, seed)
+        template = _build_template_from_seed(difficulty, config, seed, engine)
         if template is not None:
             return template
 
     raise RuntimeError(f"Unable to generate a valid board for difficulty '{difficulty}'.")
 
 
-def _build_template_from_seed(difficulty: str, config: _DifficultyConfig, seed: int) -> dict | None:
-    layout = _build_layout(config, seed)
+def _build_template_from_seed(
+    difficulty: str,
+    config: _DifficultyConfig,
+    seed: int,
+    engine: str = PYTHON_LAYOUT_ENGINE,
+) -> dict | None:
+    layout = _build_layout(config, seed, engine)
     try:
         solution = _build_solution(layout, seed, difficulty)
     except RuntimeError:
         return None
-    return _build_template(layout, solution, seed, difficulty)
-
 
-def _build_layout(config: _DifficultyConfig, seed: int) -> list[list[bool]]:
+    unique = _make_unique(layout, solution, seed, difficulty)
+    if unique is None:
+        return None
+    solution, givens = unique
+    template = _build_template(layout, solution, seed, difficulty, givens)
+    # Seed plus engine reproduce the board.
+    template["layoutEngine"] = _layout_engine_for(config, engine)
+    # Rating stage: how hard the puzzle is to solve, independent of its size.
+    template["rating"] = _rate(layout, solution, givens)
+    return template
+
+
+def _rate(layout: list[list[bool]], solution: list[list[int]], givens: set[tuple[int, int]]) -> float:
+    grid = build_grid(layout)
+    values = [solution[r][c] for r, c in grid.positions]
+    fixed = {index: values[index] for index, position in enumerate(grid.positions) if position in givens}
+    return rate(grid, run_targets(grid, values), fixed).score
+
+
+def _layout_engine_for(config: _DifficultyConfig, engine: str) -> str:
+    # Engine that actually draws the layout for this size.
+    if engine == NUMPY_LAYOUT_ENGINE and config.rows * config.cols >= NUMPY_LAYOUT_MIN_AREA:
+        return NUMPY_LAYOUT_ENGINE
+    return PYTHON_LAYOUT_ENGINE
+
+
+def _build_layout(config: _DifficultyConfig, seed: int, engine: str = PYTHON_LAYOUT_ENGINE) -> list[list[bool]]:
+    # Both engines are deterministic per seed but produce different layouts.
+    if _layout_engine_for(config, engine) == NUMPY_LAYOUT_ENGINE:
+        layout = layout_engine.build_layout(
+            config.rows,
+            config.cols,
+            config.play_probability,
+            config.min_ratio,
+            seed,
+            LAYOUT_ATTEMPTS,
+            EDGE_BOOST,
+            MAX_PLAY_PROBABILITY,
+        )
+    else:
+        layout = _draw_layout(config, seed)
+    return layout if layout is not None else _fallback_layout(config.rows, config.cols)
+
+
+def _draw_layout(config: _DifficultyConfig, seed: int) -> list[list[bool]] | None:
     rows, cols = config.rows, config.cols
 
-    for attempt in range(120):
+    for attempt in range(LAYOUT_ATTEMPTS):
         rng = random.Random(seed + (attempt * 97))
         layout = [[False for _ in range(cols)] for _ in range(rows)]
 
         for r in range(1, rows):
             for c in range(1, cols):
-                edge_boost = 0.12 if r == 1 or c == 1 else 0.0
-                layout[r][c] = rng.random() < min(config.play_probability + edge_boost, 0.92)
+                edge_boost = EDGE_BOOST if r == 1 or c == 1 else 0.0
+                layout[r][c] = rng.random() < min(config.play_probability + edge_boost, MAX_PLAY_PROBABILITY)
 
         _enforce_max_run_length(layout)
         _remove_short_runs(layout)
@@ -115,7 +211,7 @@ def _build_layout(config: _DifficultyConfig, seed: int) -> list[list[bool]]:
         if _is_usable(layout, config.min_ratio):
             return layout
 
-    return _fallback_layout(rows, cols)
+    return None
 
 
 def _enforce_max_run_length(layout: list[list[bool]]) -> None:
@@ -144,48 +240,27 @@ def _enforce_max_run_length(layout: list[list[bool]]) -> None:
                 run_len = 0
 
 
-def _horizontal_span(layout: list[list[bool]], r: int, c: int) -> int:
-    cols = len(layout[0])
-    left = c
-    right = c
-
-    while left - 1 >= 0 and layout[r][left - 1]:
-        left -= 1
-
-    while right + 1 < cols and layout[r][right + 1]:
-        right += 1
-
-    return right - left + 1
-
-
-def _vertical_span(layout: list[list[bool]], r: int, c: int) -> int:
-    rows = len(layout)
-    top = r
-    bottom = r
-
-    while top - 1 >= 0 and layout[top - 1][c]:
-        top -= 1
-
-    while bottom + 1 < rows and layout[bottom + 1][c]:
-        bottom += 1
-
-    return bottom - top + 1
-
-
 def _remove_short_runs(layout: list[list[bool]]) -> None:
+    # Drop play cells without an across or down partner. A removal can only orphan its four
+    # neighbours, so they are the only cells re-checked: each cell is removed at most once
+    # and the cleanup is linear in the grid size. Removals only ever enable more removals,
+    # so the result does not depend on the order cells are visited in.
     rows, cols = len(layout), len(layout[0])
 
-    changed = True
-    while changed:
-        changed = False
-        for r in range(1, rows):
-            for c in range(1, cols):
-                if not layout[r][c]:
-                    continue
+    def is_short(r: int, c: int) -> bool:
+        across = layout[r][c - 1] or (c + 1 < cols and layout[r][c + 1])
+        down = layout[r - 1][c] or (r + 1 < rows and layout[r + 1][c])
+        return not (across and down)
 
-                if _horizontal_span(layout, r, c) < 2 or _vertical_span(layout, r, c) < 2:
-                    layout[r][c] = False
-                    changed = True
+    pending = [(r, c) for r in range(1, rows) for c in range(1, cols) if layout[r][c]]
+    while pending:
+        r, c = pending.pop()
+        if not layout[r][c] or not is_short(r, c):
+            continue
+        layout[r][c] = False
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 1 <= nr < rows and 1 <= nc < cols and layout[nr][nc]:
+                pending.append((nr, nc))
 
 
 def _collect_runs(layout: list[list[bool]], direction: str) -> list[list[tuple[int, int]]]:
@@ -259,99 +334,98 @@ def _fallback_layout(rows: int, cols: int) -> list[list[bool]]:
 def _build_solution(layout: list[list[bool]], seed: int, difficulty: str) -> list[list[int]]:
     rows, cols = len(layout), len(layout[0])
 
-    across_id: dict[tuple[int, int], int] = {}
-    down_id: dict[tuple[int, int], int] = {}
-
-    across_runs = _collect_runs(layout, "across")
-    down_runs = _collect_runs(layout, "down")
-
-    for idx, run in enumerate(across_runs):
-        for rc in run:
-            across_id[rc] = idx
-
-    for idx, run in enumerate(down_runs):
-        for rc in run:
-            down_id[rc] = idx
-
-    across_used = [set() for _ in across_runs]
-    down_used = [set() for _ in down_runs]
-
-    positions = [(r, c) for r in range(rows) for c in range(cols) if layout[r][c]]
+    grid = build_grid(layout)
     rng = random.Random(seed * 13 + 7)
-    allowed_digits = DIGIT_POOLS[difficulty]
-
-    assigned: dict[tuple[int, int], int] = {}
-
-    def candidates_for(pos: tuple[int, int]) -> list[int]:
-        r, c = pos
-        a_id = across_id[(r, c)]
-        d_id = down_id[(r, c)]
-        options = [d for d in allowed_digits if d not in across_used[a_id] and d not in down_used[d_id]]
-        if difficulty == "easy":
-            options.sort(key=lambda d: d + (rng.random() * 0.8))
-        else:
-            rng.shuffle(options)
-        return options
-
-    def pick_next() -> tuple[int, int] | None:
-        open_cells = [pos for pos in positions if pos not in assigned]
-        if not open_cells:
-            return None
-
-        best_pos = None
-        best_options = None
-        for pos in open_cells:
-            options = candidates_for(pos)
-            if best_options is None or len(options) < len(best_options):
-                best_pos = pos
-                best_options = options
-                if len(best_options) <= 1:
-                    break
-        return best_pos
-
-    def solve() -> bool:
-        pos = pick_next()
-        if pos is None:
-            return True
-
-        options = candidates_for(pos)
-        if not options:
-            return False
-
-        r, c = pos
-        a_id = across_id[(r, c)]
-        d_id = down_id[(r, c)]
-
-        for value in options:
-            assigned[pos] = value
-            across_used[a_id].add(value)
-            down_used[d_id].add(value)
-
-            if solve():
-                return True
-
-            across_used[a_id].remove(value)
-            down_used[d_id].remove(value)
-            del assigned[pos]
-
-        return False
-
-    if not solve():
+    values = fill_grid(
+        grid,
+        DIGIT_POOLS[difficulty],
+        rng,
+        prefer_low=difficulty == "easy",
+    )
+    if values is None:
         raise RuntimeError("Failed to build template solution")
 
     solution = [[0 for _ in range(cols)] for _ in range(rows)]
-    for (r, c), value in assigned.items():
+    for (r, c), value in zip(grid.positions, values):
         solution[r][c] = value
 
     return solution
 
 
+def _make_unique(
+    layout: list[list[bool]],
+    solution: list[list[int]],
+    seed: int,
+    difficulty: str,
+) -> tuple[list[list[int]], set[tuple[int, int]]] | None:
+    # Re-solve the clued puzzle until it has exactly one solution. When a second solution
+    # exists, only the cells where the two disagree are touched: first they are refilled
+    # with fresh digits (which changes the clues of their runs), and if that keeps failing
+    # one of them is pinned as a pre-filled given. Independent ambiguous patches are
+    # handled together in each pass.
+    grid = build_grid(layout)
+    values = [solution[r][c] for r, c in grid.positions]
+    rng = random.Random(seed * 31 + 3)
+    allowed_digits = DIGIT_POOLS[difficulty]
+    givens: dict[int, int] = {}
+    refills = 0
+    search = find_solutions_with_logic if grid.size > LOGIC_FIRST_MIN_CELLS else find_solutions
+
+    while True:
+        try:
+            found = search(
+                grid,
+                run_targets(grid, values),
+                limit=2,
+                fixed=givens,
+                max_nodes=UNIQUENESS_NODE_BUDGET,
+            )
+        except SearchBudgetExceeded as exc:
+            # A patch logic cannot settle is too hard to search: pin one of its cells and
+            # let propagation carry further on the next pass.
+            if not exc.cells or len(givens) >= grid.size * MAX_GIVEN_RATIO:
+                return None
+            cell = rng.choice(exc.cells)
+            givens[cell] = values[cell]
+            continue
+
+        if len(found) < 2:
+            break
+
+        region = [cell for cell in range(grid.size) if found[0][cell] != found[1][cell]]
+        if refills < MAX_REGION_REFILLS:
+            refills += 1
+            fixed = {cell: value for cell, value in enumerate(values) if cell not in region}
+            try:
+                refilled = fill_grid(grid, allowed_digits, rng, fixed=fixed, max_nodes=5_000)
+            except SearchBudgetExceeded:
+                # Same as finding no refill: fall through to pinning givens.
+                refilled = None
+            if refilled is not None:
+                values = refilled
+                continue
+
+        # One given per independent ambiguous patch, so large boards settle in a few passes.
+        for patch in residual_components(grid, [0 if cell in region else 1 for cell in range(grid.size)]):
+            cell = rng.choice(patch)
+            givens[cell] = values[cell]
+
+    rows, cols = len(layout), len(layout[0])
+    unique_solution = [[0 for _ in range(cols)] for _ in range(rows)]
+    for (r, c), value in zip(grid.positions, values):
+        unique_solution[r][c] = value
+
+    return unique_solution, {grid.positions[cell] for cell in givens}
+
+
 def _build_template(
     layout: list[list[bool]],
     solution: list[list[int]],
     seed: int,
     difficulty: str,
+    givens: set[tuple[int, int]] | None = None,
 ) -> dict:
+    givens = givens or set()
     rows, cols = len(layout), len(layout[0])
 
     def right_run_sum(r: int, c: int) -> int | None:
@@ -378,6 +452,7 @@ def _build_template(
     for r in range(rows):
         for c in range(cols):
             if layout[r][c]:
+                is_given = (r, c) in givens
                 cells.append(
                     {
                         "row": r,
@@ -385,6 +460,9 @@ def _build_template(
                         "isPlayable": True,
                         "clueDown": None,
                         "clueRight": None,
+                        "value": solution[r][c] if is_given else None,
+                        "correctValue": solution[r][c],
+                        "editable": not is_given,
                     }
                 )
             else:
@@ -400,7 +478,37 @@ def _build_template(
 
     return {
         "templateId": f"{difficulty}-t{seed}",
+        "difficulty": difficulty,
         "rows": rows,
         "cols": cols,
         "cells": cells,
-    }
+        "runs": _build_run_table(layout, solution),
+    }
+
+
+def _build_run_table(layout: list[list[bool]], solution: list[list[int]]) -> list[dict]:
+    # Run topology is fixed once the layout is final; ship it with the board so
+    # validation never has to rediscover run boundaries.
+    grid = build_grid(layout)
+    runs = []
+    for run_id, members in enumerate(grid.run_cells):
+        cells = [grid.positions[member] for member in members]
+        first_r, first_c = cells[0]
+        if run_id < grid.across_runs:
+            direction = "across"
+            clue_cell = (first_r, first_c - 1) if first_c > 0 else None
+        else:
+            direction = "down"
+            clue_cell = (first_r - 1, first_c) if first_r > 0 else None
+
+        target = sum(solution[r][c] for r, c in cells) if len(cells) >= 2 else None
+        runs.append(
+            Run(
+                runId=run_id,
+                direction=direction,
+                clueCell=clue_cell,
+                cells=tuple(cells),
+                target=target if clue_cell is not None else None,
+            ).to_dict()
+        )
+    return runs
@@ -0,0 +1,92 @@
+"""
+Precomputed Kakuro digit combinations.
+Every distinct-digit set is stored as a 9-bit mask. All tables are built once at import:
+- COMBINATIONS: valid digit sets for every (sum, length)
+- REACHABLE: every partial digit set that can still grow into one of those combinations
+- COMPLETION_BOUNDS: min/max sum of the remaining slots for every (used mask, remaining slots)
+"""
+
+from __future__ import annotations
+
+from itertools import combinations
+
+MIN_RUN_LENGTH = 1
+MAX_RUN_LENGTH = 9
+
+
+def _build_combination_table() -> dict[tuple[int, int], tuple[int, ...]]:
+    table: dict[tuple[int, int], list[int]] = {}
+    for length in range(MIN_RUN_LENGTH, MAX_RUN_LENGTH + 1):
+        for digits in combinations(range(1, 10), length):
+            mask = 0
+            for digit in digits:
+                mask |= 1 << (digit - 1)
+            table.setdefault((sum(digits), length), []).append(mask)
+    return {key: tuple(masks) for key, masks in table.items()}
+
+
+COMBINATIONS = _build_combination_table()
+
+
+def _submasks(mask: int):
+    sub = mask
+    while True:
+        yield sub
+        if sub == 0:
+            return
+        sub = (sub - 1) & mask
+
+
+def _build_reachable_table() -> dict[tuple[int, int], frozenset[int]]:
+    return {
+        key: frozenset(sub for mask in masks for sub in _submasks(mask))
+        for key, masks in COMBINATIONS.items()
+    }
+
+
+def _build_completion_bounds() -> list[list[tuple[int, int] | None]]:
+    table: list[list[tuple[int, int] | None]] = []
+    for used_mask in range(1 << 9):
+        free = [digit for digit in range(1, 10) if not used_mask & (1 << (digit - 1))]
+        row: list[tuple[int, int] | None] = [(0, 0)]
+        for remaining in range(1, MAX_RUN_LENGTH + 1):
+            if remaining > len(free):
+                row.append(None)
+            else:
+                row.append((sum(free[:remaining]), sum(free[-remaining:])))
+        table.append(row)
+    return table
+
+
+REACHABLE = _build_reachable_table()
+COMPLETION_BOUNDS = _build_completion_bounds()
+
+
+def combinations_for(total: int, length: int) -> tuple[int, ...]:
+    return COMBINATIONS.get((total, length), ())
+
+
+def candidates_for(total: int, length: int, used_mask: int) -> int | None:
+    # Digits that can still complete the run given the digits already placed in it.
+    # Returns None when no combination is compatible with `used_mask`.
+    candidates = 0
+    found = False
+    for mask in COMBINATIONS.get((total, length), ()):
+        if mask & used_mask == used_mask:
+            candidates |= mask
+            found = True
+    if not found:
+        return None
+    return candidates & ~used_mask
+
+
+def is_reachable(total: int, length: int, used_mask: int) -> bool:
+    # True when the distinct digits in `used_mask` can still be completed to `total`.
+    return used_mask in REACHABLE.get((total, length), ())
+
+
+def completion_bounds(used_mask: int, remaining_slots: int) -> tuple[int, int] | None:
+    # Smallest and largest sum the remaining slots can add without reusing a digit.
+    if remaining_slots > MAX_RUN_LENGTH:
+        return None
+    return COMPLETION_BOUNDS[used_mask][remaining_slots]
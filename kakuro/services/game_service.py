@@ -10,21 +10,37 @@ from pathlib import Path
 
 from flask import session as flask_session
 
-from ..models.domain import GameSession, Result
-from ..models.saved_game import get_latest_saved_game_for_user, upsert_saved_game
-from .board_generator import generate_board
+from ..models.domain import Board, GameSession, Result
+from ..models.saved_game import (
+    add_autosave,
+    delete_saved_game,
+    get_latest_saved_game_for_user,
+    get_saved_game,
+    has_saved_games,
+    list_saved_games,
+    saved_session_id,
+    upsert_saved_game,
+)
+from .hint_service import conflicting_cells, ensure_solution, hint_target, incorrect_cells, logic_hint
+from .journal_service import MOVE, REDO, UNDO, get_journal, push_history, replay, undo_redo_stacks
+from .logic_solver import TECHNIQUE_LABELS
+from .puzzle_pool import take_board
+from .session_store import load_game, store_game
 from .validation_service import validate_entire_board, validate_move
 
-GAME_KEY = "active_game"
 WRONG_CELLS_KEY = "wrong_cells"
 MESSAGE_KEY = "game_message"
 MOVE_ERROR_KEY = "move_error"
 PAUSED_KEY = "game_paused"
+# Upper bound on one /game/moves request; the largest board has far fewer playable cells.
+MAX_BATCH_MOVES = 512
+NO_SOLUTION_MESSAGE = "Hints are not available for this puzzle."
 
 
 def create_new_game(difficulty: str, user_id: int | None = None) -> GameSession:
     # Flow 3: selectDifficulty(difficulty) -> create GameSession + Board.
-    board = generate_board(difficulty)
+    # Boards come from the pre-generated pool; a cold pool generates inline.
+    board = take_board(difficulty)
     return GameSession(
         sessionId=f"gs-{uuid.uuid4().hex[:12]}",
         difficulty=difficulty,
@@ -40,17 +56,25 @@ def create_new_game(difficulty: str, user_id: int | None = None) -> GameSession:
 
 
 def save_game(game_session: GameSession) -> None:
-    # Postcondition: active GameSession is stored in server session state.
-    flask_session[GAME_KEY] = game_session.to_dict()
+    # Postcondition: active GameSession is stored in server session state
+    # (written back once at the end of the request by the session store).
+    store_game(game_session)
 
 
 def get_game() -> GameSession | None:
-    return GameSession.from_dict(flask_session.get(GAME_KEY))
+    return load_game()
 
 
-def clear_feedback() -> None:
-    # Reset UI feedback for next move/check cycle.
-    flask_session[WRONG_CELLS_KEY] = []
+def clear_feedback(changed: list[tuple[int, int]] | None = None) -> None:
+    # Reset UI feedback for next move/check cycle. After a move only the changed cells lose
+    # their check/submit mark; the others stay flagged until the next check.
+    if changed is None:
+        flask_session[WRONG_CELLS_KEY] = []
+    else:
+        changed_keys = {(row, col) for row, col in changed}
+        flask_session[WRONG_CELLS_KEY] = [
+            [r, c] for r, c in flask_session.get(WRONG_CELLS_KEY, []) if (r, c) not in changed_keys
+        ]
     flask_session[MESSAGE_KEY] = ""
     flask_session[MOVE_ERROR_KEY] = ""
 
@@ -90,28 +114,274 @@ def get_feedback() -> dict:
     }
 
 
+def board_topology(board: Board) -> dict:
+    # Run layout for the client-side validator (static/js/validator.js); values stay in the DOM.
+    return {"runs": [{"target": run.target, "cells": [list(cell) for cell in run.cells]} for run in board.runs]}
+
+
+def game_state(game_session: GameSession) -> dict:
+    # JSON view of the active game for the /api/game endpoints: the compact board
+    # encoding (without the solution) plus the current feedback.
+    board = game_session.board.to_dict()
+    board.pop("solution", None)
+    feedback = get_feedback()
+    return {
+        "sessionId": game_session.sessionId,
+        "difficulty": game_session.difficulty,
+        "status": game_session.status,
+        "elapsedTime": game_session.elapsedTime,
+        "isPaused": is_paused(),
+        "board": board,
+        "runs": board_topology(game_session.board)["runs"],
+        "wrongCells": [[r, c] for r, c in feedback["wrongCells"]],
+        "message": feedback["message"],
+        "moveError": feedback["moveError"],
+    }
+
+
 def enter_number(row: int, col: int, raw_value: str) -> dict:
     # Flow 4A: enterNumber operation.
     # Flow 4C: removeNumber behavior when raw_value is empty.
     game_session = get_game()
-    if game_session is None:
-        return {"ok": False, "message": "No active game session."}
+    blocked = _move_blocked(game_session)
+    if blocked:
+        return {"ok": False, "message": blocked}
+
+    with game_session.lock:
+        result = _apply_move(game_session, row, col, raw_value)
+        if result["ok"]:
+            # Postcondition: cell update is persisted in active session.
+            save_game(game_session)
+            clear_feedback([(row, col)])
+        return result
+
+
+def enter_moves(moves: list) -> dict:
+    # Flow 4A/4C in bulk: an ordered batch of moves applied in one pass, with one session
+    # write at the end.
+    game_session = get_game()
+    blocked = _move_blocked(game_session)
+    if blocked:
+        return {"ok": False, "message": blocked, "results": []}
+
+    with game_session.lock:
+        result = apply_moves(game_session, moves)
+        changed = [(move["row"], move["col"]) for move in result["results"] if move["ok"]]
+        if changed:
+            save_game(game_session)
+            clear_feedback(changed)
+        return result
+
+
+def apply_moves(game_session: GameSession, moves: list) -> dict:
+    # Validates and applies moves in order, each against the board left by the previous
+    # ones. Touches only the GameSession and the journal, never the Flask session.
+    if len(moves) > MAX_BATCH_MOVES:
+        return {"ok": False, "message": f"At most {MAX_BATCH_MOVES} moves per batch.", "results": []}
+
+    results = []
+    for move in moves:
+        try:
+            row = int(move["row"])
+            col = int(move["col"])
+        except (KeyError, TypeError, ValueError):
+            results.append({"ok": False, "message": "Invalid cell coordinates.", "row": None, "col": None})
+            continue
+        result = _apply_move(game_session, row, col, move.get("value", ""))
+        results.append({**result, "row": row, "col": col})
+
+    failed = [result for result in results if not result["ok"]]
+    for result in failed:
+        # What the server holds once the whole batch is applied, so the client can roll the
+        # rejected cell back to it.
+        cell = game_session.board.get_cell(result["row"], result["col"]) if result["row"] is not None else None
+        result["value"] = cell.value if cell is not None else None
+    return {
+        "ok": not failed,
+        "message": failed[-1]["message"] if failed else "Moves accepted.",
+        "results": results,
+    }
+
 
+def _move_blocked(game_session: GameSession | None) -> str | None:
+    if game_session is None:
+        return "No active game session."
     if game_session.status == "Finished":
+        return "Game is finished. Start a new game."
+    if is_paused():
+        return "Game is paused. Resume to continue."
+    return None
+
+
+def _apply_move(game_session: GameSession, row: int, col: int, raw_value) -> dict:
+    cell = game_session.board.get_cell(row, col)
+    old_value = cell.value if cell is not None else None
+    result = validate_move(game_session.board, row, col, raw_value)
+    if result["ok"] and result["value"] != old_value:
+        _journal_move(game_session, row, col, old_value, result["value"], MOVE)
+    return result
+
+
+def _journal_move(game_session: GameSession, row: int, col: int, old_value, new_value, kind: str) -> None:
+    # Buffered append; the journal writes it to SQLite with the next batch.
+    journal = get_journal()
+    if journal is None:
+        return
+    game_session.journalSeq += 1
+    journal.record(game_session.journalKey, game_session.journalSeq, row, col, old_value, new_value, kind)
+    if game_session.history is not None:
+        entry = {
+            "seq": game_session.journalSeq,
+            "row": row,
+            "col": col,
+            "oldValue": old_value,
+            "newValue": new_value,
+            "kind": kind,
+        }
+        push_history(*game_session.history, entry)
+
+
+def _history(game_session: GameSession, journal) -> tuple[list[dict], list[dict]]:
+    # Read from the journal once per loaded session; _journal_move keeps it current after that.
+    if game_session.history is None:
+        game_session.history = undo_redo_stacks(journal.entries(game_session.journalKey))
+    return game_session.history
+
+
+def undo_move() -> dict:
+    return _step_history(UNDO)
+
+
+def redo_move() -> dict:
+    return _step_history(REDO)
+
+
+def _step_history(kind: str) -> dict:
+    game_session = get_game()
+    blocked = _move_blocked(game_session)
+    if blocked:
+        return {"ok": False, "message": blocked}
+
+    with game_session.lock:
+        journal = get_journal()
+        if journal is None:
+            return {"ok": False, "message": "Undo and redo are not available."}
+
+        undo, redo = _history(game_session, journal)
+        stack = undo if kind == UNDO else redo
+        if not stack:
+            return {"ok": False, "message": "Nothing to undo." if kind == UNDO else "Nothing to redo."}
+
+        move = stack[-1]
+        row, col = move["row"], move["col"]
+        old_value, new_value = (move["newValue"], move["oldValue"]) if kind == UNDO else (move["oldValue"], move["newValue"])
+        result = validate_move(game_session.board, row, col, "" if new_value is None else str(new_value))
+        if not result["ok"]:
+            return result
+
+        _journal_move(game_session, row, col, old_value, new_value, kind)
+        save_game(game_session)
+        clear_feedback([(row, col)])
         return {
-            "ok": False,
-            "message": "Game is finished. Start a new game.",
+            **result,
+            "message": "Move undone." if kind == UNDO else "Move redone.",
+            "row": row,
+            "col": col,
         }
 
-    if is_paused():
-        return {"ok": False, "message": "Game is paused. Resume to continue."}
 
-    result = validate_move(game_session.board, row, col, raw_value)
-    if result["ok"]:
-        # Postcondition: cell update is persisted in active session.
+def _has_solution(game_session: GameSession) -> bool:
+    known_missing = game_session.board.solutionUnknown
+    if ensure_solution(game_session.board):
+        return True
+    if not known_missing:
+        # Keep the failed backfill with the board so later requests skip the search.
         save_game(game_session)
-        clear_feedback()
-    return result
+    return False
+
+
+def hint_cell(row: int | None = None, col: int | None = None) -> dict:
+    # Flow 4B checkHint: the next digit the logic solver can deduce, or the solution digit of
+    # the requested cell. The cell is marked as hinted but left for the player to fill.
+    game_session = get_game()
+    blocked = _move_blocked(game_session)
+    if blocked:
+        return {"ok": False, "message": blocked}
+    with game_session.lock:
+        board = game_session.board
+        if not _has_solution(game_session):
+            return {"ok": False, "message": NO_SOLUTION_MESSAGE}
+
+        hint = logic_hint(board) if row is None or col is None else None
+        if hint is None:
+            # Explicit cell, or the techniques ran dry: fall back to the stored solution.
+            cell = hint_target(board, row, col)
+            if cell is None:
+                return {"ok": False, "message": "Every cell is already correct."}
+            hint = {"row": cell.row, "col": cell.col, "value": cell.correctValue, "technique": None, "techniques": []}
+
+        board.get_cell(hint["row"], hint["col"]).hinted = True
+        save_game(game_session)
+        message = f"Hint: cell ({hint['row'] + 1},{hint['col'] + 1}) is {hint['value']}"
+        if hint["technique"]:
+            message += f" because {TECHNIQUE_LABELS[hint['technique']]}"
+        return {"ok": True, "message": message + ".", **hint}
+
+
+def reveal_cell(row: int, col: int) -> dict:
+    # Fills one cell with its solution digit. Cells in the same runs that already hold
+    # that digit are wrong, so they are cleared first; every change is journaled.
+    game_session = get_game()
+    blocked = _move_blocked(game_session)
+    if blocked:
+        return {"ok": False, "message": blocked}
+
+    with game_session.lock:
+        board = game_session.board
+        cell = board.get_cell(row, col)
+        if cell is None or not cell.isPlayable:
+            return {"ok": False, "message": "Selected cell is not playable."}
+        if not getattr(cell, "editable", True):
+            return {"ok": False, "message": "Selected cell is a fixed given."}
+        if not _has_solution(game_session):
+            return {"ok": False, "message": NO_SOLUTION_MESSAGE}
+
+        cleared = []
+        for other in conflicting_cells(board, cell):
+            if _apply_move(game_session, other.row, other.col, "")["ok"]:
+                cleared.append([other.row, other.col])
+        result = _apply_move(game_session, row, col, str(cell.correctValue))
+        if not result["ok"]:
+            return result
+
+        cell.hinted = True
+        save_game(game_session)
+        clear_feedback([(r, c) for r, c in cleared] + [(row, col)])
+        return {
+            "ok": True,
+            "message": "Cell revealed.",
+            "row": row,
+            "col": col,
+            "value": cell.correctValue,
+            "cleared": cleared,
+        }
+
+
+def check_cells() -> dict:
+    # Per-cell correctness against the stored solution; empty cells are not reported.
+    game_session = get_game()
+    blocked = _move_blocked(game_session)
+    if blocked:
+        return {"ok": False, "message": blocked}
+    with game_session.lock:
+        if not _has_solution(game_session):
+            return {"ok": False, "message": NO_SOLUTION_MESSAGE}
+
+        incorrect = incorrect_cells(game_session.board)
+        message = f"{len(incorrect)} incorrect cell(s)." if incorrect else "All filled cells are correct."
+        save_game(game_session)
+        set_feedback(incorrect, message)
+        return {"ok": True, "message": message, "incorrectCells": [[r, c] for r, c in incorrect]}
 
 
 def submit_solution() -> dict:
@@ -123,34 +393,40 @@ def submit_solution() -> dict:
     if is_paused():
         return {"ok": False, "message": "Game is paused. Resume to submit."}
 
-    result = validate_entire_board(game_session.board)
-    game_session.submitBoard()
-    if result["isSolved"]:
-        # Success path: mark game finished and store win result.
-        game_session.status = "Finished"
-        game_session.isCompleted = True
-        game_session.isPaused = False
-        game_session.result = Result(resultId=f"res-{uuid.uuid4().hex[:10]}", isWin=True)
-        game_session.result.recordResult(game_session.elapsedTime, True)
-    else:
-        # ALT path: keep game in progress and return wrong-cell feedback.
-        game_session.status = "InProgress"
-        game_session.isCompleted = False
-        game_session.result = None
+    with game_session.lock:
+        result = validate_entire_board(game_session.board)
+        game_session.submitBoard()
+        if result["isSolved"]:
+            # Success path: mark game finished and store win result.
+            game_session.status = "Finished"
+            game_session.isCompleted = True
+            game_session.isPaused = False
+            game_session.result = Result(resultId=f"res-{uuid.uuid4().hex[:10]}", isWin=True)
+            game_session.result.recordResult(game_session.elapsedTime, True)
+        else:
+            # ALT path: keep game in progress and return wrong-cell feedback.
+            game_session.status = "InProgress"
+            game_session.isCompleted = False
+            game_session.result = None
 
-    save_game(game_session)
-    set_feedback(result["wrongCells"], result["message"])
-    set_move_error("")
+        if result["isSolved"] and get_journal() is not None:
+            # Finished games cannot be resumed or undone, so their history is dropped.
+            get_journal().purge(game_session.sessionId)
+            game_session.history = None
 
-    return {
-        "ok": True,
-        "isSolved": result["isSolved"],
-        "message": result["message"],
-        "wrongCells": result["wrongCells"],
-    }
+        save_game(game_session)
+        set_feedback(result["wrongCells"], result["message"])
+        set_move_error("")
 
+        return {
+            "ok": True,
+            "isSolved": result["isSolved"],
+            "message": result["message"],
+            "wrongCells": result["wrongCells"],
+        }
 
-def save_current_game(db_path: Path, user_id: int, elapsed_time: int) -> tuple[bool, str]:
+
+def save_current_game(db_path: Path, user_id: int, elapsed_time: int, label: str | None = None) -> tuple[bool, str]:
     # Flow 4F: saveGame persistence for registered users.
     game_session = get_game()
     if game_session is None:
@@ -165,13 +441,82 @@ def save_current_game(db_path: Path, user_id: int, elapsed_time: int) -> tuple[b
     game_session.isCompleted = False
     game_session.isSubmitted = False
     save_game(game_session)
-    upsert_saved_game(game_session, db_path)
+    upsert_saved_game(game_session, db_path, label=(label or "").strip()[:60] or None)
     return True, "Game saved successfully"
 
 
+def autosave_current_game(db_path: Path, user_id: int | None) -> bool:
+    # Checkpoint an unfinished game into the user's autosave ring (registered users only).
+    game_session = get_game()
+    if not user_id or game_session is None or game_session.status == "Finished":
+        return False
+
+    if game_session.userId != user_id:
+        game_session.userId = user_id
+        save_game(game_session)
+    add_autosave(game_session, db_path)
+    return True
+
+
+def retire_current_game(db_path: Path, user_id: int | None) -> None:
+    # The active game is being replaced: unfinished games of registered users go to the
+    # autosave ring first, then its journal is purged unless a save slot can resume it.
+    autosave_current_game(db_path, user_id)
+    discard_current_game(db_path)
+
+
+def discard_current_game(db_path: Path) -> None:
+    game_session = get_game()
+    if game_session is not None:
+        _purge_history(db_path, game_session.sessionId)
+
+
+def _purge_history(db_path: Path, session_id: str) -> None:
+    journal = get_journal()
+    if journal is not None and not has_saved_games(session_id, db_path):
+        journal.purge(session_id)
+
+
+def list_saves(db_path: Path, user_id: int) -> list[dict]:
+    return list_saved_games(user_id, db_path)
+
+
+def delete_save(db_path: Path, user_id: int, save_id: int) -> bool:
+    session_id = saved_session_id(save_id, user_id, db_path)
+    if not delete_saved_game(save_id, user_id, db_path):
+        return False
+    active = get_game()
+    if session_id and (active is None or active.sessionId != session_id):
+        # Last slot of a game nobody is playing: its moves can no longer be replayed.
+        _purge_history(db_path, session_id)
+    return True
+
+
 def load_latest_saved_game(db_path: Path, user_id: int) -> tuple[bool, str]:
-    # Flow 4G: loadGame restores latest persisted game state.
+    # Flow 4G: loadGame restores latest persisted game state, plus any moves journaled on
+    # its timeline after it was saved (e.g. before a crash or a closed tab).
     saved = get_latest_saved_game_for_user(user_id, db_path)
+    journal = get_journal()
+    if saved is not None and journal is not None:
+        tail = journal.entries(saved.journalKey, saved.journalSeq)
+        if tail:
+            replay(saved.board, tail)
+            saved.journalSeq = tail[-1]["seq"]
+    return _activate_saved_game(saved, user_id)
+
+
+def load_saved_game(db_path: Path, user_id: int, save_id: int) -> tuple[bool, str]:
+    # Flow 4G: loadGame from a specific save slot. When its timeline already went on past
+    # that save, play continues on a branch, so the later moves never mix into this game
+    # and stay available to the slots saved from them.
+    saved = get_saved_game(save_id, user_id, db_path)
+    journal = get_journal()
+    if saved is not None and journal is not None and journal.entries(saved.journalKey, saved.journalSeq):
+        saved.journalKey = journal.branch(saved.sessionId, saved.journalKey, saved.journalSeq)
+    return _activate_saved_game(saved, user_id)
+
+
+def _activate_saved_game(saved: GameSession | None, user_id: int) -> tuple[bool, str]:
     if saved is None:
         return False, "No saved game found."
 
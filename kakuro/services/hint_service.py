@@ -0,0 +1,133 @@
+"""
+Hint, reveal and check support for the Play Game flow.
+Generated boards keep their solution in PlayCell.correctValue. It is stored server-side with
+the board (compact encoding, puzzle records) and never sent to the browser, so reveal and
+check are direct cell lookups. Boards created before the solution was kept are solved once
+and backfilled; when that solve runs out of budget or the board turns out not to be unique,
+hints stay off for the board and the failure is kept with it. Hints name the next step the
+logic solver (logic_solver.py) can deduce.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from ..models.domain import Board, Cell
+from .logic_solver import LogicReport, LogicSolver, analyze
+from .solver import SearchBudgetExceeded, SolverGrid, build_grid, find_solutions
+
+# Node cap for backfilling a board without a stored solution; generated boards are unique
+# and prove it far below this.
+BACKFILL_NODE_BUDGET = 500_000
+
+
+def needs_help(cell: Optional[Cell]) -> bool:
+    # Editable play cell whose value differs from the solution (empty counts).
+    return (
+        cell is not None
+        and cell.isPlayable
+        and getattr(cell, "editable", True)
+        and cell.value != getattr(cell, "correctValue", None)
+    )
+
+
+def ensure_solution(board: Board) -> bool:
+    # Solutions are stored for every play cell or for none, so one cell tells.
+    first = next((cell for cell in board.cells if cell.isPlayable), None)
+    if first is None:
+        return False
+    if getattr(first, "correctValue", None):
+        return True
+    if board.solutionUnknown:
+        return False
+
+    solution = _solve(board)
+    if solution is None or not all(hasattr(board.get_cell(*position), "correctValue") for position in solution):
+        # Plain Cell objects from older callers cannot hold the solution either.
+        board.solutionUnknown = True
+        return False
+    for (row, col), value in solution.items():
+        board.get_cell(row, col).correctValue = value
+    return True
+
+
+def board_grid(board: Board) -> tuple[SolverGrid, list[Optional[int]], dict[int, int]]:
+    # Solver view of a board: the grid, one target per grid run and the fixed givens.
+    layout = [[cell is not None and cell.isPlayable for cell in row] for row in board.matrix()]
+    grid = build_grid(layout)
+    targets_by_cells = {run.cells: run.target for run in board.runs}
+    targets = [targets_by_cells.get(tuple(grid.positions[m] for m in members)) for members in grid.run_cells]
+    fixed = {}
+    for index, (row, col) in enumerate(grid.positions):
+        cell = board.get_cell(row, col)
+        if not getattr(cell, "editable", True) and cell.value:
+            fixed[index] = cell.value
+    return grid, targets, fixed
+
+
+def _solve(board: Board) -> Optional[dict[tuple[int, int], int]]:
+    # The unique solution, or None. A board with several would make hints and checks pick
+    # one of them arbitrarily and call the player's valid answer wrong.
+    grid, targets, fixed = board_grid(board)
+    try:
+        found = find_solutions(grid, targets, limit=2, fixed=fixed, max_nodes=BACKFILL_NODE_BUDGET)
+    except SearchBudgetExceeded:
+        return None
+    if len(found) != 1:
+        return None
+    return dict(zip(grid.positions, found[0]))
+
+
+def hint_target(board: Board, row: Optional[int] = None, col: Optional[int] = None) -> Optional[Cell]:
+    # The requested cell when it still needs help, otherwise the first one that does.
+    if row is not None and col is not None:
+        cell = board.get_cell(row, col)
+        if needs_help(cell):
+            return cell
+    return next((cell for cell in board.cells if needs_help(cell)), None)
+
+
+def logic_hint(board: Board) -> Optional[dict]:
+    # Next digit the logic solver can place from the cells the player has right so far
+    # (wrong entries count as empty), with the techniques that led to it.
+    grid, targets, _ = board_grid(board)
+    values = []
+    for row, col in grid.positions:
+        cell = board.get_cell(row, col)
+        values.append(cell.value if cell.value and cell.value == getattr(cell, "correctValue", None) else 0)
+
+    found = LogicSolver(grid, targets, values).next_placement()
+    if found is None:
+        return None
+    step, reasons = found
+    row, col = grid.positions[step.cell]
+    if step.value != board.get_cell(row, col).correctValue:
+        return None
+    return {
+        "row": row,
+        "col": col,
+        "value": step.value,
+        "technique": step.technique,
+        "techniques": list(dict.fromkeys([reason.technique for reason in reasons] + [step.technique])),
+    }
+
+
+def analyze_board(board: Board) -> LogicReport:
+    # Techniques the puzzle needs from its givens alone.
+    return analyze(*board_grid(board))
+
+
+def incorrect_cells(board: Board) -> list[tuple[int, int]]:
+    # Filled editable cells that disagree with the solution.
+    return [(cell.row, cell.col) for cell in board.cells if cell.value is not None and needs_help(cell)]
+
+
+def conflicting_cells(board: Board, cell: Cell) -> list[Cell]:
+    # Cells in the same runs already holding this cell's solution digit; they are wrong
+    # by definition and would block the reveal as duplicates.
+    conflicts = []
+    for run in board.runs_for(cell.row, cell.col):
+        for other in board.run_cells(run):
+            if other is not cell and other.value == cell.correctValue and other not in conflicts:
+                conflicts.append(other)
+    return conflicts
@@ -0,0 +1,223 @@
+"""
+Move journal for the Play Game flow.
+Every accepted cell change is appended to an in-memory buffer and written to SQLite in
+batches (on a timer or once the buffer is full), so a keystroke never waits on a database
+write. The journal drives undo/redo and replays moves made after the last save.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from ..models.domain import Board
+from ..models.move_journal import copy_moves, delete_moves, delete_timelines, get_moves, insert_moves
+
+DEFAULT_FLUSH_SECONDS = 2.0
+DEFAULT_BATCH_SIZE = 50
+
+MOVE, UNDO, REDO = "move", "undo", "redo"
+
+logger = logging.getLogger(__name__)
+
+
+class MoveJournal:
+    """Write-behind buffer of (session, seq, cell, old, new, kind) entries."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.flush_seconds = max(0.01, float(flush_seconds))
+        self.batch_size = max(1, int(batch_size))
+        self._buffer: list[tuple] = []
+        self._lock = threading.Lock()
+        # Serializes flushes so batches reach the table in the order they were recorded.
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._recorded = 0
+        self._flushed = 0
+        self._flushes = 0
+        self._failures = 0
+        self._last_flush_seconds = 0.0
+
+    def record(
+        self,
+        session_id: str,
+        seq: int,
+        row: int,
+        col: int,
+        old_value: Optional[int],
+        new_value: Optional[int],
+        kind: str = MOVE,
+    ) -> None:
+        entry = (session_id, int(seq), int(row), int(col), old_value, new_value, kind, time.time())
+        with self._lock:
+            self._buffer.append(entry)
+            self._recorded += 1
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                insert_moves(batch, self.db_path)
+            except Exception:
+                # Keep the batch (ahead of anything recorded meanwhile) for the next attempt.
+                with self._lock:
+                    self._buffer[:0] = batch
+                    self._failures += 1
+                raise
+
+            with self._lock:
+                self._flushed += len(batch)
+                self._flushes += 1
+                self._last_flush_seconds = time.perf_counter() - started
+        return len(batch)
+
+    def entries(self, session_id: str, after_seq: int = 0) -> list[dict]:
+        # Reads go through the table, so buffered entries are flushed first.
+        self.flush()
+        return get_moves(session_id, after_seq, self.db_path)
+
+    def truncate(self, session_id: str, after_seq: int = 0) -> int:
+        # Drops one timeline's history after `after_seq`.
+        self.flush()
+        return delete_moves(session_id, after_seq, self.db_path)
+
+    def branch(self, session_id: str, journal_key: str, through_seq: int) -> str:
+        # New timeline for a game resumed from an older point: it starts with the moves up to
+        # `through_seq` and grows apart from `journal_key`, whose later moves other save slots
+        # may still extend.
+        self.flush()
+        new_key = f"{session_id}:{uuid.uuid4().hex[:8]}"
+        copy_moves(journal_key, new_key, through_seq, self.db_path)
+        return new_key
+
+    def purge(self, session_id: str) -> int:
+        # Drops every timeline of a game.
+        self.flush()
+        return delete_timelines(session_id, self.db_path)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="move-journal-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Final move journal flush failed")
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                # A failed flush must not kill the worker; the batch is retried next round.
+                logger.exception("Move journal flush failed")
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "flushSeconds": self.flush_seconds,
+                "batchSize": self.batch_size,
+                "pending": len(self._buffer),
+                "recorded": self._recorded,
+                "flushed": self._flushed,
+                "flushes": self._flushes,
+                "failures": self._failures,
+                "avgBatch": round(self._flushed / self._flushes, 2) if self._flushes else None,
+                "lastFlushMs": round(self._last_flush_seconds * 1000, 3) if self._flushes else None,
+            }
+
+
+def push_history(undo: list[dict], redo: list[dict], entry: dict) -> None:
+    # Stacks hold the original moves; undo/redo entries only move them between stacks.
+    if entry["kind"] == MOVE:
+        undo.append(entry)
+        redo.clear()
+    elif entry["kind"] == UNDO and undo:
+        redo.append(undo.pop())
+    elif entry["kind"] == REDO and redo:
+        undo.append(redo.pop())
+
+
+def undo_redo_stacks(entries: list[dict]) -> tuple[list[dict], list[dict]]:
+    undo: list[dict] = []
+    redo: list[dict] = []
+    for entry in entries:
+        push_history(undo, redo, entry)
+    return undo, redo
+
+
+def replay(board: Board, entries: list[dict]) -> int:
+    # Cell values are written directly, so the board's RunProgress is dropped and rebuilt
+    # on its next use.
+    applied = 0
+    for entry in entries:
+        cell = board.get_cell(entry["row"], entry["col"])
+        if cell is not None and cell.isPlayable and getattr(cell, "editable", True):
+            cell.value = entry["newValue"]
+            applied += 1
+    if applied:
+        board.progress = None
+    return applied
+
+
+_journal: Optional[MoveJournal] = None
+
+
+def init_journal(config) -> Optional[MoveJournal]:
+    global _journal
+    if _journal is not None:
+        _journal.stop()
+        _journal = None
+
+    if not config.get("JOURNAL_ENABLED", False):
+        return None
+
+    _journal = MoveJournal(
+        config["DB_PATH"],
+        flush_seconds=config.get("JOURNAL_FLUSH_SECONDS", DEFAULT_FLUSH_SECONDS),
+        batch_size=config.get("JOURNAL_BATCH_SIZE", DEFAULT_BATCH_SIZE),
+    )
+    _journal.start()
+    atexit.register(_journal.stop)
+    return _journal
+
+
+def get_journal() -> Optional[MoveJournal]:
+    return _journal
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import threading
+import time
+from bisect import bisect_right
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 from ..models.domain import GameSession
@@ -10,10 +14,103 @@ DIFFICULTY_BASE_POINTS = {
     "easy": 800,
     "medium": 1400,
     "hard": 2200,
+    "expert": 3600,
+    "marathon": 6000,
 }
 
 MAX_SPEED_BONUS_SECONDS = 1800
 
+PERIODS = ("all", "weekly", "daily")
+# Bounds staleness from scores written by other processes; local writes patch the cache.
+CACHE_TTL_SECONDS = 30.0
+
+
+def _rank_key(entry: dict) -> tuple:
+    return (-entry["score"], entry["elapsedTime"], entry["createdAt"])
+
+
+class LeaderboardCache:
+    """Top-N lists per (database, difficulty, period, period start, limit), patched on every new score."""
+
+    def __init__(self, ttl_seconds: float = CACHE_TTL_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[tuple, tuple[float, list[dict]]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._patches = 0
+
+    def get(self, key: tuple) -> list[dict] | None:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None or time.monotonic() - cached[0] > self.ttl_seconds:
+                self._entries.pop(key, None)
+                self._misses += 1
+                return None
+            self._hits += 1
+            return cached[1]
+
+    def put(self, key: tuple, entries: list[dict]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), entries)
+
+    def add_entry(self, db_key: str, entry: dict) -> None:
+        # Insert the new score into every cached list it belongs to, keeping rank order.
+        with self._lock:
+            for key, (stamp, entries) in list(self._entries.items()):
+                key_db, difficulty, period, since, limit = key
+                if key_db != db_key:
+                    continue
+                if since != period_start(period):
+                    # The period rolled over since this list was cached.
+                    del self._entries[key]
+                    continue
+                if difficulty is not None and entry["difficulty"] != difficulty:
+                    continue
+                position = bisect_right([_rank_key(item) for item in entries], _rank_key(entry))
+                if position >= limit:
+                    continue
+                patched = entries[:position] + [dict(entry)] + entries[position:]
+                del patched[limit:]
+                for rank, item in enumerate(patched, start=1):
+                    item["rank"] = rank
+                self._entries[key] = (stamp, patched)
+                self._patches += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "patches": self._patches,
+                "hitRate": round(self._hits / lookups, 4) if lookups else None,
+                "ttlSeconds": self.ttl_seconds,
+            }
+
+
+_cache = LeaderboardCache()
+
+
+def get_leaderboard_cache() -> LeaderboardCache:
+    return _cache
+
+
+def period_start(period: str, now: datetime | None = None) -> str | None:
+    # Daily and weekly boards start at UTC midnight (weeks start on Monday).
+    if period not in ("daily", "weekly"):
+        return None
+    now = now or datetime.now(UTC)
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "weekly":
+        start -= timedelta(days=start.weekday())
+    return start.isoformat()
+
 
 def calculate_score(difficulty: str, elapsed_time: int) -> int:
     normalized = str(difficulty or "easy").strip().lower()
@@ -33,18 +130,31 @@ def record_completed_game(db_path: Path, user_id: int | None, game_session: Game
         return None
 
     score = calculate_score(game_session.difficulty, game_session.elapsedTime)
-    add_leaderboard_entry(
+    entry = add_leaderboard_entry(
         user_id=user_id,
         difficulty=game_session.difficulty,
         elapsed_time=game_session.elapsedTime,
         score=score,
         db_path=db_path,
     )
+    if entry is not None:
+        # Write-through: patch cached boards instead of dropping them.
+        _cache.add_entry(str(db_path), entry)
     return score
 
 
-def get_leaderboard(db_path: Path, limit: int = 10) -> list[dict]:
-    entries = get_top_leaderboard_entries(db_path=db_path, limit=limit)
-    for idx, entry in enumerate(entries, start=1):
-        entry["rank"] = idx
-    return entries
+def get_leaderboard(db_path: Path, limit: int = 10, difficulty: str | None = None, period: str = "all") -> list[dict]:
+    # difficulty=None is the overall board; period is one of PERIODS.
+    period = period if period in PERIODS else "all"
+    limit = max(1, int(limit))
+    difficulty = str(difficulty).lower() if difficulty else None
+    since = period_start(period)
+    key = (str(db_path), difficulty, period, since, limit)
+
+    entries = _cache.get(key)
+    if entries is None:
+        entries = get_top_leaderboard_entries(db_path=db_path, limit=limit, difficulty=difficulty, since=since)
+        for idx, entry in enumerate(entries, start=1):
+            entry["rank"] = idx
+        _cache.put(key, entries)
+    return [dict(entry) for entry in entries]
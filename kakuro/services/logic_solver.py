@@ -0,0 +1,338 @@
+"""
+Propagation-based Kakuro solver that deduces the way a person does.
+Every cell keeps a 9-bit candidate mask and every deduction is one of a few named
+techniques, applied simplest first until nothing changes. It never guesses, so it can
+explain its next step (hints) and report which techniques a puzzle needs.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+from .combinations import combinations_for
+from .solver import (
+    ALL_DIGITS_MASK,
+    MASK_DIGITS,
+    POPCOUNT,
+    SearchBudgetExceeded,
+    SolverGrid,
+    digit_bit,
+    find_solutions,
+)
+
+NAKED_SINGLE = "naked_single"
+HIDDEN_SINGLE = "hidden_single"
+UNIQUE_COMBINATION = "unique_combination"
+INTERSECTION = "intersection"
+NAKED_PAIR = "naked_pair"
+# Simplest first; the solver always applies the simplest technique that makes progress.
+TECHNIQUES = (NAKED_SINGLE, HIDDEN_SINGLE, UNIQUE_COMBINATION, INTERSECTION, NAKED_PAIR)
+TECHNIQUE_LABELS = {
+    NAKED_SINGLE: "only one digit fits this cell",
+    HIDDEN_SINGLE: "the run needs this digit and only this cell can hold it",
+    UNIQUE_COMBINATION: "the clue has a single digit combination",
+    INTERSECTION: "the across and down digit sets overlap in one way",
+    NAKED_PAIR: "two cells of the run share the same two candidates",
+}
+
+
+@dataclass(frozen=True)
+class Step:
+    technique: str
+    run: Optional[int] = None
+    # Placement steps name the cell (grid index) and digit; elimination steps count the
+    # candidates they removed.
+    cell: Optional[int] = None
+    value: Optional[int] = None
+    eliminated: int = 0
+
+    @property
+    def is_placement(self) -> bool:
+        return self.value is not None
+
+
+@dataclass
+class LogicReport:
+    solved: bool
+    contradiction: bool
+    values: list[int]
+    steps: int = 0
+    techniques: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def hardest(self) -> Optional[str]:
+        used = [technique for technique in TECHNIQUES if self.techniques.get(technique)]
+        return used[-1] if used else None
+
+
+class LogicSolver:
+    """Candidate masks for one puzzle state; `step` and `run` only ever narrow them."""
+
+    def __init__(self, grid: SolverGrid, targets: Sequence[Optional[int]], values: Sequence[int] = ()) -> None:
+        self.grid = grid
+        self.values = [0] * grid.size
+        self.domains = [ALL_DIGITS_MASK] * grid.size
+        self.contradiction = False
+        # Unclued runs only require distinct digits.
+        self._combos = [
+            combinations_for(target, len(cells)) if target is not None else None
+            for target, cells in zip(targets, grid.run_cells)
+        ]
+        self._open = grid.size
+        for cell, value in enumerate(values):
+            if value:
+                self.place(cell, value)
+
+    @property
+    def solved(self) -> bool:
+        return self._open == 0 and not self.contradiction
+
+    def place(self, cell: int, value: int) -> None:
+        bit = digit_bit(value)
+        if not self.domains[cell] & bit:
+            self.contradiction = True
+        if not self.values[cell]:
+            self._open -= 1
+        self.values[cell] = value
+        self.domains[cell] = bit
+        for run_id in (self.grid.across_of[cell], self.grid.down_of[cell]):
+            for peer in self.grid.run_cells[run_id]:
+                if peer != cell and self.domains[peer] & bit:
+                    self.domains[peer] &= ~bit
+                    if not self.domains[peer]:
+                        self.contradiction = True
+
+    def _narrow(self, cell: int, mask: int) -> int:
+        old = self.domains[cell]
+        new = old & mask
+        if new == old:
+            return 0
+        self.domains[cell] = new
+        if not new:
+            self.contradiction = True
+        return POPCOUNT[old] - POPCOUNT[new]
+
+    def _run_sets(self, run_id: int) -> tuple[int, int, int, int]:
+        # (placed digits, digits any compatible combination still needs, digits every one
+        # needs, number of compatible combinations) for the open cells of the run.
+        placed = 0
+        reachable = 0
+        for cell in self.grid.run_cells[run_id]:
+            if self.values[cell]:
+                placed |= self.domains[cell]
+            else:
+                reachable |= self.domains[cell]
+        combos = self._combos[run_id]
+        if combos is None:
+            return placed, ALL_DIGITS_MASK & ~placed, 0, 0
+
+        union = 0
+        common = ALL_DIGITS_MASK
+        count = 0
+        for mask in combos:
+            rest = mask & ~placed
+            if mask & placed != placed or rest & ~reachable:
+                continue
+            union |= rest
+            common &= rest
+            count += 1
+        if not count:
+            self.contradiction = True
+            common = 0
+        return placed, union, common, count
+
+    # Techniques: each applies up to `limit` deductions (None = all it can find in one sweep).
+
+    def _naked_singles(self, limit: Optional[int]) -> list[Step]:
+        steps = []
+        for cell in range(self.grid.size):
+            domain = self.domains[cell]
+            if not self.values[cell] and POPCOUNT[domain] == 1:
+                self.place(cell, MASK_DIGITS[domain][0])
+                steps.append(Step(NAKED_SINGLE, cell=cell, value=self.values[cell]))
+                if len(steps) == limit or self.contradiction:
+                    break
+        return steps
+
+    def _hidden_singles(self, limit: Optional[int]) -> list[Step]:
+        steps = []
+        for run_id, cells in enumerate(self.grid.run_cells):
+            _, _, common, _ = self._run_sets(run_id)
+            for digit in MASK_DIGITS[common]:
+                bit = digit_bit(digit)
+                holders = [cell for cell in cells if not self.values[cell] and self.domains[cell] & bit]
+                if len(holders) == 1:
+                    self.place(holders[0], digit)
+                    steps.append(Step(HIDDEN_SINGLE, run=run_id, cell=holders[0], value=digit))
+                    if len(steps) == limit or self.contradiction:
+                        return steps
+                elif not holders:
+                    self.contradiction = True
+                    return steps
+        return steps
+
+    def _combination_sets(self, limit: Optional[int], unique: bool) -> list[Step]:
+        technique = UNIQUE_COMBINATION if unique else INTERSECTION
+        steps = []
+        for run_id, cells in enumerate(self.grid.run_cells):
+            _, union, _, count = self._run_sets(run_id)
+            if self.contradiction:
+                return steps
+            if (count == 1) != unique:
+                continue
+            removed = sum(self._narrow(cell, union) for cell in cells if not self.values[cell])
+            if removed:
+                steps.append(Step(technique, run=run_id, eliminated=removed))
+                if len(steps) == limit or self.contradiction:
+                    break
+        return steps
+
+    def _unique_combinations(self, limit: Optional[int]) -> list[Step]:
+        return self._combination_sets(limit, unique=True)
+
+    def _intersections(self, limit: Optional[int]) -> list[Step]:
+        return self._combination_sets(limit, unique=False)
+
+    def _naked_pairs(self, limit: Optional[int]) -> list[Step]:
+        steps = []
+        for run_id, cells in enumerate(self.grid.run_cells):
+            seen: dict[int, int] = {}
+            for cell in cells:
+                domain = self.domains[cell]
+                if self.values[cell] or POPCOUNT[domain] != 2:
+                    continue
+                if domain not in seen:
+                    seen[domain] = cell
+                    continue
+                pair = (seen[domain], cell)
+                removed = sum(
+                    self._narrow(other, ~domain)
+                    for other in cells
+                    if other not in pair and not self.values[other]
+                )
+                if removed:
+                    steps.append(Step(NAKED_PAIR, run=run_id, eliminated=removed))
+                    if len(steps) == limit or self.contradiction:
+                        return steps
+        return steps
+
+    _APPLY = {
+        NAKED_SINGLE: _naked_singles,
+        HIDDEN_SINGLE: _hidden_singles,
+        UNIQUE_COMBINATION: _unique_combinations,
+        INTERSECTION: _intersections,
+        NAKED_PAIR: _naked_pairs,
+    }
+
+    def _sweep(self, limit: Optional[int]) -> list[Step]:
+        for technique in TECHNIQUES:
+            steps = self._APPLY[technique](self, limit)
+            if steps or self.contradiction:
+                return steps
+        return []
+
+    def step(self) -> Optional[Step]:
+        # One deduction: the first one the simplest productive technique finds.
+        if self.contradiction or self.solved:
+            return None
+        steps = self._sweep(1)
+        return steps[0] if steps else None
+
+    def next_placement(self) -> Optional[tuple[Step, list[Step]]]:
+        # Deductions up to the next digit that can be placed, plus the eliminations that led there.
+        reasons: list[Step] = []
+        while True:
+            step = self.step()
+            if step is None or self.contradiction:
+                return None
+            if step.is_placement:
+                return step, reasons
+            reasons.append(step)
+
+    def run(self) -> LogicReport:
+        # Fixpoint: sweep with the simplest productive technique, then start again from the top.
+        techniques = dict.fromkeys(TECHNIQUES, 0)
+        steps = 0
+        while not self.contradiction and not self.solved:
+            found = self._sweep(None)
+            if not found:
+                break
+            techniques[found[0].technique] += len(found)
+            steps += len(found)
+        return LogicReport(
+            solved=self.solved,
+            contradiction=self.contradiction,
+            values=list(self.values),
+            steps=steps,
+            techniques={technique: count for technique, count in techniques.items() if count},
+        )
+
+
+def analyze(grid: SolverGrid, targets: Sequence[Optional[int]], fixed: Optional[dict[int, int]] = None) -> LogicReport:
+    # Which techniques the puzzle needs from its givens, and whether they are enough.
+    values = [0] * grid.size
+    for cell, value in (fixed or {}).items():
+        values[cell] = value
+    return LogicSolver(grid, targets, values).run()
+
+
+def residual_components(grid: SolverGrid, values: Sequence[int]) -> list[list[int]]:
+    # Open cells grouped by the runs they share. No run spans two groups, so each group's
+    # completions are independent of every other group's.
+    parent = list(range(grid.size))
+
+    def find(cell: int) -> int:
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    for cells in grid.run_cells:
+        open_cells = [cell for cell in cells if not values[cell]]
+        for cell in open_cells[1:]:
+            parent[find(cell)] = find(open_cells[0])
+
+    groups: dict[int, list[int]] = {}
+    for cell in range(grid.size):
+        if not values[cell]:
+            groups.setdefault(find(cell), []).append(cell)
+    return list(groups.values())
+
+
+def find_solutions_with_logic(
+    grid: SolverGrid,
+    targets: Sequence[Optional[int]],
+    limit: int = 2,
+    fixed: Optional[dict[int, int]] = None,
+    max_nodes: Optional[int] = None,
+) -> list[list[int]]:
+    # Same contract as solver.find_solutions for limit <= 2, built for boards with hundreds
+    # of cells. Propagation runs first and every digit it places holds in every solution.
+    # What is left splits into independent groups searched one at a time, so backtracking
+    # never crosses from one group into another. `max_nodes` applies to each group.
+    report = analyze(grid, targets, fixed)
+    if report.contradiction:
+        return []
+    if report.solved:
+        return [report.values]
+
+    settled = {cell: value for cell, value in enumerate(report.values) if value}
+    first = list(report.values)
+    second = None
+    for group in residual_components(grid, report.values):
+        try:
+            found = find_solutions(grid, targets, limit=limit, fixed=settled, max_nodes=max_nodes, cells=group)
+        except SearchBudgetExceeded as exc:
+            raise SearchBudgetExceeded(exc.nodes, tuple(group)) from exc
+        if not found:
+            return []
+        if len(found) > 1 and second is None:
+            second = list(first)
+        for cell in group:
+            first[cell] = found[0][cell]
+            if second is not None:
+                # Groups are independent, so the alternative takes the second completion of
+                # every ambiguous group at once.
+                second[cell] = found[-1][cell]
+    return [first] if second is None else [first, second]
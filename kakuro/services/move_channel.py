@@ -0,0 +1,152 @@
+"""
+Optional real-time move channel for the Play Game flow.
+The client keeps one server-sent events stream open (GET /game/channel) and posts moves to
+a per-channel URL. Channel posts skip the Flask session entirely (no cookie unsigning, no
+session file read or write): the channel token identifies the live GameSession, moves go
+through the same validate_move path as /game/enter, and results plus timer sync are pushed
+back on the stream.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import secrets
+import threading
+import time
+from typing import Iterator, Optional
+
+from flask import Flask, current_app
+from flask.sessions import SessionInterface
+
+from ..models.domain import GameSession
+from .game_service import apply_moves
+
+CHANNEL_PATH_PREFIX = "/game/channel/"
+DEFAULT_HEARTBEAT_SECONDS = 5.0
+REGISTRY_EXTENSION = "move_channels"
+
+
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class MoveChannel:
+    """One open stream: the game it drives, pending events and a server-side timer."""
+
+    def __init__(self, game_session: GameSession) -> None:
+        self.token = secrets.token_urlsafe(18)
+        self.game_session = game_session
+        self.events: queue.Queue[str] = queue.Queue()
+        self._elapsed = float(game_session.elapsedTime)
+        self._ticked_at = time.monotonic()
+
+    def publish(self, event: str, data: dict) -> None:
+        self.events.put(format_event(event, data))
+
+    def apply(self, moves: list) -> dict:
+        # Same validation as /game/moves; pause state comes from the GameSession because
+        # channel posts carry no Flask session.
+        # The game's own lock: channel posts apply in the order they were sent and never
+        # interleave with /game/moves or undo/redo on the same cached object.
+        game_session = self.game_session
+        with game_session.lock:
+            if game_session.status == "Finished":
+                result = {"ok": False, "message": "Game is finished. Start a new game.", "results": []}
+            elif game_session.isPaused:
+                result = {"ok": False, "message": "Game is paused. Resume to continue.", "results": []}
+            else:
+                result = apply_moves(game_session, moves)
+        self.publish("moves", result)
+        return result
+
+    def elapsed_time(self) -> int:
+        # Advances only while the game is running, like the client-side timer.
+        now = time.monotonic()
+        if not self.game_session.isPaused and self.game_session.status != "Finished":
+            self._elapsed += now - self._ticked_at
+        self._ticked_at = now
+        return int(self._elapsed)
+
+    def stream(self, heartbeat_seconds: float = DEFAULT_HEARTBEAT_SECONDS) -> Iterator[str]:
+        yield format_event("ready", {"token": self.token, "elapsedTime": self.elapsed_time()})
+        next_tick = time.monotonic() + heartbeat_seconds
+        while True:
+            try:
+                # Timer sync keeps its cadence even while move results keep the queue busy.
+                yield self.events.get(timeout=max(0.0, next_tick - time.monotonic()))
+            except queue.Empty:
+                yield format_event(
+                    "timer",
+                    {"elapsedTime": self.elapsed_time(), "isPaused": self.game_session.isPaused},
+                )
+                next_tick = time.monotonic() + heartbeat_seconds
+
+
+class ChannelRegistry:
+    def __init__(self) -> None:
+        self._channels: dict[str, MoveChannel] = {}
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._posts = 0
+        self._moves = 0
+
+    def open(self, game_session: GameSession) -> MoveChannel:
+        channel = MoveChannel(game_session)
+        with self._lock:
+            self._channels[channel.token] = channel
+            self._opened += 1
+        return channel
+
+    def get(self, token: str) -> Optional[MoveChannel]:
+        with self._lock:
+            return self._channels.get(token)
+
+    def close(self, token: str) -> None:
+        with self._lock:
+            self._channels.pop(token, None)
+
+    def count_post(self, moves: int) -> None:
+        with self._lock:
+            self._posts += 1
+            self._moves += moves
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "open": len(self._channels),
+                "opened": self._opened,
+                "posts": self._posts,
+                "moves": self._moves,
+            }
+
+
+class ChannelSessionInterface(SessionInterface):
+    """Wraps the app's session interface and hands channel posts a null session."""
+
+    def __init__(self, inner: SessionInterface, prefix: str = CHANNEL_PATH_PREFIX) -> None:
+        self.inner = inner
+        self.prefix = prefix
+
+    def open_session(self, app, request):
+        if request.method == "POST" and request.path.startswith(self.prefix):
+            return self.make_null_session(app)
+        return self.inner.open_session(app, request)
+
+    def save_session(self, app, session, response) -> None:
+        self.inner.save_session(app, session, response)
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+def init_move_channel(app: Flask) -> Optional[ChannelRegistry]:
+    registry = ChannelRegistry() if app.config.get("MOVE_CHANNEL_ENABLED", False) else None
+    app.extensions[REGISTRY_EXTENSION] = registry
+    if registry is not None and not isinstance(app.session_interface, ChannelSessionInterface):
+        app.session_interface = ChannelSessionInterface(app.session_interface)
+    return registry
+
+
+def get_channels() -> Optional[ChannelRegistry]:
+    return current_app.extensions.get(REGISTRY_EXTENSION)
@@ -0,0 +1,306 @@
+"""
+Pre-generated puzzle pool for the Start New Game flow.
+A background worker keeps a queue of ready templates per difficulty, so creating a game
+is a queue pop instead of a full layout + solve inside the request. Templates carry a
+rating (services/rating.py); refills keep only boards inside the difficulty's rating band.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Sequence
+
+from ..models.domain import Board
+from .board_generator import (
+    DIFFICULTY_CONFIGS,
+    PYTHON_LAYOUT_ENGINE,
+    board_from_template,
+    check_layout_engine,
+    generate_template,
+)
+from .rating import in_band
+
+DEFAULT_LOW_WATER = 2
+DEFAULT_TARGET = 6
+IDLE_WAIT_SECONDS = 5.0
+# Generation attempts per slot before an out-of-band board is accepted anyway.
+MAX_BAND_ATTEMPTS = 12
+
+Band = Optional[Sequence[Optional[float]]]
+
+logger = logging.getLogger(__name__)
+
+
+class PuzzleStore:
+    """SQLite-backed stock of templates, used to keep a warm pool across restarts."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS puzzles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    difficulty TEXT NOT NULL,
+                    template TEXT NOT NULL,
+                    rating REAL
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(puzzles)")}
+            if "rating" not in columns:
+                # Stores written before ratings existed; their puzzles stay unrated.
+                conn.execute("ALTER TABLE puzzles ADD COLUMN rating REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_puzzles_difficulty ON puzzles (difficulty, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_puzzles_rating ON puzzles (difficulty, rating)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def push_many(self, difficulty: str, templates: Iterable[dict]) -> int:
+        rows = [
+            (difficulty, json.dumps(template, separators=(",", ":")), template.get("rating"))
+            for template in templates
+        ]
+        if not rows:
+            return 0
+        with self._connect() as conn:
+            conn.executemany("INSERT INTO puzzles (difficulty, template, rating) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    def pop_many(self, difficulty: str, limit: int, band: Band = None) -> list[dict]:
+        if limit <= 0:
+            return []
+        query = "SELECT id, template FROM puzzles WHERE difficulty = ?"
+        params: list = [difficulty]
+        low, high = band if band is not None else (None, None)
+        if low is not None:
+            query += " AND (rating IS NULL OR rating >= ?)"
+            params.append(low)
+        if high is not None:
+            query += " AND (rating IS NULL OR rating < ?)"
+            params.append(high)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY id LIMIT ?", (*params, limit)).fetchall()
+            conn.executemany("DELETE FROM puzzles WHERE id = ?", [(row[0],) for row in rows])
+        return [json.loads(row[1]) for row in rows]
+
+    def count(self, difficulty: str) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM puzzles WHERE difficulty = ?", (difficulty,)).fetchone()[0]
+
+
+class PuzzlePool:
+    def __init__(
+        self,
+        difficulties: Iterable[str] = tuple(DIFFICULTY_CONFIGS),
+        low_water: int = DEFAULT_LOW_WATER,
+        target: int = DEFAULT_TARGET,
+        store: Optional[PuzzleStore] = None,
+        generate: Callable[[str], dict] = generate_template,
+        bands: Optional[dict[str, Band]] = None,
+    ) -> None:
+        self.difficulties = tuple(difficulties)
+        self.low_water = max(0, int(low_water))
+        self.target = max(self.low_water + 1, int(target))
+        self.store = store
+        self._generate = generate
+        self.bands = dict(bands or {})
+        self._queues: dict[str, deque[dict]] = {difficulty: deque() for difficulty in self.difficulties}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._hits = {difficulty: 0 for difficulty in self.difficulties}
+        self._misses = {difficulty: 0 for difficulty in self.difficulties}
+        self._refilled = {difficulty: 0 for difficulty in self.difficulties}
+        self._refill_seconds = {difficulty: 0.0 for difficulty in self.difficulties}
+        self._last_refill_seconds = {difficulty: 0.0 for difficulty in self.difficulties}
+        self._rejected = {difficulty: 0 for difficulty in self.difficulties}
+
+    def take(self, difficulty: str, band: Band = None) -> Optional[dict]:
+        # Queued templates are already inside the configured band; an explicit band scans
+        # the (short) queue for the first template that fits it.
+        with self._lock:
+            queue = self._queues.get(difficulty)
+            if queue is None:
+                return None
+            template = None
+            if band is None:
+                template = queue.popleft() if queue else None
+            else:
+                for index, candidate in enumerate(queue):
+                    if in_band(candidate.get("rating"), band):
+                        template = candidate
+                        del queue[index]
+                        break
+            if template is None:
+                self._misses[difficulty] += 1
+            else:
+                self._hits[difficulty] += 1
+            below_low_water = len(queue) < self.low_water
+
+        if below_low_water:
+            self._wakeup.set()
+        return template
+
+    def put(self, difficulty: str, template: dict) -> None:
+        with self._lock:
+            self._queues[difficulty].append(template)
+
+    def depth(self, difficulty: str) -> int:
+        with self._lock:
+            return len(self._queues[difficulty])
+
+    def refill(self) -> int:
+        # Top every difficulty back up to `target`, preferring stocked puzzles over generation.
+        added = 0
+        for difficulty in self.difficulties:
+            missing = self.target - self.depth(difficulty)
+            if missing <= 0:
+                continue
+
+            if self.store is not None:
+                for template in self.store.pop_many(difficulty, missing, self.bands.get(difficulty)):
+                    self.put(difficulty, template)
+                    added += 1
+                    missing -= 1
+
+            while missing > 0 and not self._stopping.is_set():
+                started = time.perf_counter()
+                template, attempts = generate_in_band(difficulty, self.bands.get(difficulty), self._generate)
+                elapsed = time.perf_counter() - started
+                self.put(difficulty, template)
+                with self._lock:
+                    self._rejected[difficulty] += attempts - 1
+                    self._refilled[difficulty] += 1
+                    self._refill_seconds[difficulty] += elapsed
+                    self._last_refill_seconds[difficulty] = elapsed
+                added += 1
+                missing -= 1
+        return added
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="puzzle-pool-refill", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.store is not None:
+            # Spill unused puzzles so the next process starts warm.
+            for difficulty in self.difficulties:
+                with self._lock:
+                    leftovers = list(self._queues[difficulty])
+                    self._queues[difficulty].clear()
+                self.store.push_many(difficulty, leftovers)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.refill()
+            except Exception:
+                # A failed refill must not kill the worker; the next wakeup retries.
+                logger.exception("Puzzle pool refill failed")
+            self._wakeup.wait(IDLE_WAIT_SECONDS)
+            self._wakeup.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            per_difficulty = {}
+            for difficulty in self.difficulties:
+                hits = self._hits[difficulty]
+                misses = self._misses[difficulty]
+                refilled = self._refilled[difficulty]
+                per_difficulty[difficulty] = {
+                    "depth": len(self._queues[difficulty]),
+                    "hits": hits,
+                    "misses": misses,
+                    "hitRate": round(hits / (hits + misses), 4) if hits + misses else None,
+                    "refilled": refilled,
+                    "rejected": self._rejected[difficulty],
+                    "band": list(self.bands[difficulty]) if difficulty in self.bands else None,
+                    "avgRefillMs": round(self._refill_seconds[difficulty] * 1000 / refilled, 3) if refilled else None,
+                    "lastRefillMs": round(self._last_refill_seconds[difficulty] * 1000, 3) if refilled else None,
+                }
+
+        total_hits = sum(item["hits"] for item in per_difficulty.values())
+        total_misses = sum(item["misses"] for item in per_difficulty.values())
+        return {
+            "lowWater": self.low_water,
+            "target": self.target,
+            "hitRate": round(total_hits / (total_hits + total_misses), 4) if total_hits + total_misses else None,
+            "difficulties": per_difficulty,
+        }
+
+
+def generate_in_band(
+    difficulty: str,
+    band: Band,
+    generate: Callable[[str], dict] = generate_template,
+) -> tuple[dict, int]:
+    # Generate until the rating lands in the band; returns the template and the attempts used.
+    for attempt in range(1, MAX_BAND_ATTEMPTS + 1):
+        template = generate(difficulty)
+        if in_band(template.get("rating"), band):
+            return template, attempt
+    return template, MAX_BAND_ATTEMPTS
+
+
+_pool: Optional[PuzzlePool] = None
+_layout_engine = PYTHON_LAYOUT_ENGINE
+
+
+def init_pool(config) -> Optional[PuzzlePool]:
+    global _pool, _layout_engine
+    if _pool is not None:
+        _pool.stop()
+        _pool = None
+    _layout_engine = config.get("LAYOUT_ENGINE") or PYTHON_LAYOUT_ENGINE
+    # Fail at startup, not inside the first request that misses the pool.
+    check_layout_engine(_layout_engine)
+    if not config.get("PUZZLE_POOL_ENABLED", False):
+        return None
+
+    store_path = config.get("PUZZLE_POOL_PATH")
+    _pool = PuzzlePool(
+        difficulties=config.get("PUZZLE_POOL_DIFFICULTIES") or tuple(DIFFICULTY_CONFIGS),
+        low_water=config.get("PUZZLE_POOL_LOW_WATER", DEFAULT_LOW_WATER),
+        target=config.get("PUZZLE_POOL_TARGET", DEFAULT_TARGET),
+        store=PuzzleStore(store_path) if store_path else None,
+        generate=partial(generate_template, engine=_layout_engine),
+        bands=dict(config.get("PUZZLE_RATING_BANDS") or {}),
+    )
+    _pool.start()
+    atexit.register(_pool.stop)
+    return _pool
+
+
+def get_pool() -> Optional[PuzzlePool]:
+    return _pool
+
+
+def take_board(difficulty: str, band: Band = None) -> Board:
+    # O(1) pop when the pool is warm. A miss generates one board inline and keeps it whatever
+    # its rating: retrying for the band would put several generations inside the request,
+    # so band selection is left to the background refill.
+    template = _pool.take(difficulty, band) if _pool is not None else None
+    if template is None:
+        template = generate_template(difficulty, engine=_layout_engine)
+    return board_from_template(template)
@@ -0,0 +1,135 @@
+"""
+Difficulty rating from solver effort.
+The logic solver (logic_solver.py) works the puzzle from its givens; when its techniques run
+dry the rater branches on the most constrained cell and lets logic continue in each branch.
+The rating combines weighted technique use per open cell, the hardest technique needed and
+the number of guesses, so it measures how a puzzle solves rather than how big it is.
+Deterministic: the same puzzle always gets the same rating.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+from .logic_solver import (
+    HIDDEN_SINGLE,
+    INTERSECTION,
+    NAKED_PAIR,
+    NAKED_SINGLE,
+    TECHNIQUES,
+    UNIQUE_COMBINATION,
+    LogicSolver,
+)
+from .solver import MASK_DIGITS, POPCOUNT, SolverGrid
+
+TECHNIQUE_WEIGHTS = {
+    NAKED_SINGLE: 1.0,
+    HIDDEN_SINGLE: 1.5,
+    UNIQUE_COMBINATION: 1.0,
+    INTERSECTION: 2.0,
+    NAKED_PAIR: 4.0,
+}
+# Weighted effort of one guess, and of each level of technique depth (index in TECHNIQUES).
+GUESS_WEIGHT = 12.0
+DEPTH_WEIGHT = 4.0
+# Branch nodes explored before the rater gives up and rates with what it has seen.
+MAX_GUESSES = 2_000
+
+
+@dataclass
+class Rating:
+    score: float
+    guesses: int = 0
+    steps: int = 0
+    hardest: Optional[str] = None
+    techniques: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "score": self.score,
+            "guesses": self.guesses,
+            "steps": self.steps,
+            "hardest": self.hardest,
+            "techniques": dict(self.techniques),
+        }
+
+
+class _Rater:
+    def __init__(self) -> None:
+        self.guesses = 0
+        self.steps = 0
+        self.techniques = dict.fromkeys(TECHNIQUES, 0)
+
+    def _absorb(self, solver: LogicSolver) -> None:
+        report = solver.run()
+        self.steps += report.steps
+        for technique, count in report.techniques.items():
+            self.techniques[technique] += count
+
+    def solve(self, solver: LogicSolver) -> bool:
+        # Logic first; branch only on a stalled, consistent state. Only branches that are
+        # actually explored count as guesses. Iterative so large boards never hit the
+        # recursion limit.
+        stack = [(solver, None)]
+        while stack:
+            current, guess = stack.pop()
+            if guess is not None:
+                if self.guesses >= MAX_GUESSES:
+                    return False
+                self.guesses += 1
+                current = _copy(current)
+                current.place(*guess)
+            self._absorb(current)
+            if current.solved:
+                return True
+            if current.contradiction:
+                continue
+
+            cell = min(
+                (cell for cell in range(current.grid.size) if not current.values[cell]),
+                key=lambda cell: POPCOUNT[current.domains[cell]],
+            )
+            for digit in reversed(MASK_DIGITS[current.domains[cell]]):
+                stack.append((current, (cell, digit)))
+        return False
+
+
+def _copy(solver: LogicSolver) -> LogicSolver:
+    branch = LogicSolver.__new__(LogicSolver)
+    branch.__dict__.update(solver.__dict__)
+    branch.values = list(solver.values)
+    branch.domains = list(solver.domains)
+    return branch
+
+
+def rate(grid: SolverGrid, targets: Sequence[Optional[int]], fixed: Optional[dict[int, int]] = None) -> Rating:
+    values = [0] * grid.size
+    for cell, value in (fixed or {}).items():
+        values[cell] = value
+    open_cells = max(1, grid.size - len(fixed or {}))
+
+    rater = _Rater()
+    rater.solve(LogicSolver(grid, targets, values))
+    used = [technique for technique in TECHNIQUES if rater.techniques[technique]]
+    hardest = used[-1] if used else None
+
+    effort = sum(TECHNIQUE_WEIGHTS[technique] * count for technique, count in rater.techniques.items())
+    score = 10.0 * effort / open_cells
+    score += DEPTH_WEIGHT * (TECHNIQUES.index(hardest) if hardest else 0)
+    score += GUESS_WEIGHT * rater.guesses
+    return Rating(
+        score=round(score, 1),
+        guesses=rater.guesses,
+        steps=rater.steps,
+        hardest=hardest,
+        techniques={technique: rater.techniques[technique] for technique in used},
+    )
+
+
+def in_band(rating: Optional[float], band: Optional[Sequence[Optional[float]]]) -> bool:
+    # Bands are [low, high); None leaves a side open. Unrated boards pass every band.
+    if rating is None or band is None:
+        return True
+    low, high = band
+    return (low is None or rating >= low) and (high is None or rating < high)
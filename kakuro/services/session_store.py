@@ -0,0 +1,173 @@
+"""
+Game session store for the Play Game flow.
+Live GameSession objects are kept in a per-process LRU cache keyed by session id. A request
+loads the active game at most once, and the Flask session is written once after the request
+(write-behind) instead of on every save_game call.
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from flask import Flask, current_app, g
+from flask import session as flask_session
+
+from ..models.domain import GameSession
+from .journal_service import get_journal, replay
+
+GAME_KEY = "active_game"
+REVISION_KEY = "revision"
+DEFAULT_CACHE_SIZE = 256
+CACHE_EXTENSION = "game_session_cache"
+
+_NOT_LOADED = object()
+
+
+class GameSessionCache:
+    """LRU of live GameSession objects, each tagged with the revision it was stored under."""
+
+    def __init__(self, capacity: int = DEFAULT_CACHE_SIZE) -> None:
+        self.capacity = max(1, int(capacity))
+        self._entries: OrderedDict[str, tuple[str, GameSession]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty: set[str] = set()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, session_id: str, revision: str) -> Optional[GameSession]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry[0] != revision:
+                # Unknown or stale (another worker process wrote a newer revision).
+                self._misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, revision: str, game_session: GameSession) -> None:
+        with self._lock:
+            self._entries[game_session.sessionId] = (revision, game_session)
+            self._entries.move_to_end(game_session.sessionId)
+            while len(self._entries) > self.capacity:
+                evicted, _ = self._entries.popitem(last=False)
+                self._dirty.discard(evicted)
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._entries.pop(session_id, None)
+            self._dirty.discard(session_id)
+
+    def mark_dirty(self, session_id: str) -> None:
+        # The cached object was changed outside a request (move channel); the next request
+        # that loads it writes it back to the Flask session.
+        with self._lock:
+            self._dirty.add(session_id)
+
+    def take_dirty(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self._dirty:
+                self._dirty.remove(session_id)
+                return True
+            return False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hitRate": round(self._hits / lookups, 4) if lookups else None,
+            }
+
+
+def init_session_store(app: Flask) -> GameSessionCache:
+    cache = GameSessionCache(app.config.get("GAME_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+    app.extensions[CACHE_EXTENSION] = cache
+    app.after_request(_flush_game)
+    app.teardown_request(_drop_game_on_error)
+    return cache
+
+
+def get_cache() -> GameSessionCache:
+    return current_app.extensions[CACHE_EXTENSION]
+
+
+def load_game() -> Optional[GameSession]:
+    # One lookup per request; later calls reuse the object held on flask.g.
+    loaded = g.get("_active_game", _NOT_LOADED)
+    if loaded is not _NOT_LOADED:
+        return loaded
+
+    payload = flask_session.get(GAME_KEY)
+    game_session = None
+    game_dirty = False
+    if payload:
+        cache = get_cache()
+        revision = payload.get(REVISION_KEY)
+        if revision:
+            game_session = cache.get(payload["sessionId"], revision)
+            game_dirty = game_session is not None and cache.take_dirty(game_session.sessionId)
+        if game_session is None:
+            game_session = GameSession.from_dict(payload)
+            if revision:
+                if current_app.config.get("MOVE_CHANNEL_ENABLED", False):
+                    # Moves journaled after this payload was written (over the move channel,
+                    # before the object left the cache) are replayed on top of it. Without
+                    # the channel every move goes through a request that rewrites the payload.
+                    game_dirty = _catch_up(game_session)
+                cache.put(revision, game_session)
+
+    g._active_game = game_session
+    g._game_dirty = g.get("_game_dirty") or game_dirty
+    return game_session
+
+
+def _catch_up(game_session: GameSession) -> bool:
+    journal = get_journal()
+    if journal is None:
+        return False
+    tail = journal.entries(game_session.journalKey, game_session.journalSeq)
+    if not tail:
+        return False
+    replay(game_session.board, tail)
+    game_session.journalSeq = tail[-1]["seq"]
+    game_session.history = None
+    return True
+
+
+def store_game(game_session: GameSession) -> None:
+    # Mark the game dirty; the Flask session is written once in _flush_game.
+    g._active_game = game_session
+    g._game_dirty = True
+
+
+def _flush_game(response):
+    if g.get("_game_dirty"):
+        game_session = g._active_game
+        revision = uuid.uuid4().hex
+        with game_session.lock:
+            payload = game_session.to_dict()
+        payload[REVISION_KEY] = revision
+        flask_session[GAME_KEY] = payload
+        get_cache().put(revision, game_session)
+        g._game_dirty = False
+    return response
+
+
+def _drop_game_on_error(exc: Optional[BaseException]) -> None:
+    # A failed request may have mutated the cached object without persisting it.
+    if exc is None:
+        return
+    game_session = g.get("_active_game")
+    if isinstance(game_session, GameSession):
+        get_cache().discard(game_session.sessionId)
@@ -0,0 +1,340 @@
+"""
+Bitmask constraint solver used by board generation.
+Digits 1-9 are stored as bits 0-8, so every run keeps its used digits in a 9-bit mask.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+from .combinations import COMPLETION_BOUNDS, candidates_for
+
+ALL_DIGITS_MASK = 0x1FF
+
+POPCOUNT = tuple(bin(mask).count("1") for mask in range(ALL_DIGITS_MASK + 1))
+MASK_DIGITS = tuple(
+    tuple(digit for digit in range(1, 10) if mask & (1 << (digit - 1)))
+    for mask in range(ALL_DIGITS_MASK + 1)
+)
+MASK_SUM = tuple(sum(digits) for digits in MASK_DIGITS)
+
+_DONE = -1
+_DEAD = -2
+
+
+def digit_bit(digit: int) -> int:
+    return 1 << (digit - 1)
+
+
+def digits_to_mask(digits: Iterable[int]) -> int:
+    mask = 0
+    for digit in digits:
+        mask |= 1 << (digit - 1)
+    return mask
+
+
+class SearchBudgetExceeded(RuntimeError):
+    def __init__(self, nodes: int, cells: tuple[int, ...] = ()) -> None:
+        super().__init__(f"Search budget exceeded after {nodes} nodes.")
+        self.nodes = nodes
+        # The cells being searched, when the search covered only part of the grid.
+        self.cells = cells
+
+
+@dataclass(frozen=True)
+class SolverGrid:
+    # Playable cells are numbered row-major; every cell belongs to one across and one down run.
+    rows: int
+    cols: int
+    positions: tuple[tuple[int, int], ...]
+    across_of: tuple[int, ...]
+    down_of: tuple[int, ...]
+    run_cells: tuple[tuple[int, ...], ...]
+    across_runs: int
+
+    @property
+    def size(self) -> int:
+        return len(self.positions)
+
+
+def build_grid(layout: list[list[bool]]) -> SolverGrid:
+    rows, cols = len(layout), len(layout[0])
+    index: dict[tuple[int, int], int] = {}
+    positions = []
+    for r in range(rows):
+        for c in range(cols):
+            if layout[r][c]:
+                index[(r, c)] = len(positions)
+                positions.append((r, c))
+
+    across_of = [0] * len(positions)
+    down_of = [0] * len(positions)
+    run_cells: list[tuple[int, ...]] = []
+
+    for r, c in positions:
+        if c == 0 or not layout[r][c - 1]:
+            members = []
+            cc = c
+            while cc < cols and layout[r][cc]:
+                members.append(index[(r, cc)])
+                cc += 1
+            run_id = len(run_cells)
+            run_cells.append(tuple(members))
+            for member in members:
+                across_of[member] = run_id
+
+    across_runs = len(run_cells)
+    for r, c in positions:
+        if r == 0 or not layout[r - 1][c]:
+            members = []
+            rr = r
+            while rr < rows and layout[rr][c]:
+                members.append(index[(rr, c)])
+                rr += 1
+            run_id = len(run_cells)
+            run_cells.append(tuple(members))
+            for member in members:
+                down_of[member] = run_id
+
+    return SolverGrid(
+        rows=rows,
+        cols=cols,
+        positions=tuple(positions),
+        across_of=tuple(across_of),
+        down_of=tuple(down_of),
+        run_cells=tuple(run_cells),
+        across_runs=across_runs,
+    )
+
+
+class _Search:
+    """Depth-first search with incremental MRV buckets and forward checking.
+
+    Each run exposes a candidate mask; a cell's domain is the intersection of its two
+    runs' masks. Domain sizes live in buckets indexed by popcount, so picking the most
+    constrained cell is a scan over at most ten buckets, and an empty bucket 0 means a
+    peer was wiped out by the last assignment.
+    """
+
+    def __init__(self, grid: SolverGrid, allowed_mask: int = ALL_DIGITS_MASK) -> None:
+        self.grid = grid
+        self.allowed_mask = allowed_mask
+        self.values = [0] * grid.size
+        self.run_used = [0] * len(grid.run_cells)
+        self.run_cand = [allowed_mask] * len(grid.run_cells)
+        self.run_broken = [False] * len(grid.run_cells)
+        self.broken_runs = 0
+        self.domain_size = [0] * grid.size
+        self.buckets: list[set[int]] = [set() for _ in range(10)]
+        self.nodes = 0
+
+    def _run_candidates(self, run_id: int) -> int | None:
+        # None marks a run that can no longer be completed.
+        return self.allowed_mask & ~self.run_used[run_id]
+
+    def _update_run(self, run_id: int) -> None:
+        mask = self._run_candidates(run_id)
+        broken = mask is None
+        if broken != self.run_broken[run_id]:
+            self.run_broken[run_id] = broken
+            self.broken_runs += 1 if broken else -1
+        self.run_cand[run_id] = mask or 0
+
+    def domain(self, cell: int) -> int:
+        return self.run_cand[self.grid.across_of[cell]] & self.run_cand[self.grid.down_of[cell]]
+
+    def _refresh_cell(self, cell: int) -> None:
+        size = POPCOUNT[self.domain(cell)]
+        old = self.domain_size[cell]
+        if old != size:
+            self.buckets[old].discard(cell)
+            self.buckets[size].add(cell)
+            self.domain_size[cell] = size
+
+    def _refresh_runs(self, *run_ids: int) -> None:
+        for run_id in run_ids:
+            self._update_run(run_id)
+        values = self.values
+        for run_id in run_ids:
+            for peer in self.grid.run_cells[run_id]:
+                if not values[peer]:
+                    self._refresh_cell(peer)
+
+    def prepare(self, fixed: dict[int, int] | None = None, cells: Iterable[int] | None = None) -> bool:
+        # `cells` limits the search to those open cells; the others must not share a run
+        # with them, so they stay empty without affecting the result.
+        for cell, value in (fixed or {}).items():
+            bit = digit_bit(value)
+            a_id = self.grid.across_of[cell]
+            d_id = self.grid.down_of[cell]
+            if (self.run_used[a_id] | self.run_used[d_id]) & bit:
+                return False
+            self.values[cell] = value
+            self.run_used[a_id] |= bit
+            self.run_used[d_id] |= bit
+
+        if cells is None:
+            cells = range(self.grid.size)
+            run_ids = range(len(self.grid.run_cells))
+        else:
+            cells = list(cells)
+            run_ids = {run_id for cell in cells for run_id in (self.grid.across_of[cell], self.grid.down_of[cell])}
+        for run_id in run_ids:
+            self._update_run(run_id)
+
+        for cell in cells:
+            if self.values[cell]:
+                continue
+            size = POPCOUNT[self.domain(cell)]
+            self.domain_size[cell] = size
+            self.buckets[size].add(cell)
+        return True
+
+    def assign(self, cell: int, value: int) -> None:
+        self.buckets[self.domain_size[cell]].discard(cell)
+        self.values[cell] = value
+        bit = digit_bit(value)
+        a_id = self.grid.across_of[cell]
+        d_id = self.grid.down_of[cell]
+        self.run_used[a_id] |= bit
+        self.run_used[d_id] |= bit
+        self._refresh_runs(a_id, d_id)
+
+    def unassign(self, cell: int) -> None:
+        bit = digit_bit(self.values[cell])
+        self.values[cell] = 0
+        a_id = self.grid.across_of[cell]
+        d_id = self.grid.down_of[cell]
+        self.run_used[a_id] &= ~bit
+        self.run_used[d_id] &= ~bit
+        size = POPCOUNT[self.domain(cell)]
+        self.domain_size[cell] = size
+        self.buckets[size].add(cell)
+        self._refresh_runs(a_id, d_id)
+
+    def select(self) -> int:
+        if self.buckets[0] or self.broken_runs:
+            return _DEAD
+        for bucket in self.buckets[1:]:
+            if bucket:
+                return next(iter(bucket))
+        return _DONE
+
+    def order(self, cell: int) -> list[int]:
+        return list(MASK_DIGITS[self.domain(cell)])
+
+    def run(self, max_nodes: int | None = None):
+        # Iterative DFS so large boards never hit the recursion limit.
+        # Yields once per complete assignment; callers stop iterating when satisfied.
+        nxt = self.select()
+        if nxt == _DONE:
+            yield self.values
+            return
+        if nxt == _DEAD:
+            return
+
+        frames = [[nxt, self.order(nxt), 0]]
+        while frames:
+            frame = frames[-1]
+            cell, options, pos = frame
+            if self.values[cell]:
+                self.unassign(cell)
+            if pos >= len(options):
+                frames.pop()
+                continue
+            frame[2] = pos + 1
+
+            self.nodes += 1
+            if max_nodes is not None and self.nodes > max_nodes:
+                raise SearchBudgetExceeded(self.nodes)
+
+            self.assign(cell, options[pos])
+            nxt = self.select()
+            if nxt == _DONE:
+                yield self.values
+                continue
+            if nxt == _DEAD:
+                continue
+            frames.append([nxt, self.order(nxt), 0])
+
+
+class _RandomFill(_Search):
+    def __init__(self, grid: SolverGrid, allowed_mask: int, rng: random.Random, prefer_low: bool) -> None:
+        super().__init__(grid, allowed_mask)
+        self.rng = rng
+        self.prefer_low = prefer_low
+
+    def order(self, cell: int) -> list[int]:
+        options = list(MASK_DIGITS[self.domain(cell)])
+        if self.prefer_low:
+            options.sort(key=lambda d: d + (self.rng.random() * 0.8))
+        else:
+            self.rng.shuffle(options)
+        return options
+
+
+def fill_grid(
+    grid: SolverGrid,
+    allowed_digits: Iterable[int],
+    rng: random.Random,
+    prefer_low: bool = False,
+    fixed: dict[int, int] | None = None,
+    max_nodes: int | None = None,
+) -> list[int] | None:
+    # Random Latin-run fill: every run gets distinct digits, sums are unconstrained.
+    search = _RandomFill(grid, digits_to_mask(allowed_digits), rng, prefer_low)
+    if not search.prepare(fixed):
+        return None
+    for values in search.run(max_nodes=max_nodes):
+        return list(values)
+    return None
+
+
+class _SumSearch(_Search):
+    # Clue-aware search: a run's candidates are the digits of every (sum, length)
+    # combination that still contains the digits already placed in it.
+    def __init__(self, grid: SolverGrid, targets: Sequence[int | None]) -> None:
+        super().__init__(grid)
+        self.targets = targets
+
+    def _run_candidates(self, run_id: int) -> int | None:
+        target = self.targets[run_id]
+        if target is None:
+            return super()._run_candidates(run_id)
+
+        used = self.run_used[run_id]
+        length = len(self.grid.run_cells[run_id])
+        remaining = length - POPCOUNT[used]
+        if remaining:
+            # O(1) bound check rejects most dead runs before scanning combinations.
+            bounds = COMPLETION_BOUNDS[used][remaining]
+            needed = target - MASK_SUM[used]
+            if bounds is None or not bounds[0] <= needed <= bounds[1]:
+                return None
+        return candidates_for(target, length, used)
+
+
+def run_targets(grid: SolverGrid, values: Sequence[int]) -> list[int]:
+    return [sum(values[cell] for cell in cells) for cells in grid.run_cells]
+
+
+def find_solutions(
+    grid: SolverGrid,
+    targets: Sequence[int | None],
+    limit: int = 2,
+    fixed: dict[int, int] | None = None,
+    max_nodes: int | None = None,
+    cells: Iterable[int] | None = None,
+) -> list[list[int]]:
+    # Enumerate up to `limit` solutions of the clued puzzle; limit=2 is a uniqueness check.
+    search = _SumSearch(grid, targets)
+    if not search.prepare(fixed, cells):
+        return []
+    solutions = []
+    for values in search.run(max_nodes=max_nodes):
+        solutions.append(list(values))
+        if len(solutions) >= limit:
+            break
+    return solutions
@@ -7,7 +7,8 @@ from __future__ import annotations
 
 from collections import defaultdict
 
-from ..models.domain import Board, Cell
+from ..models.domain import Board, Cell, PlayCell
+from .combinations import completion_bounds, is_reachable
 
 
 def _parse_value(raw_value: str | int | None) -> int | None:
@@ -28,116 +29,165 @@ def _parse_value(raw_value: str | int | None) -> int | None:
     return value if 1 <= value <= 9 else None
 
 
-def _board_matrix(board: Board) -> list[list[Cell]]:
-    return board.matrix()
-
-
-def _get_across_run(matrix: list[list[Cell]], row: int, col: int) -> tuple[list[Cell], int | None]:
-    cols = len(matrix[0])
-
-    left = col
-    while left - 1 >= 0 and matrix[row][left - 1].isPlayable:
-        left -= 1
-
-    right = col
-    while right + 1 < cols and matrix[row][right + 1].isPlayable:
-        right += 1
-
-    run = [matrix[row][cc] for cc in range(left, right + 1)]
-    clue_col = left - 1
-    clue = matrix[row][clue_col].clueRight if clue_col >= 0 else None
-
-    return run, clue
-
-
-def _get_down_run(matrix: list[list[Cell]], row: int, col: int) -> tuple[list[Cell], int | None]:
-    rows = len(matrix)
-
-    top = row
-    while top - 1 >= 0 and matrix[top - 1][col].isPlayable:
-        top -= 1
-
-    bottom = row
-    while bottom + 1 < rows and matrix[bottom + 1][col].isPlayable:
-        bottom += 1
-
-    run = [matrix[rr][col] for rr in range(top, bottom + 1)]
-    clue_row = top - 1
-    clue = matrix[clue_row][col].clueDown if clue_row >= 0 else None
-
-    return run, clue
+class RunProgress:
+    """Running per-run state for one board: digit counts, sum, filled slots, duplicates.
+
+    Every cell change costs O(1) per run, so the board-level "is solved" check is O(1)
+    and wrong-cell feedback only has to look at runs currently flagged as bad.
+    """
+
+    def __init__(self, board: Board) -> None:
+        self.board = board
+        run_count = len(board.runs)
+        self.counts = [[0] * 10 for _ in range(run_count)]
+        self.masks = [0] * run_count
+        self.sums = [0] * run_count
+        self.filled = [0] * run_count
+        self.duplicates = [0] * run_count
+        self.bad_runs: set[int] = set()
+
+        self._cells = [cell for cell in board.cells if cell.isPlayable]
+        self._seen: list[int | None] = [None] * len(self._cells)
+        self._slot = {(cell.row, cell.col): idx for idx, cell in enumerate(self._cells)}
+        self.open_cells = len(self._cells)
+
+        for idx, cell in enumerate(self._cells):
+            if cell.value is not None:
+                self._apply(idx, None, cell.value, evaluate=False)
+        for run in board.runs:
+            self._evaluate(run.runId)
+
+    def _apply(self, idx: int, old: int | None, new: int | None, evaluate: bool = True) -> None:
+        cell = self._cells[idx]
+        self._seen[idx] = new
+        if old is None and new is not None:
+            self.open_cells -= 1
+        elif old is not None and new is None:
+            self.open_cells += 1
+
+        for run in self.board.runs_for(cell.row, cell.col):
+            run_id = run.runId
+            counts = self.counts[run_id]
+            if old is not None:
+                counts[old] -= 1
+                if counts[old] >= 1:
+                    self.duplicates[run_id] -= 1
+                else:
+                    self.masks[run_id] &= ~(1 << (old - 1))
+                self.sums[run_id] -= old
+                self.filled[run_id] -= 1
+            if new is not None:
+                if counts[new] >= 1:
+                    self.duplicates[run_id] += 1
+                counts[new] += 1
+                self.masks[run_id] |= 1 << (new - 1)
+                self.sums[run_id] += new
+                self.filled[run_id] += 1
+            if evaluate:
+                self._evaluate(run_id)
+
+    def _evaluate(self, run_id: int) -> None:
+        if self._run_is_bad(run_id):
+            self.bad_runs.add(run_id)
+        else:
+            self.bad_runs.discard(run_id)
+
+    def _run_is_bad(self, run_id: int) -> bool:
+        # Same rules as _mark_run_errors, evaluated from the running totals.
+        target = self.board.runs[run_id].target
+        if target is None:
+            return False
+        if self.duplicates[run_id]:
+            return True
+
+        filled = self.filled[run_id]
+        if not filled:
+            return False
+
+        length = self.board.runs[run_id].length
+        current_sum = self.sums[run_id]
+        remaining_slots = length - filled
+        if remaining_slots == 0:
+            return current_sum != target
+
+        return not _completable(target, length, self.masks[run_id], current_sum, remaining_slots)
+
+    def set_value(self, row: int, col: int, value: int | None) -> None:
+        idx = self._slot[(row, col)]
+        old = self._seen[idx]
+        self._cells[idx].value = value
+        if old != value:
+            self._apply(idx, old, value)
+
+    def sync(self) -> None:
+        # Explicit O(cells) catch-up for values written straight to cells (tests). Runtime
+        # writers go through set_value or drop board.progress so it is rebuilt on next use.
+        for idx, cell in enumerate(self._cells):
+            if cell.value != self._seen[idx]:
+                self._apply(idx, self._seen[idx], cell.value)
+
+    def has_duplicates(self, row: int, col: int) -> bool:
+        return any(self.duplicates[run.runId] for run in self.board.runs_for(row, col))
+
+    def is_solved(self) -> bool:
+        return self.open_cells == 0 and not self.bad_runs
+
+    def wrong_cells(self, run_ids=None) -> set[tuple[int, int]]:
+        wrong: set[tuple[int, int]] = set()
+        for run_id in self.bad_runs if run_ids is None else self.bad_runs.intersection(run_ids):
+            run = self.board.runs[run_id]
+            _mark_run_errors(self.board.run_cells(run), run.target, wrong)
+        return wrong
+
+
+def get_progress(board: Board) -> RunProgress:
+    if board.progress is None:
+        board.progress = RunProgress(board)
+    return board.progress
 
 
 def validate_move(board: Board, row: int, col: int, raw_value: str | None) -> dict:
     # Flow 4A enterNumber + Flow 4C removeNumber: move-level validation.
     # Preconditions: active board exists, target cell is editable, value is empty or 1-9.
-    matrix = _board_matrix(board)
-    rows, cols = board.size
-
-    if row < 0 or col < 0 or row >= rows or col >= cols:
+    cell = board.get_cell(row, col)
+    if cell is None:
         return {"ok": False, "message": "Invalid cell coordinates."}
 
-    cell = matrix[row][col]
     if not cell.isPlayable:
         return {"ok": False, "message": "Selected cell is not playable."}
 
+    if isinstance(cell, PlayCell) and not cell.editable:
+        return {"ok": False, "message": "Selected cell is a fixed given."}
+
     new_value = _parse_value(raw_value)
     if raw_value is not None and str(raw_value).strip() != "" and new_value is None:
         return {"ok": False, "message": "Value must be empty or a digit 1-9."}
 
+    progress = get_progress(board)
     old_value = cell.value
-    cell.value = new_value
-
-    across_run, across_clue = _get_across_run(matrix, row, col)
-    down_run, down_clue = _get_down_run(matrix, row, col)
-
-    for run in (across_run, down_run):
-        seen = set()
-        for run_cell in run:
-            if run_cell.value is None:
-                continue
-            if run_cell.value in seen:
-                cell.value = old_value
-                # ALT path: duplicate value inside a run is rejected immediately.
-                return {"ok": False, "message": "Duplicate value in run is not allowed."}
-            seen.add(run_cell.value)
+    progress.set_value(row, col, new_value)
+
+    if progress.has_duplicates(row, col):
+        progress.set_value(row, col, old_value)
+        # ALT path: duplicate value inside a run is rejected immediately.
+        return {"ok": False, "message": "Duplicate value in run is not allowed."}
 
     # Postcondition: cell value is updated when validation passes.
-    return {"ok": True, "message": "Move accepted.", "value": new_value}
+    touched = [run.runId for run in board.runs_for(row, col)]
+    return {
+        "ok": True,
+        "message": "Move accepted.",
+        "value": new_value,
+        "wrongCells": sorted(progress.wrong_cells(touched)),
+    }
 
 
 def validate_entire_board(board: Board) -> dict:
     # Flow 4D submitBoard: validate full board + wrong-cell output.
-    matrix = _board_matrix(board)
-    rows, cols = board.size
-
-    wrong_cells: set[tuple[int, int]] = set()
-
-    for r in range(rows):
-        for c in range(cols):
-            clue_cell = matrix[r][c]
-            if clue_cell.isPlayable:
-                continue
-
-            if clue_cell.clueRight is not None:
-                run = []
-                cc = c + 1
-                while cc < cols and matrix[r][cc].isPlayable:
-                    run.append(matrix[r][cc])
-                    cc += 1
-                _mark_run_errors(run, clue_cell.clueRight, wrong_cells)
-
-            if clue_cell.clueDown is not None:
-                run = []
-                rr = r + 1
-                while rr < rows and matrix[rr][c].isPlayable:
-                    run.append(matrix[rr][c])
-                    rr += 1
-                _mark_run_errors(run, clue_cell.clueDown, wrong_cells)
-
-    playable_cells = [cell for row in matrix for cell in row if cell.isPlayable]
-    all_filled = all(cell.value is not None for cell in playable_cells)
-    is_solved = all_filled and not wrong_cells
+    progress = get_progress(board)
+
+    is_solved = progress.is_solved()
+    wrong_cells = set() if is_solved else progress.wrong_cells()
 
     ordered_wrong = sorted(wrong_cells)
     coords_message = ", ".join(f"({r + 1},{c + 1})" for r, c in ordered_wrong)
@@ -182,19 +232,26 @@ def _mark_run_errors(run: list[Cell], clue: int, wrong_cells: set[tuple[int, int
                 wrong_cells.add((cell.row, cell.col))
         return
 
-    used_values = {cell.value for cell in filled_cells}
-    available_values = [value for value in range(1, 10) if value not in used_values]
+    used_mask = 0
+    for value in value_positions:
+        used_mask |= 1 << (value - 1)
+    has_duplicates = len(value_positions) < len(filled_cells)
 
-    if len(available_values) < remaining_slots:
+    if has_duplicates:
+        bounds = completion_bounds(used_mask, remaining_slots)
+        reachable = bounds is not None and bounds[0] <= clue - current_sum <= bounds[1]
+    else:
+        reachable = _completable(clue, len(run), used_mask, current_sum, remaining_slots)
+
+    if not reachable:
         for cell in filled_cells:
             wrong_cells.add((cell.row, cell.col))
-        return
 
-    min_remaining = sum(sorted(available_values)[:remaining_slots])
-    max_remaining = sum(sorted(available_values, reverse=True)[:remaining_slots])
-    min_possible_sum = current_sum + min_remaining
-    max_possible_sum = current_sum + max_remaining
 
-    if clue < min_possible_sum or clue > max_possible_sum:
-        for cell in filled_cells:
-            wrong_cells.add((cell.row, cell.col))
+def _completable(clue: int, length: int, used_mask: int, current_sum: int, remaining_slots: int) -> bool:
+    # Cheap min/max bound first, then the exact "some valid combination still contains
+    # these digits" lookup, which also catches runs the bounds alone would let through.
+    bounds = completion_bounds(used_mask, remaining_slots)
+    if bounds is None or not bounds[0] <= clue - current_sum <= bounds[1]:
+        return False
+    return is_reachable(clue, length, used_mask)
@@ -9,7 +9,15 @@ document.addEventListener("DOMContentLoaded", () => {
     const submitForm = document.querySelector(".submit-solution-form");
     const pauseButton = document.querySelector("#pauseGameBtn");
     const resumeButton = document.querySelector("#resumeGameBtn");
+    const undoButton = document.querySelector("#undoMoveBtn");
+    const redoButton = document.querySelector("#redoMoveBtn");
+    const hintButton = document.querySelector("#hintCellBtn");
+    const revealButton = document.querySelector("#revealCellBtn");
+    const checkButton = document.querySelector("#checkCellsBtn");
     const saveGameForm = document.querySelector("#saveGameForm");
+    const saveMessage = document.querySelector("#saveMessage");
+    const gameMessage = document.querySelector("#gameMessage");
+    const wrongCellList = document.querySelector("#wrongCellList");
     const elapsedDisplay = document.querySelector("#elapsed-time");
     const elapsedInput = document.querySelector("#elapsedTimeInput");
     const submitElapsedInput = document.querySelector("#submitElapsedTimeInput");
@@ -19,7 +27,11 @@ document.addEventListener("DOMContentLoaded", () => {
     let paused = gameCard.dataset.initialPaused === "1";
     let elapsedSeconds = Number(gameCard.dataset.initialElapsed || "0");
     let timerId = null;
+    let selectedInput = null;
     const dirtyInputs = new Set();
+    // Edits made within this window travel to the server in one batch.
+    const SYNC_DELAY_MS = 150;
+    const SYNC_FAILED_MESSAGE = "Could not reach the server. Your latest moves are kept and will be sent again.";
 
     const formatElapsed = (totalSeconds) => {
         const minutes = Math.floor(totalSeconds / 60);
@@ -123,44 +135,6 @@ document.addEventListener("DOMContentLoaded", () => {
         return true;
     };
 
-    const sendMove = async (input) => {
-        // Flow 4A enterNumber (and Flow 4C removeNumber when value is empty): sync with /game/enter.
-        if (paused) {
-            return false;
-        }
-
-        const row = input.dataset.row;
-        const col = input.dataset.col;
-        const value = input.value;
-
-        const body = new URLSearchParams({ row, col, value });
-
-        const response = await fetch("/game/enter", {
-            method: "POST",
-            headers: {
-                "Content-Type": "application/x-www-form-urlencoded",
-                "X-Requested-With": "XMLHttpRequest",
-            },
-            body,
-        });
-
-        if (!response.ok) {
-            return;
-        }
-
-        const data = await response.json();
-
-        if (!data.ok) {
-            input.value = "";
-            setErrorMessage(`Move error: ${data.message}`);
-            return false;
-        }
-
-        setErrorMessage("");
-
-        return true;
-    };
-
     const moveByArrow = (current, key) => {
         const row = Number(current.dataset.row);
         const col = Number(current.dataset.col);
@@ -180,38 +154,235 @@ document.addEventListener("DOMContentLoaded", () => {
         }
     };
 
-    const syncInput = async (input) => {
-        if (paused) {
-            return false;
+    const inputsByKey = new Map([...inputs].map((input) => [`${input.dataset.row}-${input.dataset.col}`, input]));
+    const inputAt = (row, col) => inputsByKey.get(`${row}-${col}`) || null;
+
+    // Local mirror of the server's move rules (validator.js): duplicates are rejected without a
+    // round trip and wrong cells are highlighted as the board changes.
+    const topologyEl = document.querySelector("#boardTopology");
+    const validator = window.KakuroValidator && topologyEl
+        ? window.KakuroValidator.create(JSON.parse(topologyEl.textContent), (row, col) => {
+            const input = inputAt(row, col);
+            return input && input.value !== "" ? Number(input.value) : null;
+        })
+        : null;
+
+    // Cells flagged by the last check or submit ("incorrect-cell"), kept apart from the rule
+    // violations above so edits elsewhere do not clear them. Seeded from the server render.
+    const flaggedCells = new Map();
+    inputsByKey.forEach((input, key) => {
+        const cell = input.closest(".play-cell");
+        if (cell && cell.classList.contains("incorrect-cell")) {
+            flaggedCells.set(key, [Number(input.dataset.row), Number(input.dataset.col)]);
+        }
+    });
+
+    const renderFlaggedCells = () => {
+        inputsByKey.forEach((input, key) => {
+            const cell = input.closest(".play-cell");
+            if (cell) {
+                cell.classList.toggle("incorrect-cell", flaggedCells.has(key));
+            }
+        });
+        if (wrongCellList) {
+            wrongCellList.hidden = !flaggedCells.size;
+            wrongCellList.querySelector("span").textContent = [...flaggedCells.values()]
+                .map(([row, col]) => `(${row + 1},${col + 1})`)
+                .join(", ");
         }
+    };
 
-        const currentValue = input.value;
-        if (!dirtyInputs.has(input) && input.dataset.syncedValue === currentValue) {
-            return true;
+    const unflagCell = (input) => {
+        // The cell changed since it was checked; the server drops its mark the same way.
+        if (flaggedCells.delete(`${input.dataset.row}-${input.dataset.col}`)) {
+            renderFlaggedCells();
         }
+    };
 
-        const ok = await sendMove(input);
-        input.dataset.syncedValue = input.value;
+    const refreshWrongCells = () => {
+        if (!validator) {
+            return;
+        }
+        const wrong = validator.wrongCells();
+        inputsByKey.forEach((input, key) => {
+            const cell = input.closest(".play-cell");
+            if (cell) {
+                cell.classList.toggle("wrong-cell", wrong.has(key));
+            }
+        });
+    };
+
+    const setCellValue = (input, value) => {
+        // Value confirmed by the server (rejected move, undo/redo).
+        input.value = value;
+        input.dataset.syncedValue = value;
+        input.dataset.localValue = value;
         dirtyInputs.delete(input);
-        return ok;
+        unflagCell(input);
+    };
+
+    const takePendingMoves = () => {
+        // Edits in the order they were made (the server validates them in sequence),
+        // then any input whose value drifted without an input event. They stay pending
+        // until the server acknowledges the batch.
+        const pending = [...dirtyInputs];
+        inputs.forEach((input) => {
+            if (!dirtyInputs.has(input) && input.dataset.syncedValue !== input.value) {
+                pending.push(input);
+            }
+        });
+        return pending.map((input) => ({ input, value: input.value }));
+    };
+
+    const acknowledgeMoves = (pending) => {
+        pending.forEach(({ input, value }) => {
+            input.dataset.syncedValue = value;
+            // An edit made while the batch was in flight is still waiting for the next one.
+            if (input.value === value) {
+                dirtyInputs.delete(input);
+            }
+        });
+    };
+
+    const applyMoveResults = (data) => {
+        (data.results || []).forEach((result) => {
+            // A rejected move leaves the server's value in place; show that one again.
+            const input = result.ok ? null : inputAt(result.row, result.col);
+            if (input) {
+                setCellValue(input, result.value ? String(result.value) : "");
+            }
+        });
+        refreshWrongCells();
+        setErrorMessage(data.ok ? "" : `Move error: ${data.message}`);
+        return data.ok;
+    };
+
+    // Optional real-time mode: results and timer sync arrive on one SSE stream and moves
+    // are posted to the channel URL, which skips the session round trip.
+    let channelToken = null;
+    if (gameCard.dataset.moveChannel === "1" && "EventSource" in window && !isFinished) {
+        const source = new EventSource("/game/channel");
+        source.addEventListener("ready", (event) => {
+            channelToken = JSON.parse(event.data).token;
+        });
+        source.addEventListener("moves", (event) => {
+            applyMoveResults(JSON.parse(event.data));
+        });
+        source.addEventListener("timer", (event) => {
+            const data = JSON.parse(event.data);
+            if (!paused) {
+                elapsedSeconds = data.elapsedTime;
+                renderTimer();
+            }
+        });
+        source.addEventListener("error", () => {
+            // EventSource reconnects by itself and announces a new token; until then use /game/moves.
+            channelToken = null;
+        });
+    }
+
+    const sendMoves = async (pending) => {
+        // Flow 4A enterNumber / 4C removeNumber: one request for the whole batch. True once
+        // the server has the batch; on failure the edits stay queued for the next sync.
+        const moves = pending.map(({ input, value }) => ({
+            row: Number(input.dataset.row),
+            col: Number(input.dataset.col),
+            value,
+        }));
+        const body = JSON.stringify({ moves });
+        const headers = {
+            "Content-Type": "application/json",
+            "X-Requested-With": "XMLHttpRequest",
+        };
+
+        if (channelToken) {
+            const response = await fetch(`/game/channel/${channelToken}/moves`, { method: "POST", headers, body });
+            if (response.ok) {
+                acknowledgeMoves(pending);
+                return true;
+            }
+            channelToken = null;
+        }
+
+        const response = await fetch("/game/moves", { method: "POST", headers, body });
+        if (!response.ok) {
+            return false;
+        }
+        const data = await response.json();
+        acknowledgeMoves(pending);
+        applyMoveResults(data);
+        return true;
+    };
+
+    let syncChain = Promise.resolve(true);
+    let syncTimerId = null;
+
+    const syncPending = () => {
+        // Coalesces every pending edit into one request; calls queue behind an in-flight batch.
+        if (syncTimerId !== null) {
+            clearTimeout(syncTimerId);
+            syncTimerId = null;
+        }
+        syncChain = syncChain.then(() => {
+            if (paused) {
+                return false;
+            }
+            const pending = takePendingMoves();
+            return pending.length ? sendMoves(pending) : true;
+        }).catch(() => false).then((synced) => {
+            if (!synced && !paused) {
+                setErrorMessage(SYNC_FAILED_MESSAGE);
+            }
+            return synced;
+        });
+        return syncChain;
+    };
+
+    const scheduleSync = () => {
+        if (syncTimerId === null) {
+            syncTimerId = window.setTimeout(() => {
+                syncTimerId = null;
+                void syncPending();
+            }, SYNC_DELAY_MS);
+        }
     };
 
     inputs.forEach((input) => {
         input.dataset.syncedValue = input.value;
+        input.dataset.localValue = input.value;
 
         input.addEventListener("input", () => {
             if (paused) {
                 return;
             }
             input.value = input.value.replace(/[^1-9]/g, "").slice(0, 1);
+            if (validator) {
+                const check = validator.checkMove(Number(input.dataset.row), Number(input.dataset.col), input.value);
+                if (!check.ok) {
+                    // Same answer validate_move would give, so the move never leaves the browser.
+                    input.value = input.dataset.localValue;
+                    setErrorMessage(`Move error: ${check.message}`);
+                    return;
+                }
+                setErrorMessage("");
+            }
+            input.dataset.localValue = input.value;
+            unflagCell(input);
+            // Re-insert so the set keeps the order of the latest edits.
+            dirtyInputs.delete(input);
             dirtyInputs.add(input);
+            refreshWrongCells();
+        });
+
+        input.addEventListener("focus", () => {
+            selectedInput = input;
         });
 
         input.addEventListener("change", () => {
             if (paused) {
                 return;
             }
-            void syncInput(input);
+            scheduleSync();
         });
 
         input.addEventListener("keydown", (event) => {
@@ -232,8 +403,8 @@ document.addEventListener("DOMContentLoaded", () => {
                 return;
             }
 
-            for (const input of inputs) {
-                await syncInput(input);
+            if (!(await syncPending())) {
+                return;
             }
 
             const ok = await sendPauseAction("/game/pause");
@@ -257,36 +428,225 @@ document.addEventListener("DOMContentLoaded", () => {
         });
     }
 
+    const postJson = async (url, payload) => {
+        // JSON API call; null when the server could not be reached or did not answer in JSON.
+        try {
+            const response = await fetch(url, {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json",
+                    "X-Requested-With": "XMLHttpRequest",
+                },
+                body: JSON.stringify(payload),
+            });
+            return await response.json();
+        } catch (error) {
+            return null;
+        }
+    };
+
+    const applyFeedback = (game) => {
+        // Check/submit highlights and the result message from an /api/game response.
+        flaggedCells.clear();
+        game.wrongCells.forEach(([row, col]) => flaggedCells.set(`${row}-${col}`, [row, col]));
+        renderFlaggedCells();
+
+        if (gameMessage) {
+            gameMessage.textContent = game.message;
+        }
+    };
+
+    const stepHistory = async (button) => {
+        // Undo/redo replay the move journal server-side; the response names the changed cell.
+        if (paused || isFinished) {
+            return;
+        }
+
+        if (!(await syncPending())) {
+            return;
+        }
+
+        const response = await fetch(button.dataset.url, {
+            method: "POST",
+            headers: {
+                "X-Requested-With": "XMLHttpRequest",
+            },
+        });
+        if (!response.ok) {
+            return;
+        }
+
+        const data = await response.json();
+        if (!data.ok) {
+            setErrorMessage(`Move error: ${data.message}`);
+            return;
+        }
+
+        const target = inputAt(data.row, data.col);
+        if (target) {
+            setCellValue(target, data.value);
+        }
+        refreshWrongCells();
+        setErrorMessage("");
+    };
+
+    [undoButton, redoButton].forEach((button) => {
+        if (button) {
+            button.addEventListener("click", () => {
+                void stepHistory(button);
+            });
+        }
+    });
+
+    const selectedCell = () =>
+        selectedInput ? { row: Number(selectedInput.dataset.row), col: Number(selectedInput.dataset.col) } : {};
+
+    const markHinted = (input, digit) => {
+        const cell = input.closest(".play-cell");
+        if (cell) {
+            cell.classList.add("hinted-cell");
+        }
+        if (digit !== undefined) {
+            input.placeholder = digit;
+        }
+    };
+
+    const requestHelp = async (button, payload) => {
+        // Hint / reveal / check are answered from the solution kept server-side.
+        if (paused || isFinished) {
+            return null;
+        }
+
+        if (!(await syncPending())) {
+            return null;
+        }
+        const data = await postJson(button.dataset.url, payload);
+        if (!data) {
+            return null;
+        }
+        if (!data.ok) {
+            setErrorMessage(`Move error: ${data.message}`);
+            return null;
+        }
+        setErrorMessage("");
+        return data;
+    };
+
+    if (hintButton) {
+        hintButton.addEventListener("click", async () => {
+            // Flow 4B checkHint: the next logical deduction; its digit is shown as a placeholder
+            // and the player still enters it.
+            const data = await requestHelp(hintButton, {});
+            if (!data) {
+                return;
+            }
+            const target = inputAt(data.row, data.col);
+            if (target) {
+                markHinted(target, String(data.value));
+                target.focus();
+            }
+            if (gameMessage) {
+                gameMessage.textContent = data.message;
+            }
+        });
+    }
+
+    if (revealButton) {
+        revealButton.addEventListener("click", async () => {
+            if (!selectedInput) {
+                setErrorMessage("Move error: Select a cell to reveal.");
+                return;
+            }
+            const data = await requestHelp(revealButton, selectedCell());
+            if (!data) {
+                return;
+            }
+            data.cleared.forEach(([row, col]) => {
+                const input = inputAt(row, col);
+                if (input) {
+                    setCellValue(input, "");
+                }
+            });
+            const target = inputAt(data.row, data.col);
+            if (target) {
+                setCellValue(target, String(data.value));
+                markHinted(target);
+            }
+            refreshWrongCells();
+        });
+    }
+
+    if (checkButton) {
+        checkButton.addEventListener("click", async () => {
+            const data = await requestHelp(checkButton, {});
+            if (data) {
+                applyFeedback({ wrongCells: data.incorrectCells, message: data.message });
+            }
+        });
+    }
+
     if (saveGameForm) {
-        saveGameForm.addEventListener("submit", () => {
-            // Flow 4F saveGame: send latest elapsed time to backend.
+        saveGameForm.addEventListener("submit", async (event) => {
+            // Flow 4F saveGame: saved over /api/game/save; the game stays paused on screen.
+            event.preventDefault();
             renderTimer();
+
+            const label = saveGameForm.querySelector("input[name='label']");
+            const data = await postJson("/api/game/save", {
+                elapsedTime: elapsedSeconds,
+                label: label ? label.value : "",
+            });
+            if (!data) {
+                saveGameForm.submit();
+                return;
+            }
+
+            if (saveMessage) {
+                saveMessage.textContent = data.message;
+                saveMessage.classList.toggle("success", data.ok);
+                saveMessage.classList.toggle("error", !data.ok);
+            }
         });
     }
 
     if (submitForm) {
         submitForm.addEventListener("submit", async (event) => {
-            // Flow 4D submitBoard: submit after syncing pending edits.
-            if (paused) {
-                event.preventDefault();
+            // Flow 4D submitBoard: submit after syncing pending edits; wrong cells are
+            // highlighted in place, a win moves on to the menu.
+            event.preventDefault();
+            if (paused || submitForm.dataset.submitting === "1") {
                 return;
             }
 
-            if (submitForm.dataset.submitting === "1") {
+            submitForm.dataset.submitting = "1";
+            if (!(await syncPending())) {
+                // Submitting now would grade a board without the unsent moves.
+                submitForm.dataset.submitting = "";
                 return;
             }
+            renderTimer();
+            const data = await postJson("/api/game/submit", { elapsedTime: elapsedSeconds });
+            submitForm.dataset.submitting = "";
 
-            event.preventDefault();
-            for (const input of inputs) {
-                await syncInput(input);
+            if (!data) {
+                // API unreachable: fall back to the regular form post.
+                submitForm.submit();
+                return;
             }
-
-            submitForm.dataset.submitting = "1";
-            submitForm.submit();
+            if (data.redirect) {
+                window.location.assign(data.redirect);
+                return;
+            }
+            if (!data.ok) {
+                setErrorMessage(data.message);
+                return;
+            }
+            applyFeedback(data.game);
         });
     }
 
     renderTimer();
+    refreshWrongCells();
     applyPausedState(paused);
     if (!paused) {
         startTimer();
@@ -0,0 +1,147 @@
+// Client-side mirror of services/validation_service.py (validate_move + _mark_run_errors)
+// and the tables in services/combinations.py. The server stays authoritative: this only
+// gives instant feedback and keeps moves the server would reject out of the move batches.
+window.KakuroValidator = (() => {
+    const DIGITS = [1, 2, 3, 4, 5, 6, 7, 8, 9];
+    const bit = (digit) => 1 << (digit - 1);
+
+    // COMBINATIONS: digit masks keyed by "sum:length".
+    const COMBINATIONS = new Map();
+    for (let mask = 1; mask < 1 << 9; mask += 1) {
+        const digits = DIGITS.filter((digit) => mask & bit(digit));
+        const key = `${digits.reduce((total, digit) => total + digit, 0)}:${digits.length}`;
+        if (!COMBINATIONS.has(key)) {
+            COMBINATIONS.set(key, []);
+        }
+        COMBINATIONS.get(key).push(mask);
+    }
+
+    const isReachable = (total, length, usedMask) =>
+        (COMBINATIONS.get(`${total}:${length}`) || []).some((mask) => (mask & usedMask) === usedMask);
+
+    const completionBounds = (usedMask, remaining) => {
+        const free = DIGITS.filter((digit) => !(usedMask & bit(digit)));
+        if (remaining > free.length) {
+            return null;
+        }
+        const sum = (digits) => digits.reduce((total, digit) => total + digit, 0);
+        return remaining === 0 ? [0, 0] : [sum(free.slice(0, remaining)), sum(free.slice(-remaining))];
+    };
+
+    const completable = (clue, length, usedMask, currentSum, remaining) => {
+        const bounds = completionBounds(usedMask, remaining);
+        if (bounds === null || clue - currentSum < bounds[0] || clue - currentSum > bounds[1]) {
+            return false;
+        }
+        return isReachable(clue, length, usedMask);
+    };
+
+    const parseValue = (raw) => {
+        const text = String(raw ?? "").trim();
+        if (text === "") {
+            return { ok: true, value: null };
+        }
+        const value = Number(text);
+        return /^\d+$/.test(text) && value >= 1 && value <= 9 ? { ok: true, value } : { ok: false, value: null };
+    };
+
+    const create = (topology, readValue) => {
+        // topology: {runs: [{target, cells: [[row, col], ...]}]}; readValue(row, col) -> digit or null.
+        const runs = topology.runs || [];
+        const runsByCell = new Map();
+        runs.forEach((run, runId) => {
+            run.cells.forEach(([row, col]) => {
+                const key = `${row}-${col}`;
+                if (!runsByCell.has(key)) {
+                    runsByCell.set(key, []);
+                }
+                runsByCell.get(key).push(runId);
+            });
+        });
+
+        const markRunErrors = (run, wrong) => {
+            // Same rules as _mark_run_errors.
+            const positions = new Map();
+            let currentSum = 0;
+            let filled = 0;
+            run.cells.forEach(([row, col]) => {
+                const value = readValue(row, col);
+                if (value === null) {
+                    return;
+                }
+                if (!positions.has(value)) {
+                    positions.set(value, []);
+                }
+                positions.get(value).push(`${row}-${col}`);
+                currentSum += value;
+                filled += 1;
+            });
+
+            positions.forEach((keys) => {
+                if (keys.length > 1) {
+                    keys.forEach((key) => wrong.add(key));
+                }
+            });
+            if (!filled) {
+                return;
+            }
+
+            const markFilled = () => positions.forEach((keys) => keys.forEach((key) => wrong.add(key)));
+            const remaining = run.cells.length - filled;
+            if (remaining === 0) {
+                if (currentSum !== run.target) {
+                    markFilled();
+                }
+                return;
+            }
+
+            let usedMask = 0;
+            positions.forEach((_, value) => {
+                usedMask |= bit(value);
+            });
+            let reachable;
+            if (positions.size < filled) {
+                const bounds = completionBounds(usedMask, remaining);
+                reachable = bounds !== null && bounds[0] <= run.target - currentSum && run.target - currentSum <= bounds[1];
+            } else {
+                reachable = completable(run.target, run.cells.length, usedMask, currentSum, remaining);
+            }
+            if (!reachable) {
+                markFilled();
+            }
+        };
+
+        return {
+            checkMove(row, col, raw) {
+                // Mirrors validate_move: digit range and no duplicate inside either run.
+                const parsed = parseValue(raw);
+                if (!parsed.ok) {
+                    return { ok: false, message: "Value must be empty or a digit 1-9." };
+                }
+                if (parsed.value === null) {
+                    return { ok: true, value: null };
+                }
+                const duplicate = (runsByCell.get(`${row}-${col}`) || []).some((runId) =>
+                    runs[runId].cells.some(([r, c]) => (r !== row || c !== col) && readValue(r, c) === parsed.value),
+                );
+                if (duplicate) {
+                    return { ok: false, message: "Duplicate value in run is not allowed." };
+                }
+                return { ok: true, value: parsed.value };
+            },
+
+            wrongCells() {
+                // "row-col" keys of every cell the server would report as wrong right now.
+                const wrong = new Set();
+                runs.forEach((run) => {
+                    if (run.target !== null) {
+                        markRunErrors(run, wrong);
+                    }
+                });
+                return wrong;
+            },
+        };
+    };
+
+    return { create };
+})();
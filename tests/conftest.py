@@ -3,6 +3,7 @@ from pathlib import Path
 import pytest
 
 from kakuro.app import create_app
+from kakuro.models.db import close_all
 from kakuro.models.user import init_db
 
 
@@ -17,6 +18,7 @@ def app(tmp_path):
             "SECRET_KEY": "test-secret",
             "DB_PATH": db_path,
             "SCHEMA_PATH": schema_path,
+            "PUZZLE_POOL_ENABLED": False,
         }
     )
 
@@ -24,7 +26,9 @@ def app(tmp_path):
 
     yield app
 
+    close_all()
+
 
 @pytest.fixture()
 def client(app):
-    return app.test_client()
+    return app.test_client()
@@ -0,0 +1,194 @@
+import pytest
+
+from kakuro.models.domain import Board, ClueCell, PlayCell
+from kakuro.services import board_generator, layout_engine
+from kakuro.services.board_generator import (
+    DIFFICULTY_CONFIGS,
+    EDGE_BOOST,
+    MAX_PLAY_PROBABILITY,
+    NUMPY_LAYOUT_ENGINE,
+    _build_layout,
+    _build_solution,
+    _collect_runs,
+    _DifficultyConfig,
+    _draw_layout,
+    _enforce_max_run_length,
+    _is_usable,
+    _make_unique,
+    _remove_short_runs,
+    generate_board,
+)
+from kakuro.services.logic_solver import find_solutions_with_logic, residual_components
+from kakuro.services.solver import SearchBudgetExceeded, build_grid, find_solutions, run_targets
+from kakuro.services.validation_service import validate_move
+
+
+def test_solution_fills_every_cell_without_run_duplicates():
+    for difficulty, config in DIFFICULTY_CONFIGS.items():
+        layout = _build_layout(config, 4242)
+        solution = _build_solution(layout, 4242, difficulty)
+
+        for r, row in enumerate(layout):
+            for c, is_play in enumerate(row):
+                assert (solution[r][c] != 0) == is_play
+
+        for direction in ("across", "down"):
+            for run in _collect_runs(layout, direction):
+                digits = [solution[r][c] for r, c in run]
+                assert len(digits) == len(set(digits))
+
+
+def test_solution_is_deterministic_for_seed():
+    config = DIFFICULTY_CONFIGS["hard"]
+    layout = _build_layout(config, 99)
+
+    assert _build_solution(layout, 99, "hard") == _build_solution(layout, 99, "hard")
+
+
+def test_easy_solution_uses_easy_digit_pool():
+    config = DIFFICULTY_CONFIGS["easy"]
+    layout = _build_layout(config, 7)
+    solution = _build_solution(layout, 7, "easy")
+
+    assert max(max(row) for row in solution) <= 6
+
+
+def test_generated_board_has_unique_solution():
+    for difficulty in DIFFICULTY_CONFIGS:
+        board = generate_board(difficulty)
+        layout = [[cell is not None and cell.isPlayable for cell in row] for row in board.matrix()]
+        grid = build_grid(layout)
+        targets = [run.target for run in board.runs]
+        fixed = {
+            grid.positions.index((cell.row, cell.col)): cell.value
+            for cell in board.cells
+            if cell.isPlayable and not cell.editable
+        }
+
+        assert len(find_solutions(grid, targets, limit=2, fixed=fixed)) == 1
+
+
+def test_refill_over_budget_falls_back_to_givens(monkeypatch):
+    overruns = []
+    original = board_generator.fill_grid
+
+    def fill_grid(grid, allowed_digits, rng, prefer_low=False, fixed=None, max_nodes=None):
+        # Only the bounded refill inside _make_unique overruns.
+        if max_nodes is None:
+            return original(grid, allowed_digits, rng, prefer_low, fixed)
+        overruns.append(max_nodes)
+        raise SearchBudgetExceeded(max_nodes)
+
+    monkeypatch.setattr(board_generator, "fill_grid", fill_grid)
+    config = DIFFICULTY_CONFIGS["medium"]
+    for seed in range(1, 40):
+        layout = _build_layout(config, seed)
+        result = _make_unique(layout, _build_solution(layout, seed, "medium"), seed, "medium")
+        assert result is None or len(result) == 2
+        if overruns:
+            break
+    assert overruns
+
+
+def test_generated_board_keeps_its_solution_server_side():
+    board = generate_board("medium")
+    play_cells = [cell for cell in board.cells if cell.isPlayable]
+
+    assert all(cell.correctValue for cell in play_cells)
+    for run in board.runs:
+        digits = [cell.correctValue for cell in board.run_cells(run)]
+        assert len(set(digits)) == len(digits)
+        assert sum(digits) == run.target
+    assert all(cell.value == cell.correctValue for cell in play_cells if not cell.editable)
+    first = play_cells[0]
+    assert Board.from_dict(board.to_dict()).get_cell(first.row, first.col).correctValue == first.correctValue
+
+
+def test_short_run_cleanup_leaves_every_cell_in_two_runs():
+    config = DIFFICULTY_CONFIGS["marathon"]
+    layout = _build_layout(config, 11)
+    in_runs = {cell for direction in ("across", "down") for run in _collect_runs(layout, direction) for cell in run}
+    play = {(r, c) for r, row in enumerate(layout) for c, is_play in enumerate(row) if is_play}
+    assert play and play <= in_runs
+
+    # A plus shape collapses completely once its arms lose their partners.
+    plus = [[False] * 4 for _ in range(4)]
+    for r, c in ((1, 2), (2, 1), (2, 2), (2, 3), (3, 2)):
+        plus[r][c] = True
+    _remove_short_runs(plus)
+    assert not any(any(row) for row in plus)
+
+
+def test_numpy_layout_engine_matches_the_python_cleanup():
+    numpy = pytest.importorskip("numpy")
+    config = DIFFICULTY_CONFIGS["marathon"]
+    rng = numpy.random.default_rng(3)
+    batch = layout_engine.draw_batch(
+        rng, config.rows, config.cols, config.play_probability, 16, EDGE_BOOST, MAX_PLAY_PROBABILITY
+    )
+    expected = batch.tolist()
+    for layout in expected:
+        _enforce_max_run_length(layout)
+        _remove_short_runs(layout)
+
+    layout_engine.enforce_max_run_length(batch)
+    layout_engine.remove_short_runs(batch)
+    assert batch.tolist() == expected
+    assert layout_engine.usable(batch, config.min_ratio).tolist() == [
+        _is_usable(layout, config.min_ratio) for layout in expected
+    ]
+    assert _is_usable(_build_layout(config, 3, NUMPY_LAYOUT_ENGINE), config.min_ratio)
+    # The batch engine is opt-in: by default a seed gives the pure-Python layout.
+    assert _build_layout(config, 3) == _draw_layout(config, 3)
+
+
+def test_logic_first_search_agrees_with_plain_search():
+    layout = _build_layout(_DifficultyConfig(20, 20, 0.60, 0.28, (1, 2)), 5)
+    grid = build_grid(layout)
+    values = _build_solution(layout, 5, "hard")
+    values = [values[r][c] for r, c in grid.positions]
+    targets = run_targets(grid, values)
+
+    groups = residual_components(grid, [0] * grid.size)
+    assert sorted(cell for group in groups for cell in group) == list(range(grid.size))
+    # Without givens the clues alone rarely pin the board down; both searches must agree
+    # on whether they do, and every returned grid must satisfy the clues.
+    plain = find_solutions(grid, targets, limit=2)
+    found = find_solutions_with_logic(grid, targets, limit=2)
+    assert len(found) == len(plain)
+    for solution in found:
+        assert run_targets(grid, solution) == targets
+        for cells in grid.run_cells:
+            assert len({solution[cell] for cell in cells}) == len(cells)
+
+
+def test_board_carries_run_table_from_generator():
+    board = generate_board("medium")
+
+    for run in board.runs:
+        members = board.run_cells(run)
+        assert [(cell.row, cell.col) for cell in members] == list(run.cells)
+        clue = board.get_cell(*run.clueCell)
+        assert run.target == (clue.clueRight if run.direction == "across" else clue.clueDown)
+        for cell in members:
+            assert run in board.runs_for(cell.row, cell.col)
+
+
+def test_given_cells_cannot_be_edited():
+    cells = [
+        ClueCell(0, 0),
+        ClueCell(0, 1, clueDown=4),
+        ClueCell(0, 2, clueDown=3),
+        ClueCell(1, 0, clueRight=4),
+        PlayCell(1, 1, value=3, editable=False),
+        PlayCell(1, 2),
+        ClueCell(2, 0, clueRight=3),
+        PlayCell(2, 1),
+        PlayCell(2, 2),
+    ]
+    board = Board(boardId="b-given", difficulty="easy", size=(3, 3), cells=cells)
+
+    result = validate_move(board, 1, 1, "")
+
+    assert result["ok"] is False
+    assert board.get_cell(1, 1).value == 3
@@ -0,0 +1,34 @@
+import sqlite3
+
+import pytest
+
+from kakuro.models.db import connect, get_pool
+
+
+def test_connections_are_reused_in_wal_mode(tmp_path):
+    db_path = tmp_path / "pool.sqlite"
+
+    with connect(db_path) as conn:
+        first = conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    with connect(db_path) as conn:
+        assert conn is first
+
+    get_pool(db_path).close()
+
+
+def test_failed_block_rolls_back_and_keeps_connection_usable(tmp_path):
+    db_path = tmp_path / "pool.sqlite"
+    with connect(db_path) as conn:
+        conn.execute("CREATE TABLE items (name TEXT UNIQUE)")
+        conn.execute("INSERT INTO items VALUES ('a')")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with connect(db_path) as conn:
+            conn.execute("INSERT INTO items VALUES ('b')")
+            conn.execute("INSERT INTO items VALUES ('a')")
+
+    with connect(db_path) as conn:
+        assert [row["name"] for row in conn.execute("SELECT name FROM items")] == ["a"]
+
+    get_pool(db_path).close()
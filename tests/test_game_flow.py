@@ -1,8 +1,18 @@
+import json
 import sqlite3
+from pathlib import Path
 
 from kakuro.models.domain import Board, Cell, GameSession
-from kakuro.models.saved_game import upsert_saved_game
-from kakuro.models.user import create_user
+from kakuro.models.saved_game import (
+    AUTOSAVE_SLOTS,
+    add_autosave,
+    get_latest_saved_game_for_user,
+    get_saved_game,
+    list_saved_games,
+    upsert_saved_game,
+)
+from kakuro.models.user import create_user, init_db
+from kakuro.services import hint_service
 
 
 def _board_3x3() -> Board:
@@ -218,3 +228,355 @@ def test_pause_blocks_move_entry(client):
     assert response.status_code == 200
     assert payload["ok"] is False
     assert "paused" in payload["message"].lower()
+
+
+def test_game_session_is_reused_across_requests(client, app):
+    _set_guest(client)
+    game = GameSession(
+        sessionId="gs-test-cache",
+        difficulty="easy",
+        status="InProgress",
+        board=_board_3x3(),
+        result=None,
+    )
+    with client.session_transaction() as sess:
+        sess["active_game"] = game.to_dict()
+
+    client.post("/game/enter", data={"row": 1, "col": 1, "value": "3"})
+    client.post("/game/enter", data={"row": 1, "col": 2, "value": "1"})
+
+    cache = app.extensions["game_session_cache"]
+    assert cache.metrics()["hits"] >= 1
+    with client.session_transaction() as sess:
+        stored = GameSession.from_dict(sess["active_game"])
+    assert stored.board.get_cell(1, 1).value == 3
+    assert stored.board.get_cell(1, 2).value == 1
+
+    # A write that bypasses the store carries no revision and must not be shadowed by the cache.
+    with client.session_transaction() as sess:
+        sess["active_game"] = game.to_dict()
+    client.post("/game/enter", data={"row": 2, "col": 1, "value": "1"})
+
+    with client.session_transaction() as sess:
+        stored = GameSession.from_dict(sess["active_game"])
+    assert stored.board.get_cell(1, 1).value is None
+    assert stored.board.get_cell(2, 1).value == 1
+
+
+def test_move_batch_applies_moves_in_order_with_per_move_results(client):
+    _set_guest(client)
+    game = GameSession(sessionId="gs-batch", difficulty="easy", status="InProgress", board=_board_3x3())
+    with client.session_transaction() as sess:
+        sess["active_game"] = game.to_dict()
+
+    response = client.post(
+        "/game/moves",
+        json={
+            "moves": [
+                {"row": 1, "col": 1, "value": "3"},
+                {"row": 1, "col": 2, "value": "3"},
+                {"row": 1, "col": 1, "value": "1"},
+                {"row": 1, "col": 2, "value": "3"},
+                {"row": "x", "col": 0, "value": "1"},
+            ]
+        },
+    )
+    payload = response.get_json()
+
+    assert response.status_code == 200
+    assert payload["ok"] is False
+    assert [result["ok"] for result in payload["results"]] == [True, False, True, True, False]
+    assert payload["results"][1]["message"] == "Duplicate value in run is not allowed."
+    # Rejected moves report the cell's value after the batch: (1,2) ends up at 3 from move 4.
+    assert [payload["results"][i]["value"] for i in (1, 4)] == [3, None]
+    assert payload["message"] == "Invalid cell coordinates."
+
+    with client.session_transaction() as sess:
+        stored = GameSession.from_dict(sess["active_game"])
+    assert stored.board.get_cell(1, 1).value == 1
+    assert stored.board.get_cell(1, 2).value == 3
+
+    assert client.post("/game/moves", json={"row": 1}).status_code == 400
+
+
+def test_game_api_reports_state_and_submit_feedback_as_json(client):
+    _set_guest(client)
+    board = _board_3x3()
+    board.get_cell(1, 1).value = 2
+    board.get_cell(1, 2).value = 2
+    game = GameSession(sessionId="gs-api", difficulty="easy", status="InProgress", board=board)
+    with client.session_transaction() as sess:
+        sess["active_game"] = game.to_dict()
+
+    state = client.get("/api/game").get_json()["game"]
+    assert state["board"]["layout"] == "###" + "#.." * 2
+    assert state["board"]["values"] == "2200"
+    assert "solution" not in state["board"]
+    # Run topology for the client-side validator, also embedded in the game page.
+    assert {"target": 4, "cells": [[1, 1], [1, 2]]} in state["runs"]
+    assert {"target": 3, "cells": [[1, 2], [2, 2]]} in state["runs"]
+    page = client.get("/game").get_data(as_text=True)
+    assert 'id="boardTopology"' in page and "js/validator.js" in page
+
+    response = client.post("/api/game/submit", json={"elapsedTime": 12})
+    payload = response.get_json()
+    assert response.status_code == 200
+    assert payload["isSolved"] is False
+    assert "redirect" not in payload
+    assert [1, 1] in payload["game"]["wrongCells"]
+    assert payload["game"]["elapsedTime"] == 12
+
+    solution = ((1, 1, "3"), (1, 2, "1"), (2, 1, "1"), (2, 2, "2"))
+    client.post("/game/moves", json={"moves": [{"row": r, "col": c, "value": v} for r, c, v in solution]})
+    payload = client.post("/api/game/submit", json={"elapsedTime": 30}).get_json()
+    assert payload["isSolved"] is True
+    assert payload["redirect"].endswith("/menu")
+    assert payload["game"]["status"] == "Finished"
+
+
+def test_hint_reveal_and_check_use_the_stored_solution(client):
+    _set_guest(client)
+    game = GameSession(sessionId="gs-hint", difficulty="easy", status="InProgress", board=_board_3x3())
+    with client.session_transaction() as sess:
+        sess["active_game"] = game.to_dict()
+    client.post("/game/moves", json={"moves": [{"row": 1, "col": 2, "value": "3"}]})
+
+    # The test board has no stored solution; the first request solves it once and keeps it.
+    payload = client.post("/game/check").get_json()
+    assert payload["incorrectCells"] == [[1, 2]]
+    with client.session_transaction() as sess:
+        stored = GameSession.from_dict(sess["active_game"])
+    assert [stored.board.get_cell(r, c).correctValue for r, c in ((1, 1), (1, 2), (2, 1), (2, 2))] == [3, 1, 1, 2]
+    assert "solution" not in client.get("/api/game").get_json()["game"]["board"]
+
+    # Without a cell the hint is the next logical deduction, wrong entries counted as empty:
+    # 4 in two cells is {1,3}, so the 2 that the right column needs can only go at (2,2).
+    payload = client.post("/game/hint", json={}).get_json()
+    assert (payload["row"], payload["col"], payload["value"]) == (2, 2, 2)
+    assert payload["technique"] == "hidden_single"
+    assert "unique_combination" in payload["techniques"]
+    assert client.post("/game/hint", json={"row": 1, "col": 1}).get_json()["value"] == 3
+
+    # Revealing (1,1) clears the wrong 3 at (1,2) that would otherwise duplicate it.
+    payload = client.post("/game/reveal", json={"row": 1, "col": 1}).get_json()
+    assert payload["ok"] is True
+    assert payload["value"] == 3
+    assert payload["cleared"] == [[1, 2]]
+    with client.session_transaction() as sess:
+        stored = GameSession.from_dict(sess["active_game"])
+    assert stored.board.get_cell(1, 1).value == 3
+    assert stored.board.get_cell(1, 1).hinted is True
+    assert stored.board.get_cell(1, 2).value is None
+
+    assert client.post("/game/check").get_json()["message"] == "All filled cells are correct."
+    assert client.post("/game/reveal", json={"row": 0, "col": 0}).get_json()["ok"] is False
+    assert client.post("/game/reveal", json={}).status_code == 400
+
+
+def test_check_marks_survive_moves_on_other_cells(client):
+    _set_guest(client)
+    game = GameSession(sessionId="gs-marks", difficulty="easy", status="InProgress", board=_board_3x3())
+    with client.session_transaction() as sess:
+        sess["active_game"] = game.to_dict()
+    client.post("/game/moves", json={"moves": [{"row": 1, "col": 1, "value": "1"}, {"row": 2, "col": 2, "value": "1"}]})
+    assert client.post("/game/check").get_json()["incorrectCells"] == [[1, 1], [2, 2]]
+
+    client.post("/game/moves", json={"moves": [{"row": 2, "col": 2, "value": ""}, {"row": 1, "col": 2, "value": "3"}]})
+    page = client.get("/game").get_data(as_text=True)
+    assert page.count("incorrect-cell") == 1
+    assert "(2,2)" in page and "(3,3)" not in page
+
+
+def test_hints_stay_off_for_a_board_without_a_unique_solution(client, monkeypatch):
+    # Across 4 and 7, down 4 and 7: 1 3 / 3 4 and 3 1 / 1 6 both fit.
+    cells = [
+        Cell(0, 0, None, False, None, None),
+        Cell(0, 1, None, False, 4, None),
+        Cell(0, 2, None, False, 7, None),
+        Cell(1, 0, None, False, None, 4),
+        Cell(1, 1, None, True, None, None),
+        Cell(1, 2, None, True, None, None),
+        Cell(2, 0, None, False, None, 7),
+        Cell(2, 1, None, True, None, None),
+        Cell(2, 2, None, True, None, None),
+    ]
+    board = Board(boardId="b-ambiguous", difficulty="easy", size=(3, 3), cells=cells)
+    _set_guest(client)
+    with client.session_transaction() as sess:
+        sess["active_game"] = GameSession(
+            sessionId="gs-ambiguous", difficulty="easy", status="InProgress", board=board
+        ).to_dict()
+
+    solves = []
+    original = hint_service.find_solutions
+    monkeypatch.setattr(
+        hint_service, "find_solutions", lambda *args, **kwargs: solves.append(args) or original(*args, **kwargs)
+    )
+    assert client.post("/game/hint", json={}).get_json()["message"] == "Hints are not available for this puzzle."
+    assert client.post("/game/check").get_json()["ok"] is False
+    assert len(solves) == 1
+    with client.session_transaction() as sess:
+        stored = GameSession.from_dict(sess["active_game"])
+    assert stored.board.solutionUnknown is True
+    assert stored.board.get_cell(1, 1).correctValue is None
+
+
+def test_game_api_save_keeps_player_on_the_game(client, app):
+    _set_guest(client)
+    game = GameSession(sessionId="gs-api-save", difficulty="easy", status="InProgress", board=_board_3x3())
+    with client.session_transaction() as sess:
+        sess["active_game"] = game.to_dict()
+    assert client.post("/api/game/save", json={"elapsedTime": 5}).get_json()["ok"] is False
+
+    user = _set_registered(client, app)
+    payload = client.post("/api/game/save", json={"elapsedTime": 5, "label": "api"}).get_json()
+    assert payload == {"ok": True, "message": "Game saved successfully"}
+    assert list_saved_games(user.userId, app.config["DB_PATH"])[0]["label"] == "api"
+
+    assert client.post("/api/game/pause").get_json()["game"]["isPaused"] is True
+
+
+def _saved_session(session_id: str, user_id: int, elapsed: int) -> GameSession:
+    board = _board_3x3()
+    board.get_cell(1, 1).value = 3
+    return GameSession(
+        sessionId=session_id,
+        difficulty="easy",
+        status="InProgress",
+        board=board,
+        userId=user_id,
+        elapsedTime=elapsed,
+        result=None,
+    )
+
+
+def test_save_slots_keep_one_manual_slot_per_game_and_an_autosave_ring(app):
+    db_path = app.config["DB_PATH"]
+    user = create_user("slots", "slots@example.com", "hash", db_path)
+
+    first = upsert_saved_game(_saved_session("gs-slot-a", user.userId, 10), db_path, label="Morning")
+    again = upsert_saved_game(_saved_session("gs-slot-a", user.userId, 25), db_path)
+    upsert_saved_game(_saved_session("gs-slot-b", user.userId, 5), db_path)
+    for elapsed in range(AUTOSAVE_SLOTS + 2):
+        add_autosave(_saved_session("gs-slot-a", user.userId, 100 + elapsed), db_path)
+
+    slots = list_saved_games(user.userId, db_path)
+    manual = [slot for slot in slots if not slot["isAutosave"]]
+    autosaves = [slot for slot in slots if slot["isAutosave"]]
+
+    assert first == again
+    assert {slot["sessionId"]: slot["label"] for slot in manual} == {"gs-slot-a": "Morning", "gs-slot-b": None}
+    assert [slot["elapsedTime"] for slot in autosaves] == [104, 103, 102]
+    assert "boardState" not in slots[0]
+
+
+def test_load_and_delete_save_slot_by_id(client, app):
+    user = _set_registered(client, app)
+    db_path = app.config["DB_PATH"]
+    save_id = upsert_saved_game(_saved_session("gs-slot-load", user.userId, 33), db_path)
+    upsert_saved_game(_saved_session("gs-slot-newer", user.userId, 1), db_path)
+
+    assert b"gs-slot-load" in client.get("/game/saves").data
+
+    response = client.post(f"/game/saves/{save_id}/load", follow_redirects=False)
+    assert response.headers["Location"].endswith("/game")
+    with client.session_transaction() as sess:
+        assert GameSession.from_dict(sess["active_game"]).sessionId == "gs-slot-load"
+
+    client.post(f"/game/saves/{save_id}/delete")
+    assert [slot["sessionId"] for slot in list_saved_games(user.userId, db_path)] == ["gs-slot-newer"]
+
+
+def test_init_db_migrates_single_slot_saved_games(tmp_path):
+    db_path = tmp_path / "legacy.sqlite"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL,
+                email TEXT UNIQUE NOT NULL, password_hash TEXT NOT NULL, created_at TEXT NOT NULL
+            );
+            CREATE TABLE saved_games (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT UNIQUE NOT NULL,
+                user_id INTEGER NOT NULL, board_state TEXT NOT NULL, difficulty TEXT NOT NULL,
+                elapsed_time INTEGER NOT NULL DEFAULT 0, status TEXT NOT NULL, saved_at TEXT NOT NULL
+            );
+            INSERT INTO users VALUES (1, 'old', 'old@example.com', 'hash', '2025-01-01');
+            """
+        )
+        conn.execute(
+            "INSERT INTO saved_games (session_id, user_id, board_state, difficulty, elapsed_time, status, saved_at) "
+            "VALUES (?, 1, ?, 'easy', 12, 'InProgress', '2025-01-02')",
+            ("gs-legacy", json.dumps(_board_3x3().to_dict())),
+        )
+
+    init_db(db_path=db_path, schema_path=Path("kakuro/db/schema.sql").resolve())
+
+    assert [slot["sessionId"] for slot in list_saved_games(1, db_path)] == ["gs-legacy"]
+    assert get_latest_saved_game_for_user(1, db_path).elapsedTime == 12
+
+
+def test_init_db_migrates_multi_slot_saved_games_with_their_indexes(tmp_path):
+    # Schema from before saves were split into puzzle records and progress.
+    db_path = tmp_path / "multi-slot.sqlite"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL,
+                email TEXT UNIQUE NOT NULL, password_hash TEXT NOT NULL, created_at TEXT NOT NULL
+            );
+            CREATE TABLE saved_games (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, user_id INTEGER NOT NULL,
+                label TEXT, is_autosave INTEGER NOT NULL DEFAULT 0, difficulty TEXT NOT NULL,
+                elapsed_time INTEGER NOT NULL DEFAULT 0, status TEXT NOT NULL, saved_at TEXT NOT NULL,
+                board_state TEXT NOT NULL
+            );
+            CREATE UNIQUE INDEX idx_saved_games_manual_session ON saved_games (session_id) WHERE is_autosave = 0;
+            CREATE INDEX idx_saved_games_user_saved ON saved_games (user_id, saved_at DESC);
+            CREATE INDEX idx_saved_games_user_autosave ON saved_games (user_id, is_autosave, saved_at);
+            INSERT INTO users VALUES (1, 'old', 'old@example.com', 'hash', '2025-01-01');
+            """
+        )
+        conn.execute(
+            "INSERT INTO saved_games (session_id, user_id, label, difficulty, elapsed_time, status, saved_at, "
+            "board_state) VALUES (?, 1, 'mine', 'easy', 12, 'InProgress', '2025-01-02', ?)",
+            ("gs-slots", json.dumps(_board_3x3().to_dict())),
+        )
+
+    init_db(db_path=db_path, schema_path=Path("kakuro/db/schema.sql").resolve())
+
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'saved_games'")
+        indexes = {row[0] for row in rows}
+    assert {"idx_saved_games_manual_session", "idx_saved_games_user_saved", "idx_saved_games_user_autosave"} <= indexes
+    assert [slot["label"] for slot in list_saved_games(1, db_path)] == ["mine"]
+
+    game = GameSession(sessionId="gs-slots", difficulty="easy", status="InProgress", board=_board_3x3(), userId=1)
+    upsert_saved_game(game, db_path, label="again")
+    assert [slot["label"] for slot in list_saved_games(1, db_path)] == ["again"]
+
+
+def test_saves_share_one_puzzle_record_and_store_only_progress(app):
+    db_path = app.config["DB_PATH"]
+    first = create_user("sharer1", "sharer1@example.com", "hash", db_path)
+    second = create_user("sharer2", "sharer2@example.com", "hash", db_path)
+    game_a = _saved_session("gs-share-a", first.userId, 30)
+    game_b = _saved_session("gs-share-b", second.userId, 40)
+    game_b.board.get_cell(2, 2).value = 2
+    game_b.board.get_cell(2, 1).hinted = True
+
+    upsert_saved_game(game_a, db_path)
+    save_b = upsert_saved_game(game_b, db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM puzzle_records").fetchone()[0] == 1
+        progress = conn.execute("SELECT progress FROM saved_games WHERE id = ?", (save_b,)).fetchone()[0]
+    assert len(progress) < 80
+
+    restored = get_saved_game(save_b, second.userId, db_path)
+    assert restored.board.get_cell(1, 1).value == 3
+    assert restored.board.get_cell(2, 2).value == 2
+    assert restored.board.get_cell(2, 1).hinted is True
+    assert restored.board.get_cell(0, 1).clueDown == 4
+    assert get_saved_game(save_b, first.userId, db_path) is None
@@ -0,0 +1,27 @@
+import json
+
+from kakuro.generate import main
+from kakuro.services.puzzle_pool import PuzzleStore
+
+
+def test_cli_writes_deterministic_jsonl(tmp_path):
+    first = tmp_path / "first.jsonl"
+    second = tmp_path / "second.jsonl"
+
+    assert main(["--difficulty", "easy", "--count", "3", "--workers", "1", "--seed-start", "50", "--output", str(first)]) == 0
+    assert main(["--difficulty", "easy", "--count", "3", "--workers", "1", "--seed-start", "50", "--output", str(second)]) == 0
+
+    first_templates = [json.loads(line) for line in first.read_text().splitlines()]
+    assert {template["layoutEngine"] for template in first_templates} == {"python"}
+    first_ids = sorted(template["templateId"] for template in first_templates)
+    second_ids = sorted(json.loads(line)["templateId"] for line in second.read_text().splitlines())
+    assert len(first_ids) == 3
+    assert first_ids == second_ids
+
+
+def test_cli_stocks_sqlite_puzzle_store(tmp_path):
+    output = tmp_path / "stock.sqlite"
+
+    assert main(["--difficulty", "medium", "--count", "2", "--workers", "2", "--output", str(output)]) == 0
+
+    assert PuzzleStore(output).count("medium") == 2
@@ -1,9 +1,17 @@
 import sqlite3
+from datetime import UTC, datetime
 
-from kakuro.models.domain import Board, Cell, GameSession
-from kakuro.models.leaderboard import add_leaderboard_entry
-from kakuro.models.user import create_user
-from kakuro.services.leaderboard_service import calculate_score
+from kakuro.models import leaderboard
+from kakuro.models.domain import Board, Cell, GameSession, Result
+from kakuro.models.leaderboard import add_leaderboard_entry, get_top_leaderboard_entries
+from kakuro.models.user import create_user, init_db
+from kakuro.services.leaderboard_service import (
+    calculate_score,
+    get_leaderboard,
+    get_leaderboard_cache,
+    period_start,
+    record_completed_game,
+)
 
 
 def _board_3x3() -> Board:
@@ -110,3 +118,85 @@ def test_guest_can_see_leaderboard_on_main_menu(client, app):
     assert response.status_code == 200
     assert b"Leaderboard" in response.data
     assert b"tableuser" in response.data
+
+
+def test_leaderboard_top_keeps_best_entries_per_difficulty(app, monkeypatch):
+    db_path = app.config["DB_PATH"]
+    monkeypatch.setattr(leaderboard, "TOP_SIZE", 3)
+    user = create_user("topper", "topper@example.com", "hash", db_path)
+    for difficulty, score in [("easy", 900), ("hard", 2500), ("easy", 950), ("easy", 700), ("easy", 990), ("medium", 1500)]:
+        add_leaderboard_entry(user.userId, difficulty, 60, score, db_path)
+
+    overall = get_top_leaderboard_entries(db_path, limit=3)
+    easy = get_top_leaderboard_entries(db_path, limit=3, difficulty="easy")
+
+    assert [entry["score"] for entry in overall] == [2500, 1500, 990]
+    assert [entry["score"] for entry in easy] == [990, 950, 900]
+    # Past TOP_SIZE the indexed scan over all entries answers instead of the summary.
+    assert [entry["score"] for entry in get_top_leaderboard_entries(db_path, limit=5, difficulty="easy")] == [
+        990,
+        950,
+        900,
+        700,
+    ]
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM leaderboard_top WHERE board = 'easy'").fetchone()[0] == 3
+
+
+def test_init_db_backfills_leaderboard_top(app):
+    db_path = app.config["DB_PATH"]
+    user = create_user("legacy", "legacy@example.com", "hash", db_path)
+    add_leaderboard_entry(user.userId, "medium", 300, 1200, db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM leaderboard_top")
+
+    init_db(db_path=db_path, schema_path=app.config["SCHEMA_PATH"])
+
+    assert [entry["username"] for entry in get_top_leaderboard_entries(db_path, difficulty="medium")] == ["legacy"]
+    assert [entry["score"] for entry in get_top_leaderboard_entries(db_path)] == [1200]
+
+
+def test_menu_filters_leaderboard_by_difficulty(client, app):
+    db_path = app.config["DB_PATH"]
+    user = create_user("hardcase", "hardcase@example.com", "hash", db_path)
+    add_leaderboard_entry(user.userId, "hard", 400, calculate_score("hard", 400), db_path)
+    _set_guest(client)
+
+    assert b"hardcase" in client.get("/menu?difficulty=hard").data
+    assert b"hardcase" not in client.get("/menu?difficulty=easy").data
+
+
+def test_leaderboard_cache_is_patched_by_new_scores(app):
+    db_path = app.config["DB_PATH"]
+    cache = get_leaderboard_cache()
+    user = create_user("cached", "cached@example.com", "hash", db_path)
+    add_leaderboard_entry(user.userId, "easy", 500, 1000, db_path)
+
+    assert [entry["score"] for entry in get_leaderboard(db_path, limit=2)] == [1000]
+    hits_before = cache.metrics()["hits"]
+
+    game = GameSession(
+        sessionId="gs-lb-cache",
+        difficulty="hard",
+        status="Finished",
+        board=_board_3x3(),
+        userId=user.userId,
+        elapsedTime=100,
+        result=Result(resultId="r-cache", isWin=True),
+    )
+    score = record_completed_game(db_path, user.userId, game)
+
+    for period in ("all", "weekly", "daily"):
+        assert [entry["score"] for entry in get_leaderboard(db_path, limit=2, period=period)][0] == score
+    assert get_leaderboard(db_path, limit=2)[0]["rank"] == 1
+    # The all-time list was patched in place, so both reads after the insert are hits.
+    assert cache.metrics()["hits"] == hits_before + 2
+    assert [entry["score"] for entry in get_leaderboard(db_path, limit=2, difficulty="easy")] == [1000]
+
+
+def test_period_start_boundaries():
+    now = datetime(2026, 10, 15, 13, 45, tzinfo=UTC)
+
+    assert period_start("daily", now) == "2026-10-15T00:00:00+00:00"
+    assert period_start("weekly", now) == "2026-10-12T00:00:00+00:00"
+    assert period_start("all", now) is None
@@ -0,0 +1,54 @@
+from kakuro.models.domain import Board
+from kakuro.services.board_generator import generate_board
+from kakuro.services.hint_service import analyze_board, board_grid
+from kakuro.services.logic_solver import (
+    HIDDEN_SINGLE,
+    TECHNIQUES,
+    UNIQUE_COMBINATION,
+    LogicSolver,
+)
+from kakuro.services.rating import rate
+from kakuro.services.solver import build_grid
+
+
+def test_steps_explain_each_deduction_on_a_small_board():
+    # Clues: across 4 and 3, down 4 and 3 over a 2x2 block.
+    grid = build_grid([[False, False, False], [False, True, True], [False, True, True]])
+    solver = LogicSolver(grid, [4, 3, 4, 3])
+
+    step = solver.step()
+    assert step.technique == UNIQUE_COMBINATION and not step.is_placement
+    placement, reasons = solver.next_placement()
+    assert placement.technique == HIDDEN_SINGLE
+    assert grid.positions[placement.cell] == (2, 2) and placement.value == 2
+
+    report = solver.run()
+    assert report.solved
+    assert report.values == [3, 1, 1, 2]
+    assert report.techniques == {HIDDEN_SINGLE: 3}
+
+
+def test_logic_solutions_match_the_generated_solution():
+    for difficulty in ("easy", "medium", "hard"):
+        board = generate_board(difficulty)
+        grid, _, _ = board_grid(board)
+        report = analyze_board(board)
+
+        assert not report.contradiction
+        assert set(report.techniques) <= set(TECHNIQUES)
+        for (row, col), value in zip(grid.positions, report.values):
+            # Whatever logic alone settles must agree with the stored solution.
+            if value:
+                assert value == board.get_cell(row, col).correctValue
+
+
+def test_rating_is_stored_with_generated_boards_and_is_deterministic():
+    board = generate_board("hard")
+    grid, targets, fixed = board_grid(board)
+
+    assert board.rating == rate(grid, targets, fixed).score
+    assert Board.from_dict(board.to_dict()).rating == board.rating
+    assert rate(grid, targets, fixed) == rate(grid, targets, fixed)
+    # Logic alone settles the 2x2 board without guessing.
+    small = build_grid([[False, False, False], [False, True, True], [False, True, True]])
+    assert rate(small, [4, 3, 4, 3]).guesses == 0
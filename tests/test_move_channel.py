@@ -0,0 +1,99 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from kakuro.app import create_app
+from kakuro.models.db import close_all
+from kakuro.models.domain import Board, Cell, GameSession
+
+
+@pytest.fixture()
+def channel_client(tmp_path):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SECRET_KEY": "test-secret",
+            "DB_PATH": tmp_path / "test_kakuro.sqlite",
+            "SCHEMA_PATH": Path("kakuro/db/schema.sql").resolve(),
+            "PUZZLE_POOL_ENABLED": False,
+            "MOVE_CHANNEL_ENABLED": True,
+            "MOVE_CHANNEL_HEARTBEAT_SECONDS": 0.05,
+        }
+    )
+    yield app.test_client()
+    close_all()
+
+
+def _board_3x3() -> Board:
+    cells = [
+        Cell(0, 0, None, False, None, None),
+        Cell(0, 1, None, False, 4, None),
+        Cell(0, 2, None, False, 3, None),
+        Cell(1, 0, None, False, None, 4),
+        Cell(1, 1, None, True, None, None),
+        Cell(1, 2, None, True, None, None),
+        Cell(2, 0, None, False, None, 3),
+        Cell(2, 1, None, True, None, None),
+        Cell(2, 2, None, True, None, None),
+    ]
+    return Board(boardId="b-channel", difficulty="easy", size=(3, 3), cells=cells)
+
+
+def _next_event(events) -> tuple[str, dict]:
+    chunk = next(events).decode("utf-8")
+    name_line, data_line = chunk.strip().split("\n")
+    return name_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+
+def test_channel_streams_move_results_without_touching_the_session(channel_client):
+    client = channel_client
+    with client.session_transaction() as sess:
+        sess["is_guest"] = True
+        sess["active_game"] = GameSession(
+            sessionId="gs-channel", difficulty="easy", status="InProgress", board=_board_3x3()
+        ).to_dict()
+
+    stream = client.get("/game/channel", buffered=False)
+    assert stream.mimetype == "text/event-stream"
+    events = iter(stream.response)
+    name, ready = _next_event(events)
+    assert name == "ready"
+
+    moves_url = f"/game/channel/{ready['token']}/moves"
+    response = client.post(moves_url, json={"moves": [{"row": 1, "col": 1, "value": "3"}]})
+    assert response.status_code == 204
+    assert "Set-Cookie" not in response.headers
+
+    name, result = _next_event(events)
+    assert name == "moves"
+    assert result["ok"] is True
+    assert result["results"][0]["value"] == 3
+
+    client.post(moves_url, json={"moves": [{"row": 2, "col": 1, "value": "3"}]})
+    name, result = _next_event(events)
+    assert result["ok"] is False
+    assert result["message"] == "Duplicate value in run is not allowed."
+
+    # Idle stream: the next event is a timer sync.
+    name, timer = _next_event(events)
+    assert name == "timer"
+    assert timer["isPaused"] is False
+
+    # The next regular request sees the channel move and writes it back to the session.
+    state = client.get("/api/game").get_json()["game"]
+    assert state["board"]["values"] == "3000"
+    with client.session_transaction() as sess:
+        stored = GameSession.from_dict(sess["active_game"])
+    assert stored.board.get_cell(1, 1).value == 3
+
+    stream.close()
+    assert client.get("/metrics/move-channel").get_json()["open"] == 0
+    assert client.post(moves_url, json={"moves": []}).status_code == 404
+
+
+def test_channel_routes_are_off_by_default(client):
+    with client.session_transaction() as sess:
+        sess["is_guest"] = True
+    assert client.get("/game/channel").status_code == 404
+    assert client.get("/metrics/move-channel").get_json() == {"enabled": False}
@@ -0,0 +1,209 @@
+from kakuro.models.domain import Board, Cell, GameSession
+from kakuro.models.saved_game import add_autosave, list_saved_games, upsert_saved_game
+from kakuro.models.user import create_user
+from kakuro.services.journal_service import MoveJournal, get_journal, replay, undo_redo_stacks
+
+
+def _board_3x3() -> Board:
+    cells = [
+        Cell(0, 0, None, False, None, None),
+        Cell(0, 1, None, False, 4, None),
+        Cell(0, 2, None, False, 3, None),
+        Cell(1, 0, None, False, None, 4),
+        Cell(1, 1, None, True, None, None),
+        Cell(1, 2, None, True, None, None),
+        Cell(2, 0, None, False, None, 3),
+        Cell(2, 1, None, True, None, None),
+        Cell(2, 2, None, True, None, None),
+    ]
+    return Board(boardId="b-journal", difficulty="easy", size=(3, 3), cells=cells)
+
+
+def _start_game(client, session_id: str, user_id=None) -> None:
+    with client.session_transaction() as sess:
+        if user_id is None:
+            sess["is_guest"] = True
+        else:
+            sess["user_id"] = user_id
+            sess["is_guest"] = False
+        game = GameSession(
+            sessionId=session_id, difficulty="easy", status="InProgress", board=_board_3x3(), userId=user_id
+        )
+        sess["active_game"] = game.to_dict()
+
+
+def _enter(client, row, col, value):
+    return client.post(
+        "/game/enter",
+        data={"row": row, "col": col, "value": value},
+        headers={"X-Requested-With": "XMLHttpRequest"},
+    ).get_json()
+
+
+def _active_game(client) -> GameSession:
+    with client.session_transaction() as sess:
+        return GameSession.from_dict(sess["active_game"])
+
+
+def test_journal_buffers_moves_and_flushes_in_batches(app):
+    journal = MoveJournal(app.config["DB_PATH"], flush_seconds=60, batch_size=3)
+    for seq in range(1, 5):
+        journal.record("gs-batch", seq, 1, 1, None, seq)
+
+    assert journal.pending() == 4
+    assert journal.flush() == 4
+    assert journal.pending() == 0
+
+    journal.record("gs-batch", 5, 1, 2, None, 1)
+    entries = journal.entries("gs-batch", after_seq=2)
+    assert [entry["seq"] for entry in entries] == [3, 4, 5]
+
+    metrics = journal.metrics()
+    assert metrics["recorded"] == 5
+    assert metrics["flushes"] == 2
+    assert metrics["pending"] == 0
+
+
+def test_undo_redo_stacks_and_replay():
+    entries = [
+        {"seq": 1, "row": 1, "col": 1, "oldValue": None, "newValue": 3, "kind": "move"},
+        {"seq": 2, "row": 1, "col": 2, "oldValue": None, "newValue": 1, "kind": "move"},
+        {"seq": 3, "row": 1, "col": 2, "oldValue": 1, "newValue": None, "kind": "undo"},
+    ]
+    undo, redo = undo_redo_stacks(entries)
+    assert [entry["seq"] for entry in undo] == [1]
+    assert [entry["seq"] for entry in redo] == [2]
+
+    board = _board_3x3()
+    assert replay(board, entries) == 3
+    assert board.get_cell(1, 1).value == 3
+    assert board.get_cell(1, 2).value is None
+
+
+def test_undo_and_redo_routes_walk_the_journal(client):
+    _start_game(client, "gs-undo")
+    assert _enter(client, 1, 1, "3")["ok"]
+    assert _enter(client, 1, 1, "1")["ok"]
+
+    headers = {"X-Requested-With": "XMLHttpRequest"}
+    payload = client.post("/game/undo", headers=headers).get_json()
+    assert payload == {"ok": True, "message": "Move undone.", "value": "3", "row": 1, "col": 1}
+    payload = client.post("/game/undo", headers=headers).get_json()
+    assert payload["ok"] and payload["value"] == ""
+    assert client.post("/game/undo", headers=headers).get_json()["ok"] is False
+
+    payload = client.post("/game/redo", headers=headers).get_json()
+    assert payload["ok"] and payload["value"] == "3"
+    assert _active_game(client).board.get_cell(1, 1).value == 3
+
+    # A new move discards the redo history.
+    assert _enter(client, 2, 2, "2")["ok"]
+    assert client.post("/game/redo", headers=headers).get_json()["ok"] is False
+    # Two moves, two undos, one redo and the new move are all journaled.
+    assert _active_game(client).journalSeq == 6
+
+
+def test_undo_reads_the_journal_once_per_loaded_game(client, monkeypatch):
+    _start_game(client, "gs-stacks")
+    assert _enter(client, 1, 1, "3")["ok"]
+    assert _enter(client, 1, 2, "1")["ok"]
+
+    journal = get_journal()
+    reads = []
+    original = journal.entries
+    monkeypatch.setattr(journal, "entries", lambda *args: reads.append(args) or original(*args))
+    headers = {"X-Requested-With": "XMLHttpRequest"}
+    assert client.post("/game/undo", headers=headers).get_json()["value"] == ""
+    assert client.post("/game/undo", headers=headers).get_json()["value"] == ""
+    assert client.post("/game/redo", headers=headers).get_json()["value"] == "3"
+    assert len(reads) == 1
+
+
+def test_cache_miss_skips_the_journal_without_the_move_channel(client, app, monkeypatch):
+    _start_game(client, "gs-miss")
+    assert _enter(client, 1, 1, "3")["ok"]
+    app.extensions["game_session_cache"].discard("gs-miss")
+
+    journal = get_journal()
+    reads = []
+    original = journal.entries
+    monkeypatch.setattr(journal, "entries", lambda *args: reads.append(args) or original(*args))
+    assert client.get("/api/game").get_json()["game"]["board"]["values"] == "3000"
+    assert reads == []
+
+
+def test_replaced_guest_game_drops_its_journal(client):
+    _start_game(client, "gs-abandoned")
+    assert _enter(client, 1, 1, "3")["ok"]
+
+    client.post("/new-game", data={"difficulty": "easy"})
+
+    assert get_journal().entries("gs-abandoned") == []
+
+
+def test_load_latest_save_replays_moves_made_after_it(client, app):
+    db_path = app.config["DB_PATH"]
+    user = create_user("journaler", "journaler@example.com", "hash", db_path)
+    _start_game(client, "gs-replay", user.userId)
+
+    assert _enter(client, 1, 1, "3")["ok"]
+    upsert_saved_game(_active_game(client), db_path)
+    assert _enter(client, 2, 2, "2")["ok"]
+
+    # The session is lost (crash, closed tab); moves are still buffered, not yet flushed.
+    with client.session_transaction() as sess:
+        sess.pop("active_game")
+    assert get_journal().pending() >= 1
+
+    client.get("/game/load")
+    restored = _active_game(client)
+    assert restored.board.get_cell(1, 1).value == 3
+    assert restored.board.get_cell(2, 2).value == 2
+    assert restored.journalSeq == 2
+
+
+def test_loading_an_older_slot_branches_the_journal(client, app):
+    db_path = app.config["DB_PATH"]
+    user = create_user("slotter", "slotter@example.com", "hash", db_path)
+    _start_game(client, "gs-slot", user.userId)
+
+    assert _enter(client, 1, 1, "3")["ok"]
+    upsert_saved_game(_active_game(client), db_path)
+    assert _enter(client, 2, 2, "2")["ok"]
+
+    save_id = list_saved_games(user.userId, db_path)[0]["saveId"]
+    client.post(f"/game/saves/{save_id}/load")
+
+    restored = _active_game(client)
+    assert restored.board.get_cell(2, 2).value is None
+    assert restored.journalSeq == 1
+    assert restored.journalKey.startswith("gs-slot:")
+    assert [entry["seq"] for entry in get_journal().entries(restored.journalKey)] == [1]
+    # The abandoned timeline stays intact under its own key.
+    assert [entry["seq"] for entry in get_journal().entries("gs-slot")] == [1, 2]
+
+
+def test_latest_slot_ignores_moves_from_an_older_slots_branch(client, app):
+    db_path = app.config["DB_PATH"]
+    user = create_user("brancher", "brancher@example.com", "hash", db_path)
+    _start_game(client, "gs-branch", user.userId)
+    headers = {"X-Requested-With": "XMLHttpRequest"}
+
+    assert _enter(client, 1, 1, "3")["ok"]
+    older_id = upsert_saved_game(_active_game(client), db_path)
+    assert _enter(client, 1, 2, "1")["ok"]
+    assert _enter(client, 2, 2, "2")["ok"]
+    add_autosave(_active_game(client), db_path)
+
+    # Play on from the older slot past the latest slot's seq, without saving.
+    client.post(f"/game/saves/{older_id}/load")
+    for value in ("1", "", "1", ""):
+        assert _enter(client, 2, 1, value)["ok"]
+    assert _active_game(client).journalSeq == 5
+
+    client.get("/game/load")
+    restored = _active_game(client)
+    assert [restored.board.get_cell(r, c).value for r, c in ((1, 1), (1, 2), (2, 1), (2, 2))] == [3, 1, None, 2]
+    assert restored.journalSeq == 3
+    undone = client.post("/game/undo", headers=headers).get_json()
+    assert (undone["row"], undone["col"], undone["value"]) == (2, 2, "")
@@ -0,0 +1,95 @@
+from kakuro.services import puzzle_pool
+from kakuro.services.board_generator import generate_template
+from kakuro.services.puzzle_pool import PuzzlePool, PuzzleStore
+
+
+def _fake_generate(difficulty):
+    return {"templateId": f"{difficulty}-fake", "difficulty": difficulty}
+
+
+def test_pool_refills_to_target_and_tracks_hits():
+    pool = PuzzlePool(difficulties=("easy",), low_water=1, target=3, generate=_fake_generate)
+
+    assert pool.take("easy") is None
+    assert pool.refill() == 3
+    assert pool.depth("easy") == 3
+
+    assert pool.take("easy")["templateId"] == "easy-fake"
+
+    metrics = pool.metrics()["difficulties"]["easy"]
+    assert metrics["depth"] == 2
+    assert metrics["hits"] == 1
+    assert metrics["misses"] == 1
+    assert metrics["hitRate"] == 0.5
+    assert metrics["refilled"] == 3
+    assert metrics["avgRefillMs"] is not None
+
+
+def test_pool_prefers_stocked_puzzles_and_spills_on_stop(tmp_path):
+    store = PuzzleStore(tmp_path / "pool.sqlite")
+    store.push_many("easy", [generate_template("easy")])
+
+    calls = []
+
+    def generate(difficulty):
+        calls.append(difficulty)
+        return _fake_generate(difficulty)
+
+    pool = PuzzlePool(difficulties=("easy",), low_water=0, target=2, store=store, generate=generate)
+    pool.refill()
+
+    assert store.count("easy") == 0
+    assert len(calls) == 1
+    assert pool.take("easy")["templateId"].startswith("easy-t")
+
+    pool.stop()
+    assert store.count("easy") == 1
+    assert pool.depth("easy") == 0
+
+
+def test_new_game_falls_back_to_inline_generation_without_pool(client):
+    with client.session_transaction() as sess:
+        sess["is_guest"] = True
+
+    response = client.post("/new-game", data={"difficulty": "easy"}, follow_redirects=False)
+
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/game")
+
+
+def test_refill_and_take_select_boards_by_rating_band(tmp_path):
+    ratings = iter([10.0, 42.0, 55.0, 31.0, 40.0])
+
+    def generate(difficulty):
+        return {"templateId": f"{difficulty}-rated", "difficulty": difficulty, "rating": next(ratings)}
+
+    pool = PuzzlePool(
+        difficulties=("medium",), low_water=0, target=3, generate=generate, bands={"medium": (30.0, 50.0)}
+    )
+    pool.refill()
+
+    metrics = pool.metrics()["difficulties"]["medium"]
+    assert metrics["rejected"] == 2
+    assert metrics["band"] == [30.0, 50.0]
+    assert pool.take("medium", band=(35.0, None))["rating"] == 42.0
+    assert pool.take("medium", band=(45.0, None)) is None
+    assert pool.take("medium")["rating"] == 31.0
+
+    store = PuzzleStore(tmp_path / "rated.sqlite")
+    store.push_many("medium", [{"rating": 12.5}, {"rating": 35.0}, {"templateId": "unrated"}])
+    assert store.pop_many("medium", 5, band=(30.0, None)) == [{"rating": 35.0}, {"templateId": "unrated"}]
+    assert store.count("medium") == 1
+
+
+def test_inline_fallback_keeps_the_first_board(monkeypatch):
+    calls = []
+
+    def generate(difficulty, engine):
+        calls.append((difficulty, engine))
+        return generate_template(difficulty, engine)
+
+    monkeypatch.setattr(puzzle_pool, "generate_template", generate)
+    puzzle_pool.init_pool({"PUZZLE_POOL_ENABLED": False, "PUZZLE_RATING_BANDS": {"easy": (1000.0, None)}})
+    board = puzzle_pool.take_board("easy")
+    assert board.difficulty == "easy"
+    assert calls == [("easy", "python")]
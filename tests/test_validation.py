@@ -1,5 +1,9 @@
-from kakuro.models.domain import Board, Cell
-from kakuro.services.validation_service import validate_entire_board, validate_move
+import json
+
+from kakuro.models.domain import Board, Cell, ClueCell, PlayCell
+from kakuro.services.combinations import combinations_for, completion_bounds, is_reachable
+from kakuro.services.journal_service import replay
+from kakuro.services.validation_service import get_progress, validate_entire_board, validate_move
 
 
 def _board_3x3_for_validation():
@@ -86,3 +90,121 @@ def test_submit_marks_impossible_partial_run_as_wrong():
 
     assert result["isSolved"] is False
     assert (1, 1) in result["wrongCells"]
+
+
+def test_board_index_survives_round_trip():
+    board = _board_3x3_for_validation()
+    board.get_cell(1, 2).value = 3
+
+    restored = Board.from_dict(board.to_dict())
+
+    assert restored.get_cell(1, 2).value == 3
+    assert restored.matrix()[1][2] is restored.get_cell(1, 2)
+    assert restored.get_cell(3, 0) is None
+    assert restored.get_cell(-1, 0) is None
+
+
+def test_compact_board_encoding_round_trip():
+    cells = [
+        ClueCell(0, 0),
+        ClueCell(0, 1, clueDown=4),
+        ClueCell(0, 2, clueDown=3),
+        ClueCell(1, 0, clueRight=4),
+        PlayCell(1, 1, value=3, correctValue=3, editable=False),
+        PlayCell(1, 2, value=1, correctValue=1, hinted=True),
+        ClueCell(2, 0, clueRight=3),
+        PlayCell(2, 1, correctValue=1),
+        PlayCell(2, 2, correctValue=2),
+    ]
+    board = Board(boardId="b-compact", difficulty="easy", size=(3, 3), cells=cells)
+
+    payload = board.to_dict()
+    restored = Board.from_dict(json.loads(json.dumps(payload)))
+
+    assert payload["v"] == 2
+    assert payload["layout"] == "####gh#.."
+    assert [cell.to_dict() for cell in restored.cells] == [cell.to_dict() for cell in board.cells]
+    assert restored.runs == board.runs
+
+
+def test_board_from_dict_reads_legacy_cell_list():
+    board = _board_3x3_for_validation()
+    board.get_cell(2, 2).value = 2
+    legacy = {
+        "boardId": board.boardId,
+        "difficulty": board.difficulty,
+        "size": [3, 3],
+        "cells": [cell.to_dict() for cell in board.cells],
+    }
+
+    restored = Board.from_dict(legacy)
+
+    assert restored.get_cell(2, 2).value == 2
+    assert restored.get_cell(0, 1).clueDown == 4
+    assert restored.runs == board.runs
+
+
+def test_run_progress_tracks_moves_incrementally():
+    board = _board_3x3_for_validation()
+    progress = get_progress(board)
+
+    validate_move(board, 1, 1, "3")
+    validate_move(board, 1, 2, "1")
+
+    across, _ = board.runs_for(1, 1)
+    assert progress.sums[across.runId] == 4
+    assert progress.filled[across.runId] == 2
+    assert progress.open_cells == 2
+    assert progress.is_solved() is False
+
+    validate_move(board, 2, 1, "1")
+    validate_move(board, 2, 2, "2")
+    assert progress.is_solved() is True
+
+    validate_move(board, 2, 2, "")
+    assert progress.is_solved() is False
+    assert progress.open_cells == 1
+
+
+def test_direct_writers_drop_run_progress():
+    board = _board_3x3_for_validation()
+    validate_move(board, 1, 1, "3")
+    assert get_progress(board).open_cells == 3
+
+    replay(board, [{"row": 1, "col": 2, "newValue": 1}, {"row": 2, "col": 1, "newValue": 1}])
+    assert board.progress is None
+    assert get_progress(board).open_cells == 1
+
+    # Tests that write cells by hand catch the totals up explicitly.
+    board.get_cell(2, 2).value = 2
+    get_progress(board).sync()
+    assert validate_entire_board(board)["isSolved"] is True
+
+
+def test_validate_move_reports_wrong_cells_for_touched_runs():
+    board = _board_3x3_for_validation()
+
+    result = validate_move(board, 1, 1, "4")
+
+    assert result["ok"] is True
+    assert (1, 1) in result["wrongCells"]
+
+
+def test_submit_flags_partial_run_no_combination_can_complete():
+    board = _board_3x3_for_validation()
+
+    # Across clue 4 over two cells only splits as 1 + 3; a 2 passes the min/max
+    # bounds (2 + 1 <= 4 <= 2 + 9) but would need a second 2.
+    board.get_cell(1, 1).value = 2
+
+    result = validate_entire_board(board)
+
+    assert (1, 1) in result["wrongCells"]
+
+
+def test_combination_tables():
+    assert combinations_for(4, 2) == (0b101,)
+    assert is_reachable(4, 2, 0b001) is True
+    assert is_reachable(4, 2, 0b010) is False
+    assert completion_bounds(0b001, 2) == (2 + 3, 8 + 9)
+    assert completion_bounds(0b111111111, 1) is None